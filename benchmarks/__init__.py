@@ -0,0 +1,5 @@
+"""
+Benchmarks of the wikirate4py request and model pipeline, replaying the recorded test cassettes.
+
+Run them with ``python -m benchmarks.run``.
+"""
@@ -0,0 +1,290 @@
+"""
+Runs the benchmark suite and prints the results as JSON.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare baseline.json --threshold 1.25
+
+With ``--compare``, benchmarks whose median time grew by more than the threshold ratio are reported on stderr and
+the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import wikirate4py
+from wikirate4py import models
+from wikirate4py.cursor import Cursor
+from wikirate4py.utils import to_dataframe
+from benchmarks.transport import CassetteAdapter, load_cassettes
+
+API_URL = "https://staging.wikirate.org/"
+
+# Model built from a card payload, and from the items of a listing, per Wikirate card type
+CARD_MODELS = {
+    "Company": models.Company,
+    "Metric": models.Metric,
+    "Topic": models.Topic,
+    "Answer": models.Answer,
+    "Relationship": models.Relationship,
+    "Source": models.Source,
+    "Dataset": models.Dataset,
+    "Project": models.Project,
+    "Company Group": models.CompanyGroup,
+    "Research Group": models.ResearchGroup,
+}
+ITEM_MODELS = {
+    "Company": models.CompanyItem,
+    "Metric": models.MetricItem,
+    "Topic": models.TopicItem,
+    "Answer": models.AnswerItem,
+    "Relationship": models.RelationshipItem,
+    "Source": models.SourceItem,
+    "Dataset": models.DatasetItem,
+    "Project": models.ProjectItem,
+    "Research Group": models.ResearchGroupItem,
+    "Region": models.RegionItem,
+}
+
+# End-to-end API calls, each answered by a recorded cassette
+API_CALLS = {
+    "get_company": lambda api: api.get_company("Puma"),
+    "get_companies": lambda api: api.get_companies(limit=10),
+    "get_metric": lambda api: api.get_metric("Commons+Supplier_of"),
+    "get_metrics": lambda api: api.get_metrics(limit=10),
+    "get_topic": lambda api: api.get_topic("Wikirate_ESG_Topics+Environment"),
+    "get_topics": lambda api: api.get_topics(limit=10),
+    "get_answer": lambda api: api.get_answer(7324421),
+    "get_answers": lambda api: api.get_answers(metric_name="Company Report Available", metric_designer="Core",
+                                               year=2019, limit=10),
+    "get_relationship": lambda api: api.get_relationship(7261680),
+    "get_relationships": lambda api: api.get_relationships(metric_name="Supplier of", metric_designer="Commons",
+                                                           limit=10),
+    "get_source": lambda api: api.get_source("Source-000105228"),
+    "get_sources": lambda api: api.get_sources(limit=10),
+    "get_company_group": lambda api: api.get_company_group("Apparel 100 Companies"),
+    "get_dataset": lambda api: api.get_dataset("Tea_Supply_Chain_Tracker_Supply_Chain_Relationships"),
+    "get_datasets": lambda api: api.get_datasets(limit=10),
+    "get_project": lambda api: api.get_project("Scope_1_Greenhouse_gas_GHG_Emission"),
+    "get_projects": lambda api: api.get_projects(limit=10),
+    "get_research_group": lambda api: api.get_research_group(3478301),
+    "get_research_groups": lambda api: api.get_research_groups(limit=10),
+    "get_regions": lambda api: api.get_regions(limit=10),
+}
+
+ANSWER_FILTERS = dict(year=2023, status="known", company_group="Apparel 100 Companies", country="Germany",
+                      value_from=10, value_to=1000, updated="month", company=[7217, "Puma"],
+                      topic=["Environment", "Labour"], verification="steward_verified", sort_by="year",
+                      sort_dir="desc", offset=100, limit=50)
+ANSWER_FILTER_NAMES = ('year', 'status', 'company_group', 'country', 'value', 'value_from', 'value_to', 'updated',
+                       'company', 'company_keyword', 'company_category', 'dataset', 'updater', 'source',
+                       'verification', 'bookmark', 'published', 'metric_name', 'metric_keyword', 'designer',
+                       'metric_type', 'company_identifier', 'metric', 'sort_by', 'sort_dir', 'topic',
+                       'topic_framework', 'value_type', 'research_policy')
+
+CURSOR_ITEMS = 2000
+CURSOR_PAGE_SIZE = 100
+
+
+def measure(func, min_time=0.05, repeat=5):
+    """Times ``func`` in ``repeat`` rounds of enough calls to last about ``min_time`` seconds each."""
+    func()
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 2 or iterations >= 1 << 20:
+            break
+        iterations *= 2
+    iterations = max(1, int(iterations * min_time / max(elapsed, 1e-9)))
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - start) / iterations)
+    median = statistics.median(timings)
+    return {
+        "iterations": iterations * repeat,
+        "min_us": min(timings) * 1e6,
+        "median_us": median * 1e6,
+        "mean_us": statistics.mean(timings) * 1e6,
+        "ops_per_sec": 1 / median if median else None,
+    }
+
+
+def measure_import(module="wikirate4py", repeat=5):
+    """
+    Times ``import module`` in fresh interpreters with ``-X importtime``, which reports the cumulative import time
+    of every module, so interpreter startup is not counted.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(wikirate4py.__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (root, os.environ.get("PYTHONPATH")))))
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env=env,
+                                stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+        for line in output.splitlines():
+            _, _, cumulative, name = (part.strip() for part in line.replace("|", ":").split(":"))
+            if name == module:
+                timings.append(int(cumulative))
+    median = statistics.median(timings)
+    return {
+        "iterations": repeat,
+        "min_us": min(timings),
+        "median_us": median,
+        "mean_us": statistics.mean(timings),
+        "ops_per_sec": 1e6 / median if median else None,
+    }
+
+
+def _model_cases(recorded):
+    """Yields ``(model name, builder, item count)`` for every recorded card and listing payload."""
+    seen = set()
+    for response in recorded:
+        payload = response.json() if response.method == "GET" and response.status == 200 else None
+        if not isinstance(payload, dict):
+            continue
+        card_type = payload.get("type")
+        card_type = card_type.get("name") if isinstance(card_type, dict) else card_type
+        items = payload.get("items")
+        if items and isinstance(items[0], dict) and items[0].get("type") in ITEM_MODELS:
+            model = ITEM_MODELS[items[0]["type"]]
+            if model.__name__ not in seen:
+                seen.add(model.__name__)
+                yield model.__name__, (lambda model=model, items=items: [model(item) for item in items]), \
+                    len(items)
+        elif card_type in CARD_MODELS and CARD_MODELS[card_type].__name__ not in seen:
+            model = CARD_MODELS[card_type]
+            seen.add(model.__name__)
+            yield model.__name__, (lambda model=model, payload=payload: model(payload)), 1
+
+
+def run_benchmarks(min_time=0.05, repeat=5, only=None):
+    """
+    Runs the benchmark suite.
+
+    Parameters
+    ----------
+    min_time : float, optional
+        Approximate duration in seconds of each timing round.
+    repeat : int, optional
+        Number of timing rounds per benchmark.
+    only : str, optional
+        Only run the benchmarks whose name contains this string.
+
+    Returns
+    -------
+    dict
+        Environment details and one entry per benchmark.
+    """
+    recorded = load_cassettes()
+    adapter = CassetteAdapter(recorded)
+    api = wikirate4py.API("benchmark", wikirate_api_url=API_URL, name_cache=False)
+    api.session.mount("https://", adapter)
+    api.session.mount("http://", adapter)
+
+    cases = {
+        "request.get": lambda: api.get("/Puma.json"),
+        "build_query_params.get_answers": lambda: api._build_query_params(('limit', 'offset', 'view'),
+                                                                          ANSWER_FILTER_NAMES, **ANSWER_FILTERS),
+    }
+    for response in recorded:
+        if response.method == "GET" and response.status == 200 and response.json() is not None:
+            cases.setdefault(f"json_decode.{response.cassette}", lambda body=response.body: json.loads(body))
+
+    items_by_model = {}
+    for name, build, count in _model_cases(recorded):
+        cases[f"model.{name}"] = build
+        if count > 1:
+            items_by_model[name] = build()
+    for name, call in API_CALLS.items():
+        cases[f"objectify.{name}"] = lambda call=call: call(api)
+    for name, items in items_by_model.items():
+        cases[f"to_dataframe.{name}"] = lambda items=items: to_dataframe(items)
+
+    answers = api.get_answers(metric_name="Company Report Available", metric_designer="Core", response_format="json")
+    adapter.add_listing("/Core+Company_Report_Available+Answers.json",
+                        [answers["items"][i % len(answers["items"])] for i in range(CURSOR_ITEMS)])
+
+    def page_through():
+        cursor = Cursor(api.get_answers, per_page=CURSOR_PAGE_SIZE, metric_name="Company Report Available",
+                        metric_designer="Core")
+        while cursor.has_next():
+            cursor.next()
+
+    cases[f"cursor.get_answers[{CURSOR_ITEMS}]"] = page_through
+
+    results = []
+    for name, func in cases.items():
+        if only and only not in name:
+            continue
+        try:
+            result = measure(func, min_time=min_time, repeat=repeat)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        results.append(dict(name=name, **result))
+    if not only or only in "import.wikirate4py":
+        results.append(dict(name="import.wikirate4py", **measure_import(repeat=repeat)))
+
+    return {
+        "wikirate4py": wikirate4py.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "benchmarks": results,
+    }
+
+
+def compare(results, baseline, threshold=1.25):
+    """Returns ``(name, baseline median, current median, ratio)`` for benchmarks slower than the threshold."""
+    previous = {entry["name"]: entry for entry in baseline["benchmarks"] if "median_us" in entry}
+    regressions = []
+    for entry in results["benchmarks"]:
+        before = previous.get(entry["name"])
+        if before is None or "median_us" not in entry or not before["median_us"]:
+            continue
+        ratio = entry["median_us"] / before["median_us"]
+        if ratio > threshold:
+            regressions.append((entry["name"], before["median_us"], entry["median_us"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark wikirate4py against the recorded cassettes.")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio of the median time reported as a regression")
+    parser.add_argument("--min-time", type=float, default=0.05, help="approximate seconds per timing round")
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds per benchmark")
+    parser.add_argument("--only", help="only run benchmarks whose name contains this string")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(min_time=args.min_time, repeat=args.repeat, only=args.only)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before:.1f}us -> {after:.1f}us ({ratio:.2f}x)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,7 +30,7 @@ setup(name='wikirate4py',
       author_email='vasso@wikirate.org',
       license='GPL-3.0',
       download_url='https://github.com/wikirate/wikirate4py/archive/refs/tags/v2.0.8.tar.gz',
-      packages=find_packages(exclude=["tests", "examples"]),
+      packages=find_packages(exclude=["tests", "examples", "benchmarks", "benchmarks.*"]),
       install_requires=[
           "requests",
           "html2text",
@@ -43,6 +43,9 @@ setup(name='wikirate4py',
       },
       extras_require={
           "test": tests_require,
+          "zstd": ["zstandard"],
+          "tracing": ["opentelemetry-api"],
+          "search": ["numpy"],
       },
       test_suite="nose.collector",
       keywords="wikirate library",
@@ -0,0 +1,30 @@
+import unittest
+
+import wikirate4py
+from wikirate4py import Wikirate4PyException
+
+
+class BatchGetterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.api = wikirate4py.API('token', pool_size=16)
+        self.requested = []
+
+        def get_company(identifier, **kwargs):
+            self.requested.append(identifier)
+            if identifier == 404:
+                raise Wikirate4PyException("404 Not Found")
+            return {'id': identifier, 'format': kwargs.get('response_format')}
+
+        self.api.get_company = get_company
+
+    def test_deduplicates_and_preserves_order(self):
+        results = self.api.get_companies_by_ids([3, 1, 404, 3, 2], workers=4, response_format='json')
+        self.assertEqual([result.key for result in results], [3, 1, 404, 2])
+        self.assertEqual(sorted(self.requested), [1, 2, 3, 404])
+        self.assertEqual([result.ok for result in results], [True, True, False, True])
+        self.assertTrue(isinstance(results[2].error, Wikirate4PyException))
+        self.assertEqual(results[0].value, {'id': 3, 'format': 'json'})
+
+    def test_pool_size(self):
+        self.assertEqual(self.api.session.get_adapter('https://wikirate.org/')._pool_maxsize, 16)
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import wikirate4py
+
+from benchmarks import run
+
+
+class BenchmarkTests(unittest.TestCase):
+
+    def test_run_benchmarks(self):
+        results = run.run_benchmarks(min_time=0.001, repeat=1, only="get_company")
+        names = [entry["name"] for entry in results["benchmarks"]]
+        self.assertIn("objectify.get_company", names)
+        for entry in results["benchmarks"]:
+            self.assertNotIn("error", entry)
+            self.assertGreater(entry["median_us"], 0)
+
+    def test_cursor_pages_through_listing(self):
+        results = run.run_benchmarks(min_time=0.001, repeat=1, only="cursor")
+        self.assertEqual(1, len(results["benchmarks"]))
+        self.assertNotIn("error", results["benchmarks"][0])
+
+    def test_import_skips_optional_heavy_modules(self):
+        loaded = subprocess.run([sys.executable, "-c", "import sys, wikirate4py; "
+                                                       "print(' '.join(m for m in ('pandas', 'html2text') "
+                                                       "if m in sys.modules))"],
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(wikirate4py.__file__))),
+                                stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout.split()
+        self.assertEqual([], loaded)
+
+    def test_measure_import(self):
+        result = run.measure_import(repeat=1)
+        self.assertGreater(result["median_us"], 0)
+
+    def test_compare_reports_regressions(self):
+        baseline = {"benchmarks": [{"name": "a", "median_us": 10.0}, {"name": "b", "median_us": 10.0}]}
+        current = {"benchmarks": [{"name": "a", "median_us": 20.0}, {"name": "b", "median_us": 11.0},
+                                  {"name": "c", "median_us": 5.0}]}
+        regressions = run.compare(current, baseline, threshold=1.25)
+        self.assertEqual(["a"], [name for name, *_ in regressions])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+import wikirate4py
+from wikirate4py import CircuitBreaker, CircuitOpenException, NotFoundException, WikirateServerErrorException
+from wikirate4py.mock_server import MockWikirateServer
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_rate=0.5, minimum_requests=4, window=10, recovery_timeout=5,
+                                      clock=self.clock)
+
+    def send(self, failed):
+        self.breaker.before_request()
+        self.breaker.record(failed)
+
+    def test_opens_once_failure_rate_is_reached(self):
+        self.send(True)
+        self.send(True)
+        self.send(False)
+        self.assertEqual("closed", self.breaker.state)
+        self.send(True)
+        self.assertEqual("open", self.breaker.state)
+        with self.assertRaises(CircuitOpenException) as raised:
+            self.breaker.before_request()
+        self.assertEqual(5, raised.exception.retry_after)
+
+    def test_old_failures_leave_the_window(self):
+        self.send(True)
+        self.send(True)
+        self.send(True)
+        self.clock.now = 11
+        self.send(True)
+        self.assertEqual("closed", self.breaker.state)
+        self.assertEqual(1, self.breaker.stats()["failures"])
+
+    def test_half_open_probe_closes_or_reopens(self):
+        for _ in range(4):
+            self.send(True)
+        self.clock.now = 5
+        self.assertEqual("half_open", self.breaker.state)
+        self.breaker.before_request()
+        # Only one probe runs at a time
+        self.assertRaises(CircuitOpenException, self.breaker.before_request)
+        self.breaker.record(True)
+        self.assertEqual("open", self.breaker.state)
+
+        self.clock.now = 10
+        self.send(False)
+        self.assertEqual("closed", self.breaker.state)
+        self.assertEqual(0, self.breaker.stats()["requests"])
+
+    def test_invalid_failure_rate(self):
+        self.assertRaises(wikirate4py.Wikirate4PyException, CircuitBreaker, failure_rate=0)
+
+
+class APICircuitBreakerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockWikirateServer(companies=5, metrics=1, years=1, suppliers=0).start()
+        self.breaker = CircuitBreaker(minimum_requests=3, recovery_timeout=60)
+        self.api = wikirate4py.API("token", wikirate_api_url=self.server.url, circuit_breaker=self.breaker)
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_fails_fast_while_open(self):
+        self.assertEqual("closed", self.api.circuit_state)
+        self.server.faults.fail_next(503, 3)
+        for _ in range(3):
+            self.assertRaises(WikirateServerErrorException, self.api.get_company, "Company 00001")
+        self.assertEqual("open", self.api.circuit_state)
+        self.assertRaises(CircuitOpenException, self.api.get_company, "Company 00001")
+        self.assertEqual(3, self.server.request_count())
+
+        self.breaker.reset()
+        self.assertEqual("Company 00001", self.api.get_company("Company 00001").name)
+
+    def test_client_errors_do_not_open(self):
+        for _ in range(3):
+            self.assertRaises(NotFoundException, self.api.get_company, "Missing Company")
+        self.assertEqual("closed", self.api.circuit_state)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(wikirate4py.API("token").circuit_state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from tests.config import Wikirate4PyTestCase, tape
+from wikirate4py import CompanyIdentifierIndex, CompanyItem
+
+
+def company_item(id, name, **fields):
+    data = {'id': id, 'name': name, 'type': 'Company', 'url': f'https://wikirate.org/{name}.json'}
+    data.update(fields)
+    return CompanyItem(data)
+
+
+class CompanyIdentifierIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.index = CompanyIdentifierIndex()
+        self.index.add(company_item(7217, 'Adidas AG', legal_entity_identifier='549300JSX0Z4CW0V5023',
+                                    international_securities_identification_number=['DE000A1EWWW0'],
+                                    alias=['adidas']))
+
+    def test_lookup_by_identifier_name_and_alias(self):
+        self.assertEqual(self.index.lookup_many(['549300jsx0z4cw0v5023', 'DE000A1EWWW0', 'ADIDAS', 'Puma']),
+                         {'549300jsx0z4cw0v5023': 7217, 'DE000A1EWWW0': 7217, 'ADIDAS': 7217, 'Puma': None})
+        self.assertIsNone(self.index.lookup('DE000A1EWWW0', kinds=['lei']))
+
+    def test_update_drops_stale_identifiers(self):
+        self.assertTrue(self.index.add(company_item(7217, 'Adidas AG', legal_entity_identifier='NEWLEI')))
+        self.assertIsNone(self.index.lookup('549300JSX0Z4CW0V5023'))
+        self.assertEqual(self.index.lookup('NEWLEI'), 7217)
+        self.assertFalse(self.index.add(company_item(7217, 'Adidas AG', legal_entity_identifier='NEWLEI')))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'companies.json.gz')
+            self.index.save(path)
+            self.assertEqual(CompanyIdentifierIndex(path).lookup('DE000A1EWWW0'), 7217)
+
+    def test_refresh_prunes_companies_no_longer_listed(self):
+        class FakeAPI(object):
+            @staticmethod
+            def get_companies(offset=0, limit=20, **kwargs):
+                return [company_item(5505, 'Puma', legal_entity_identifier='PUMALEI')] if offset == 0 else []
+
+        self.assertEqual(self.index.refresh(FakeAPI(), country='Germany'), 1)
+        self.assertEqual(self.index.lookup('DE000A1EWWW0'), 7217)
+        self.assertEqual(self.index.refresh(FakeAPI()), 1)
+        self.assertIsNone(self.index.lookup('DE000A1EWWW0'))
+        self.assertEqual(self.index.lookup('PUMALEI'), 5505)
+
+
+class CompanyIdentifierIndexRefreshTests(Wikirate4PyTestCase):
+
+    @tape.use_cassette('test_get_companies.yaml', serializer='yaml')
+    def test_refresh_indexes_listed_companies(self):
+        index = CompanyIdentifierIndex()
+        self.api.get_companies = self._single_page(self.api.get_companies)
+        self.assertEqual(index.refresh(self.api, per_page=10), 10)
+        self.assertEqual(index.lookup('GB0007980591'), 637)
+
+    @staticmethod
+    def _single_page(get_companies):
+        def page(offset=0, limit=20, **kwargs):
+            return get_companies(limit=10) if offset == 0 else []
+        return page
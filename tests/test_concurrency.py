@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+import unittest
+from unittest import mock
+
+import wikirate4py
+from wikirate4py import AdaptiveConcurrencyLimiter, TooManyRequestsException, WikirateServerErrorException
+from wikirate4py.concurrency import map_concurrently, RateLimiter
+from wikirate4py.mock_server import MockWikirateServer
+
+
+def throttled():
+    response = mock.Mock(status_code=429, reason="Too Many Requests")
+    response.json.side_effect = json.JSONDecodeError("Expecting value", "", 0)
+    return TooManyRequestsException(response)
+
+
+class ConcurrencyTests(unittest.TestCase):
+
+    def test_map_concurrently_keeps_order_and_errors(self):
+        def invert(value):
+            return 1 / value
+
+        results = map_concurrently(invert, [1, 0, 4], workers=3)
+        self.assertEqual([result.key for result in results], [1, 0, 4])
+        self.assertEqual(results[0].value, 1)
+        self.assertIsInstance(results[1].error, ZeroDivisionError)
+        self.assertEqual(results[2].value, 0.25)
+
+    def test_rate_limiter_paces_calls(self):
+        limiter = RateLimiter(50)
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_delete_entities_reports_outcome_per_id(self):
+        api = wikirate4py.API('token')
+        responses = {1: mock.Mock(status_code=200), 2: mock.Mock(status_code=202)}
+        api.delete = lambda path, params=None: responses[int(path.lstrip('/~'))]
+        results = api.delete_wikirate_entities([1, 2, 1, -3], workers=2)
+        self.assertEqual([result.key for result in results], [1, 2, -3])
+        self.assertEqual([result.value for result in results[:2]], [True, False])
+        self.assertIsInstance(results[2].error, wikirate4py.Wikirate4PyException)
+
+
+class AdaptiveConcurrencyLimiterTests(unittest.TestCase):
+
+    def saturate(self, limiter, error=None):
+        """Runs one round of calls filling the current limit."""
+        started = [limiter.acquire() for _ in range(limiter.limit)]
+        for start in started:
+            limiter.release(start, error)
+
+    def test_increases_additively_when_saturated(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=4, latency_tolerance=None)
+        self.saturate(limiter)
+        self.assertEqual(2, limiter.limit)
+        for _ in range(3):
+            self.saturate(limiter)
+        self.assertEqual(3, limiter.limit)
+        for _ in range(10):
+            self.saturate(limiter)
+        self.assertEqual(4, limiter.limit)
+
+    def test_does_not_increase_when_idle(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=4, latency_tolerance=None)
+        for _ in range(20):
+            limiter.release(limiter.acquire())
+        self.assertEqual(4, limiter.limit)
+
+    def test_does_not_increase_on_slow_calls(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=1, latency_tolerance=2.0)
+        limiter.release(limiter.acquire())
+        # Far slower than the lowest latency seen so far
+        limiter.release(limiter.acquire() - 10)
+        self.assertEqual(1, limiter.stats()["increases"])
+
+    def test_backs_off_once_per_round(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=16, latency_tolerance=None)
+        self.saturate(limiter, throttled())
+        self.assertEqual(8, limiter.limit)
+        self.saturate(limiter, throttled())
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(2, limiter.stats()["decreases"])
+        for _ in range(5):
+            self.saturate(limiter, throttled())
+        self.assertEqual(1, limiter.limit)
+
+    def test_other_errors_leave_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=4)
+        self.saturate(limiter, ValueError())
+        self.assertEqual(4, limiter.limit)
+
+    def test_invalid_limits(self):
+        self.assertRaises(wikirate4py.Wikirate4PyException, AdaptiveConcurrencyLimiter, initial=8, maximum=4)
+        self.assertRaises(wikirate4py.Wikirate4PyException, AdaptiveConcurrencyLimiter, backoff=1)
+
+    def test_map_concurrently_respects_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=8, latency_tolerance=None)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work(item):
+            with lock:
+                running.append(item)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(item)
+            return item
+
+        results = map_concurrently(work, range(12), workers=limiter)
+        self.assertEqual(list(range(12)), [result.value for result in results])
+        self.assertLessEqual(max(peak), 4)
+        self.assertEqual(0, limiter.in_flight)
+
+    def test_backs_off_on_server_overload(self):
+        with MockWikirateServer(companies=20, metrics=1, years=1, suppliers=0) as server:
+            api = wikirate4py.API("token", wikirate_api_url=server.url)
+            server.faults.fail_next(503, 4)
+            limiter = AdaptiveConcurrencyLimiter(initial=8, maximum=8)
+            results = api.get_companies_by_ids([f"Company {i:05d}" for i in range(1, 21)], workers=limiter)
+            api.close()
+        self.assertEqual(4, sum(isinstance(result.error, WikirateServerErrorException) for result in results))
+        self.assertLess(limiter.limit, 8)
+
@@ -0,0 +1,89 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+from wikirate4py import AdaptiveConcurrencyLimiter, Crawler, MemorySink
+from wikirate4py.concurrency import lane_scope, selected_lane
+
+
+class FakeAPI(object):
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def record(self, *call):
+        with self.lock:
+            self.calls.append(call)
+
+    def get_dataset(self, identifier, **kwargs):
+        self.record('get_dataset', identifier)
+        return SimpleNamespace(id=1, name='Dataset')
+
+    def get_metrics(self, identifier, offset, limit, **kwargs):
+        self.record('get_metrics', identifier, offset)
+        return [SimpleNamespace(id=10, metric_type='Researched'),
+                SimpleNamespace(id=11, metric_type='Relationship')][offset:offset + limit]
+
+    def get_companies(self, identifier, offset, limit, **kwargs):
+        self.record('get_companies', identifier, offset)
+        return [SimpleNamespace(id=20 + i) for i in range(3)][offset:offset + limit]
+
+    def get_answers(self, identifier, offset, limit, **kwargs):
+        self.record('get_answers', identifier, offset)
+        return [SimpleNamespace(id=30, sources=['Source-1']),
+                SimpleNamespace(id=31, sources=['Source-1', 'Source-2'])][offset:offset + limit]
+
+    def get_relationships(self, identifier, offset, limit, **kwargs):
+        self.record('get_relationships', identifier, offset)
+        return [SimpleNamespace(id=40)][offset:offset + limit]
+
+    def get_source(self, identifier, **kwargs):
+        self.record('get_source', identifier)
+        return SimpleNamespace(id={'Source-1': 50, 'Source-2': 51}[identifier])
+
+
+class CrawlerTests(unittest.TestCase):
+
+    def test_crawls_dataset_bundle(self):
+        api = FakeAPI()
+        sink = MemorySink()
+        stats = Crawler(api, sink=sink, workers=4, per_page=2).run(datasets=['Dataset'])
+        self.assertEqual(stats, {'dataset': 1, 'metric': 2, 'company': 3, 'answer': 2, 'relationship': 1,
+                                 'source': 2, 'errors': 0})
+        self.assertEqual(sorted(source.id for source in sink.entities['source']), [50, 51])
+        # Full pages are followed by the next page, and every source is fetched once
+        self.assertIn(('get_companies', 1, 2), api.calls)
+        self.assertEqual(sorted(call for call in api.calls if call[0] == 'get_source'),
+                         [('get_source', 'Source-1'), ('get_source', 'Source-2')])
+
+    def test_depth_limit_and_errors(self):
+        api = FakeAPI()
+        api.get_companies = lambda *args, **kwargs: 1 / 0
+        crawler = Crawler(api, workers=2, max_depth=1)
+        stats = crawler.run(datasets=['Dataset'])
+        self.assertNotIn('source', stats)
+        self.assertNotIn('relationship', stats)
+        self.assertEqual(stats['errors'], 1)
+        self.assertTrue(isinstance(crawler.errors[0][1], ZeroDivisionError))
+
+    def test_lanes(self):
+        api = FakeAPI()
+        lanes = set()
+        get_dataset = api.get_dataset
+        api.get_dataset = lambda *args, **kwargs: lanes.add(selected_lane()) or get_dataset(*args, **kwargs)
+        Crawler(api, workers=2).run(datasets=['Dataset'])
+        with lane_scope('interactive'):
+            Crawler(api, workers=2).run(datasets=['Dataset'])
+        self.assertEqual({'batch', 'interactive'}, lanes)
+
+    def test_adaptive_workers(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=4)
+        stats = Crawler(FakeAPI(), workers=limiter, per_page=2).run(datasets=['Dataset'])
+        self.assertEqual(stats['errors'], 0)
+        self.assertEqual(stats['answer'], 2)
+        self.assertEqual(0, limiter.in_flight)
+
+
+if __name__ == '__main__':
+    unittest.main()
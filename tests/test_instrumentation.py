@@ -0,0 +1,109 @@
+import unittest
+
+import wikirate4py
+from wikirate4py import HistogramCollector, PrometheusCollector, RequestRecord, TooManyRequestsException
+from wikirate4py.instrumentation import endpoint_template
+from wikirate4py.mock_server import MockWikirateServer
+
+
+class EndpointTemplateTests(unittest.TestCase):
+
+    def test_card_names_are_replaced(self):
+        self.assertEqual("/{card}.json", endpoint_template("https://wikirate.org/Puma.json"))
+        self.assertEqual("/{card}+Answers.json",
+                         endpoint_template("https://wikirate.org/Core+Company_Report_Available+Answers.json"))
+        self.assertEqual("/Companies.json", endpoint_template("https://wikirate.org/Companies.json"))
+        self.assertEqual("/card/create", endpoint_template("https://wikirate.org/card/create"))
+        self.assertEqual("/update/{card}", endpoint_template("https://wikirate.org/update/Puma"))
+        self.assertEqual("/{card}", endpoint_template("https://wikirate.org/~123"))
+
+
+class RequestHookTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockWikirateServer(companies=10, metrics=2, years=1).start()
+        self.records = []
+        self.api = wikirate4py.API("token", wikirate_api_url=self.server.url, hooks=[self.records.append])
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_records_model_calls(self):
+        self.api.get_answers(metric_name="Metric 001", metric_designer="Mock Designer", limit=5)
+        record = self.records[0]
+        self.assertEqual(1, len(self.records))
+        self.assertEqual("get_answers", record.call)
+        self.assertEqual(("GET", "/{card}+Answers.json", 200, 5), (record.method, record.endpoint, record.status,
+                                                                   record.items))
+        self.assertGreater(record.response_bytes, 0)
+        self.assertIsNotNone(record.decode)
+        self.assertIsNotNone(record.build)
+        self.assertAlmostEqual(record.send + record.download + record.decode + record.build, record.elapsed)
+
+    def test_records_errors_and_plain_requests(self):
+        self.server.faults.fail_next(429)
+        with self.assertRaises(TooManyRequestsException) as raised:
+            self.api.get_company("Company 00001")
+        self.api.delete_wikirate_entity(self.api.get_company("Company 00002").id)
+
+        throttled, fetched, deleted = self.records
+        self.assertIs(raised.exception, throttled.error)
+        self.assertEqual((429, None), (throttled.status, throttled.decode))
+        self.assertIsNone(fetched.error)
+        self.assertEqual(("DELETE", None, "/{card}"), (deleted.method, deleted.call, deleted.endpoint))
+
+    def test_failing_hook_does_not_break_requests(self):
+        self.api.add_hook(lambda record: 1 / 0)
+        self.assertEqual("Company 00001", self.api.get_company("Company 00001").name)
+        self.assertEqual(1, len(self.records))
+
+    def test_no_records_without_hooks(self):
+        self.api.remove_hook(self.records.append)
+        self.api.get_company("Company 00001")
+        self.assertEqual([], self.records)
+
+
+class CollectorTests(unittest.TestCase):
+
+    def record(self, endpoint_path, status, elapsed, error=None):
+        record = RequestRecord("get", f"https://wikirate.org/{endpoint_path}")
+        record.status, record.send, record.error, record.items, record.response_bytes = status, elapsed, error, 2, 10
+        return record
+
+    def test_histogram_summary(self):
+        collector = HistogramCollector(buckets=(0.1, 1.0))
+        for elapsed in (0.05, 0.05, 0.5, 2.0):
+            collector(self.record("Puma.json", 200, elapsed))
+        collector(self.record("Puma.json", 429, 0.01, error=ValueError("throttled")))
+        stats = collector.summary()[("/{card}.json", "GET")]
+        self.assertEqual(5, stats["count"])
+        self.assertEqual({200: 4, 429: 1}, stats["statuses"])
+        self.assertEqual({"ValueError": 1}, stats["errors"])
+        self.assertLessEqual(stats["p50"], 0.1)
+        self.assertEqual(2.0, stats["max"])
+        self.assertEqual(50, stats["response_bytes"])
+
+    def test_prometheus_exposition(self):
+        collector = PrometheusCollector(buckets=(0.1, 1.0))
+        collector(self.record("Companies.json", 200, 0.05))
+        collector(self.record("Companies.json", 200, 0.5))
+        text = collector.exposition()
+        self.assertIn('wikirate4py_requests_total{endpoint="/Companies.json",method="GET",status="200"} 2', text)
+        self.assertIn('wikirate4py_request_duration_seconds_bucket{endpoint="/Companies.json",method="GET",'
+                      'le="0.1"} 1', text)
+        self.assertIn('wikirate4py_request_duration_seconds_bucket{endpoint="/Companies.json",method="GET",'
+                      'le="+Inf"} 2', text)
+        self.assertIn('wikirate4py_response_items_total{endpoint="/Companies.json",method="GET"} 4', text)
+
+    def test_prometheus_gauges(self):
+        collector = PrometheusCollector()
+        collector.add_gauge("concurrency_limit", "Concurrent requests allowed.", lambda: 12)
+        collector.add_gauge("broken", "Raises.", lambda: 1 / 0)
+        text = collector.exposition()
+        self.assertIn("# TYPE wikirate4py_concurrency_limit gauge\nwikirate4py_concurrency_limit 12\n", text)
+        self.assertNotIn("broken", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
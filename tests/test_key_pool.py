@@ -0,0 +1,127 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import wikirate4py
+from wikirate4py import ApiKeyPool, DeadlineExceededException, Lane, PriorityLanes, TooManyRequestsException
+from wikirate4py.mock_server import MockWikirateServer
+from wikirate4py.timeouts import Deadline
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ApiKeyPoolTests(unittest.TestCase):
+
+    def test_balances_running_requests(self):
+        pool = ApiKeyPool({"a": "key-a", "b": "key-b"})
+        first, second = pool.acquire(), pool.acquire()
+        self.assertEqual({"key-a", "key-b"}, {first, second})
+        pool.release(first, 200)
+        self.assertEqual(first, pool.acquire())
+        self.assertEqual(2, pool.stats()["a" if first == "key-a" else "b"]["requests"])
+
+    def test_picks_key_with_most_budget(self):
+        clock = FakeClock()
+        pool = ApiKeyPool({"a": "key-a", "b": "key-b"}, rate=1, burst=3, clock=clock)
+        keys = [pool.acquire() for _ in range(6)]
+        self.assertEqual(3, keys.count("key-a"))
+        self.assertEqual(3, keys.count("key-b"))
+        for key in keys:
+            pool.release(key, 200)
+        # Both buckets are empty: a deadline shorter than the refill fails fast
+        self.assertRaises(DeadlineExceededException, pool.acquire, Deadline(0.5))
+
+    def test_throttled_key_rests(self):
+        clock = FakeClock()
+        pool = ApiKeyPool({"a": "key-a", "b": "key-b"}, cooldown=30, clock=clock)
+        pool.release(pool.acquire(), 200)
+        pool.release("key-b" if pool.acquire() == "key-b" else "key-a", 429, "10")
+        stats = pool.stats()
+        throttled = "a" if stats["a"]["throttled"] else "b"
+        other = "b" if throttled == "a" else "a"
+        self.assertEqual(10, stats[throttled]["cooldown"])
+        self.assertEqual({"key-" + other}, {pool.acquire() for _ in range(3)})
+        clock.now = 11
+        self.assertEqual("key-" + throttled, pool.acquire())
+
+    def test_invalid_pools(self):
+        self.assertRaises(wikirate4py.Wikirate4PyException, ApiKeyPool, [])
+        self.assertRaises(wikirate4py.Wikirate4PyException, ApiKeyPool, ["key"], rate=0)
+
+
+class APIKeyPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockWikirateServer(companies=20, metrics=1, years=1, suppliers=0).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_requests_use_every_key(self):
+        api = wikirate4py.API(["first-api-key", "second-api-key"], wikirate_api_url=self.server.url)
+        self.assertNotIn("X-API-Key", api.session.headers)
+        sent = []
+        lock = threading.Lock()
+        request = api.session.request
+
+        def record(*args, **kwargs):
+            with lock:
+                sent.append(kwargs["headers"]["X-API-Key"])
+            return request(*args, **kwargs)
+
+        with mock.patch.object(api.session, "request", side_effect=record):
+            results = api.get_companies_by_ids([f"Company {i:05d}" for i in range(1, 11)], workers=4)
+        api.close()
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual({"first-api-key", "second-api-key"}, set(sent))
+        self.assertEqual(10, sum(usage["requests"] for usage in api.key_pool.stats().values()))
+
+    def test_throttled_key_is_put_on_cooldown(self):
+        pool = ApiKeyPool(["first-api-key", "second-api-key"])
+        api = wikirate4py.API(pool, wikirate_api_url=self.server.url)
+        self.server.faults.fail_next(429)
+        self.assertRaises(TooManyRequestsException, api.get_company, "Company 00001")
+        self.assertEqual("Company 00001", api.get_company("Company 00001").name)
+        api.close()
+        stats = pool.stats()
+        self.assertEqual(1, sum(usage["throttled"] for usage in stats.values()))
+        self.assertEqual(1, sum(usage["cooldown"] > 0 for usage in stats.values()))
+
+    def test_requests_waiting_for_a_key_hold_no_lane_slot(self):
+        pool = ApiKeyPool(["api-key"])
+        lanes = PriorityLanes([Lane("interactive", priority=0), Lane("batch", priority=1)], max_in_flight=2)
+        api = wikirate4py.API(pool, wikirate_api_url=self.server.url, lanes=lanes)
+        pool.release(pool.acquire(), 429, "0.5")
+        batch = [threading.Thread(target=api.get_companies, kwargs={"limit": 5}) for _ in range(2)]
+        for thread in batch:
+            thread.start()
+        time.sleep(0.1)
+        # Both batch requests wait for the throttled key without taking the two slots
+        self.assertEqual(0, lanes.stats()["batch"]["in_flight"])
+        lanes.release(lanes.acquire(self.server.url + "Company_00001.json", deadline=Deadline(0.05)))
+        started = time.monotonic()
+        self.assertEqual("Company 00001", api.get_company("Company 00001").name)
+        self.assertLess(time.monotonic() - started, 1.0)
+        for thread in batch:
+            thread.join()
+        api.close()
+        self.assertEqual(2, lanes.stats()["batch"]["requests"])
+
+    def test_cancelled_request_refunds_its_key(self):
+        pool = ApiKeyPool(["api-key"], rate=1, clock=FakeClock())
+        pool.cancel(pool.acquire())
+        self.assertEqual({"requests": 0, "throttled": 0, "errors": 0, "in_flight": 0, "cooldown": 0.0},
+                         pool.stats()["key 1"])
+        self.assertEqual("api-key", pool.acquire(deadline=Deadline(0.01)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import threading
+import time
+import unittest
+
+import wikirate4py
+from wikirate4py import DeadlineExceededException, Lane, PriorityLanes, Wikirate4PyException
+from wikirate4py.concurrency import lane_scope, map_concurrently, selected_lane
+from wikirate4py.mock_server import MockWikirateServer
+from wikirate4py.timeouts import Deadline
+
+API_URL = "https://wikirate.org/"
+CARD = API_URL + "Puma.json"
+LIST = API_URL + "Companies.json"
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.001)
+
+
+class PriorityLanesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lanes = PriorityLanes([Lane("interactive", priority=0, reserved=1), Lane("batch", priority=1)],
+                                   max_in_flight=3)
+
+    def test_lane_selection(self):
+        self.assertEqual("interactive", self.lanes.lane_of(CARD).name)
+        self.assertEqual("batch", self.lanes.lane_of(LIST).name)
+        self.assertEqual("batch", self.lanes.lane_of(API_URL + "card/create", files={"file": object()}).name)
+        with lane_scope("batch"):
+            self.assertEqual("batch", self.lanes.lane_of(CARD).name)
+            with lane_scope("interactive", override=False):
+                self.assertEqual("batch", self.lanes.lane_of(CARD).name)
+        with lane_scope("bulk"):
+            self.assertRaises(Wikirate4PyException, self.lanes.lane_of, CARD)
+
+    def test_reserved_slots(self):
+        batch = [self.lanes.acquire(LIST), self.lanes.acquire(LIST)]
+        self.assertRaises(DeadlineExceededException, self.lanes.acquire, LIST, deadline=Deadline(0.02))
+        interactive = self.lanes.acquire(CARD)
+        self.assertEqual({"interactive": 1, "batch": 2},
+                         {name: stats["in_flight"] for name, stats in self.lanes.stats().items()})
+        for lane in batch + [interactive]:
+            self.lanes.release(lane)
+
+    def test_shared_slots_go_to_higher_priority(self):
+        held = [self.lanes.acquire(CARD), self.lanes.acquire(LIST), self.lanes.acquire(LIST)]
+        acquired = []
+        threads = [threading.Thread(target=lambda path=path: acquired.append(self.lanes.acquire(path).name))
+                   for path in (LIST, CARD)]
+        threads[0].start()
+        wait_until(lambda: self.lanes.stats()["batch"]["waiting"] == 1)
+        threads[1].start()
+        wait_until(lambda: self.lanes.stats()["interactive"]["waiting"] == 1)
+        self.lanes.release(held[1])
+        wait_until(lambda: acquired)
+        self.assertEqual(["interactive"], acquired)
+        self.lanes.release(held[2])
+        for thread in threads:
+            thread.join(1)
+        self.assertEqual(["interactive", "batch"], acquired)
+
+    def test_rate_wait_honours_deadline(self):
+        lanes = PriorityLanes([Lane("interactive", share=0.5), Lane("batch", share=0.5)], max_in_flight=3, rate=2)
+        lanes.release(lanes.acquire(CARD))
+        started = time.monotonic()
+        self.assertRaises(DeadlineExceededException, lanes.acquire, CARD, deadline=Deadline(0.05))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(1, lanes.stats()["interactive"]["requests"])
+
+    def test_invalid_lanes(self):
+        self.assertRaises(Wikirate4PyException, PriorityLanes, [Lane("interactive", reserved=4)], max_in_flight=2)
+        self.assertRaises(Wikirate4PyException, PriorityLanes, [Lane("interactive")])
+        self.assertRaises(Wikirate4PyException, Lane, "batch", share=2)
+
+    def test_batch_operations_default_to_batch_lane(self):
+        self.assertEqual(["batch", "batch"], [result.value for result in
+                                              map_concurrently(lambda _: selected_lane(), [1, 2], workers=2)])
+        with lane_scope("interactive"):
+            self.assertEqual(["interactive", "interactive"],
+                             [result.value for result in
+                              map_concurrently(lambda _: selected_lane(), [1, 2], workers=2)])
+
+
+class APILanesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockWikirateServer(companies=20, metrics=1, years=1, suppliers=0, latency=0.05).start()
+        self.api = wikirate4py.API("token", wikirate_api_url=self.server.url, pool_size=4, lanes=True)
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_interactive_calls_skip_batch_queue(self):
+        batch = threading.Thread(target=self.api.get_companies_by_ids,
+                                 args=([f"Company {i:05d}" for i in range(1, 21)],), kwargs={"workers": 20})
+        batch.start()
+        wait_until(lambda: self.api.lanes.stats()["batch"]["waiting"] > 0)
+        self.assertEqual("Company 00001", self.api.get_company("Company 00001").name)
+        self.api.get_companies(limit=5, lane="interactive")
+        batch.join()
+        stats = self.api.lanes.stats()
+        self.assertEqual(2, stats["interactive"]["requests"])
+        self.assertEqual(20, stats["batch"]["requests"])
+        self.assertLess(stats["interactive"]["max_wait"], 0.05)
+        self.assertGreater(stats["batch"]["max_wait"], 0.05)
+
+    def test_lane_of_undecorated_methods(self):
+        company_id = self.api.get_company("Company 00001").id
+        self.api.get_content("Company 00001", lane="batch")
+        self.api.update_card(company_id, json="{}", lane="batch")
+        self.assertEqual({"interactive": 1, "batch": 2},
+                         {name: stats["requests"] for name, stats in self.api.lanes.stats().items()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+import wikirate4py
+from wikirate4py.api import compute_list_delta
+
+
+class ListMembershipTests(unittest.TestCase):
+
+    def setUp(self):
+        self.api = wikirate4py.API('token')
+        self.sent = []
+        self.api.post = lambda path, params=None, **kwargs: self.sent.append(params)
+
+    def test_compute_list_delta(self):
+        to_add, to_remove = compute_list_delta(['H&M', 'Gap inc.', 'Puma'], ['puma', 'Gap Inc', 'Adidas AG'])
+        self.assertEqual(to_add, ['Adidas AG'])
+        self.assertEqual(to_remove, ['H&M'])
+
+    def test_update_list_items_chunks_requests(self):
+        self.api.update_company_group(5671631, add=range(1, 6), remove=['Puma'], chunk_size=2)
+        self.assertEqual([params.get('add_item[]') for params in self.sent[:3]],
+                         [['~1', '~2'], ['~3', '~4'], ['~5']])
+        self.assertEqual(self.sent[3]['drop_item[]'], ['Puma'])
+        self.assertTrue(all(params['card[name]'] == '~5671631+Company' for params in self.sent))
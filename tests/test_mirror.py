@@ -0,0 +1,64 @@
+import time
+import unittest
+
+from wikirate4py import Mirror, AnswerItem, CompanyItem
+
+
+def answer_item(id, metric, company, year, value):
+    name = f'{metric}+{company}+{year}'
+    return AnswerItem({'id': id, 'name': name, 'type': 'Answer', 'url': f'https://wikirate.org/{name}.json',
+                       'metric': metric, 'company': company, 'year': year, 'value': value, 'sources': []})
+
+
+class FakeAPI(object):
+
+    def __init__(self):
+        self.answers = [answer_item(1, 'Core+Company Report Available', 'Adidas AG', 2023, 'Yes'),
+                        answer_item(2, 'Core+Company Report Available', 'Puma', 2023, 'No'),
+                        answer_item(3, 'Core+Company Report Available', 'Adidas AG', 2022, 'Yes')]
+        self.companies = [CompanyItem({'id': 7217, 'name': 'Adidas AG', 'type': 'Company',
+                                       'url': 'https://wikirate.org/Adidas_AG.json'})]
+        self.calls = []
+
+    def get_answers(self, offset=0, limit=20, **kwargs):
+        self.calls.append(kwargs)
+        return self.answers[offset:offset + limit]
+
+    def get_companies(self, offset=0, limit=20, **kwargs):
+        return self.companies[offset:offset + limit]
+
+
+class MirrorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeAPI()
+        self.mirror = Mirror(self.api)
+        self.mirror.sync('companies')
+        self.result = self.mirror.sync('answers', per_page=2, metric_name='Company Report Available',
+                                       metric_designer='Core')
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def test_sync_pages_through_answers(self):
+        self.assertEqual(self.result.count, 3)
+        self.assertIsNone(self.result.updated)
+        self.assertEqual(self.mirror.count('answers'), 3)
+
+    def test_read_methods_return_models(self):
+        answers = self.mirror.get_answers(metric_name='Company Report Available', metric_designer='Core', year=2023)
+        self.assertEqual([answer.company for answer in answers], ['Adidas AG', 'Puma'])
+        self.assertTrue(all(isinstance(answer, AnswerItem) for answer in answers))
+        self.assertEqual([answer.id for answer in self.mirror.get_answers(company=7217)], [1, 3])
+        self.assertEqual(self.mirror.get_answers(identifier='puma')[0].value, 'No')
+        self.assertEqual(self.mirror.get_company('Adidas AG').id, 7217)
+        self.assertIsNone(self.mirror.get_company(1))
+
+    def test_resync_requests_recently_updated_answers(self):
+        self.api.answers[1] = answer_item(2, 'Core+Company Report Available', 'Puma', 2023, 'Yes')
+        result = self.mirror.sync('answers', metric_name='Company Report Available', metric_designer='Core')
+        self.assertEqual(result.updated, 'week')
+        self.assertEqual(self.api.calls[-1]['updated'], 'week')
+        self.assertEqual(self.mirror.get_answer(2).value, 'Yes')
+        self.assertLessEqual(self.mirror.last_synced('answers', metric_name='Company Report Available',
+                                                     metric_designer='Core'), time.time())
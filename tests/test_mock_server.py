@@ -0,0 +1,86 @@
+import unittest
+
+import wikirate4py
+from wikirate4py import Cursor, TooManyRequestsException, WikirateServerErrorException, NotFoundException
+from wikirate4py.mock_server import MockWikirateServer, MockWikirate
+
+
+class MockWikirateServerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockWikirateServer(companies=30, metrics=3, years=2, suppliers=2, seed=1).start()
+        self.api = wikirate4py.API("token", wikirate_api_url=self.server.url)
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def test_get_cards_by_name_and_id(self):
+        company = self.api.get_company("Company 00002")
+        self.assertEqual("Company 00002", company.name)
+        self.assertEqual(company.name, self.api.get_company(company.id).name)
+        metric = self.api.get_metric(metric_name="Metric 001", metric_designer="Mock Designer")
+        self.assertEqual("Researched", metric.metric_type)
+
+    def test_cursor_pages_through_answers(self):
+        cursor = Cursor(self.api.get_answers, per_page=7, metric_name="Metric 002", metric_designer="Mock Designer")
+        answers = []
+        while cursor.has_next():
+            answers.extend(cursor.next())
+        self.assertEqual(60, len(answers))
+        self.assertEqual(60, len({answer.id for answer in answers}))
+
+    def test_list_filters(self):
+        answers = self.api.get_answers(metric_name="Metric 001", metric_designer="Mock Designer", year=2024,
+                                       limit=100)
+        self.assertEqual(30, len(answers))
+        self.assertEqual({2024}, {answer.year for answer in answers})
+        company = self.api.get_company("Company 00005")
+        relationships = self.api.get_relationships(metric_name="Supplied By", metric_designer="Commons",
+                                                   subject_company_id=company.id)
+        self.assertTrue(relationships)
+        self.assertEqual({company.id}, {relationship.subject_company_id for relationship in relationships})
+
+    def test_create_update_delete(self):
+        self.api.add_company(name="New Company", headquarters="Germany")
+        answer = self.api.add_answer(metric_designer="Mock Designer", metric_name="Metric 001",
+                                     company="New Company", year=2023, value="12", source="Source-000000001")
+        self.assertEqual("12", answer.value)
+        updated = self.api.update_answer(metric_designer="Mock Designer", metric_name="Metric 001",
+                                         company="New Company", year=2023, value="13")
+        self.assertEqual("13", updated.value)
+        self.assertEqual(1, len(self.api.get_answers(identifier="New Company")))
+
+        self.assertTrue(self.api.delete_wikirate_entity(answer.id))
+        with self.assertRaises(NotFoundException):
+            self.api.get_answer(answer.id)
+        self.assertEqual([], self.api.get_answers(identifier="New Company"))
+
+    def test_injected_failures(self):
+        self.server.faults.fail_next(429)
+        self.server.faults.fail_next(503)
+        with self.assertRaises(TooManyRequestsException) as throttled:
+            self.api.get_company("Company 00001")
+        self.assertEqual("1", throttled.exception.response.headers["Retry-After"])
+        with self.assertRaises(WikirateServerErrorException):
+            self.api.get_company("Company 00001")
+        self.assertEqual("Company 00001", self.api.get_company("Company 00001").name)
+        self.assertEqual(1, self.server.request_count(status=429))
+        self.assertEqual(3, self.server.request_count(method="GET"))
+
+    def test_concurrent_requests(self):
+        results = self.api.get_companies_by_ids([f"Company {i:05d}" for i in range(1, 31)], workers=8)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(30, self.server.request_count(status=200))
+
+
+class MockWikirateTests(unittest.TestCase):
+
+    def test_generation_is_deterministic(self):
+        first, second = MockWikirate(companies=5, metrics=2, seed=3), MockWikirate(companies=5, metrics=2, seed=3)
+        self.assertEqual(first.cards, second.cards)
+        self.assertEqual(5 * 2 * 3, first.count("Answer"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import io
+import os
+import unittest
+
+from wikirate4py.exceptions import Wikirate4PyException
+from wikirate4py.multipart import MultipartEncoder
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), 'files', 'TestSource.pdf')
+
+
+class MultipartEncoderTests(unittest.TestCase):
+
+    def test_encodes_fields_and_files(self):
+        encoder = MultipartEncoder(fields={'card[type]': 'Source', 'add_item[]': ['~1', '~2']},
+                                   files={'card[subcards][+file][file]': ('report.pdf', io.BytesIO(b'%PDF-1.4'))},
+                                   boundary='xyz')
+        body = encoder.read()
+        self.assertEqual(len(body), len(encoder))
+        self.assertEqual(body.count(b'name="add_item[]"'), 2)
+        self.assertIn(b'filename="report.pdf"\r\nContent-Type: application/pdf\r\n\r\n%PDF-1.4\r\n', body)
+        self.assertTrue(body.endswith(b'--xyz--\r\n'))
+        self.assertEqual(encoder.content_type, 'multipart/form-data; boundary=xyz')
+
+    def test_streams_file_in_bounded_blocks(self):
+        updates = []
+        with open(TEST_FILE, 'rb') as file:
+            encoder = MultipartEncoder(fields={'format': 'json'}, files={'file': file}, chunk_size=1024,
+                                       callback=lambda progress: updates.append(progress.bytes_sent))
+            blocks = list(encoder)
+        self.assertTrue(all(len(block) <= 1024 for block in blocks))
+        self.assertEqual(sum(len(block) for block in blocks), len(encoder))
+        with open(TEST_FILE, 'rb') as file:
+            self.assertIn(file.read(), b''.join(blocks))
+        self.assertEqual(updates[-1], len(encoder))
+        self.assertTrue(encoder.progress.done)
+
+    def test_escapes_header_params(self):
+        encoder = MultipartEncoder(files={'file': ('a"b\r\nc.pdf', io.BytesIO(b'%PDF'))}, boundary='xyz')
+        self.assertIn(b'filename="a%22b%0D%0Ac.pdf"\r\n', encoder.read())
+
+    def test_fails_when_file_size_changes(self):
+        for content in (b'%PDF', b'%PDF-1.4 and more'):
+            file = io.BytesIO(b'%PDF-1.4')
+            encoder = MultipartEncoder(files={'file': ('report.pdf', file)}, boundary='xyz')
+            file.seek(0)
+            file.truncate()
+            file.write(content)
+            file.seek(0)
+            self.assertRaises(Wikirate4PyException, encoder.read)
@@ -0,0 +1,57 @@
+import unittest
+from unittest import mock
+
+from tests.config import Wikirate4PyTestCase, tape
+from wikirate4py.name_cache import NameResolutionCache, card_key
+
+
+class NameResolutionCacheTests(unittest.TestCase):
+
+    def test_card_key_ignores_case_and_punctuation(self):
+        self.assertEqual(card_key('Core+Company Report Available'), card_key('core+company_report_available'))
+        self.assertNotEqual(card_key('Core+Country'), card_key('Core Country'))
+
+    def test_evicts_least_recently_used(self):
+        cache = NameResolutionCache(max_size=2)
+        cache.add('Puma', 1)
+        cache.add('Adidas AG', 2)
+        cache.resolve('Puma')
+        cache.add('H&M', 3)
+        self.assertEqual(cache.resolve('puma'), 1)
+        self.assertIsNone(cache.resolve('Adidas AG'))
+        cache.forget(2)
+        self.assertEqual(len(cache), 2)
+
+    def test_forget_drops_every_name_of_an_id(self):
+        cache = NameResolutionCache()
+        cache.add('Adidas AG', 7217)
+        cache.add('adidas', 7217)
+        cache.add('Puma', 5505)
+        cache.add('Puma', 7217)
+        cache.forget(7217)
+        self.assertEqual(len(cache), 0)
+        cache.forget(5505)
+        self.assertEqual(cache._keys, {})
+
+
+class NameResolutionTests(Wikirate4PyTestCase):
+
+    @tape.use_cassette('test_get_answer.yaml', serializer='yaml')
+    def test_learns_names_from_responses(self):
+        self.assertEqual(self.api.card_identifier('Adidas AG'), 'Adidas_AG')
+        self.api.get_answer(7324421)
+        self.assertEqual(self.api.card_identifier('Adidas AG'), '~7217')
+        self.assertEqual(self.api.card_identifier('Responsible Sourcing Network+Signatory Turkmen Cotton Pledge'),
+                         '~5340897')
+
+    def test_card_names_resolve_each_part(self):
+        self.api.name_cache.add('Adidas AG', 7217)
+        with mock.patch.object(self.api, 'post', side_effect=RuntimeError) as post:
+            self.assertRaises(RuntimeError, self.api.add_answer, metric_designer=2929015, metric_name='Address',
+                              company='Adidas AG', year=2023, value='Herzogenaurach', source='Source-1')
+            self.assertRaises(RuntimeError, self.api.add_relationship, metric_designer=2929015,
+                              metric_name=2929016, subject_company='Adidas AG', object_company=5505, year=2023,
+                              value='Tier 1', source='Source-1')
+        answer, relationship = post.call_args_list
+        self.assertEqual('~2929015+Address+~7217+2023', answer.kwargs['params']['card[name]'])
+        self.assertEqual('~2929015+~2929016+~7217+2023+~5505', relationship.args[1]['card[name]'])
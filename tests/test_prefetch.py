@@ -0,0 +1,71 @@
+import unittest
+
+import wikirate4py
+from wikirate4py import AnswerItem, SourceItem, Wikirate4PyException
+
+
+def answer_item(id, company, sources):
+    name = f'Core+Company Report Available+{company}+2023'
+    return AnswerItem({'id': id, 'name': name, 'type': 'Answer', 'url': f'https://wikirate.org/{name}.json',
+                       'metric': 'Core+Company Report Available', 'company': company, 'year': 2023,
+                       'value': 'Yes', 'sources': sources})
+
+
+class FakeResponse(object):
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class PrefetchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.api = wikirate4py.API('token')
+        self.fetched = []
+
+        def getter(kind):
+            def get(identifier, **kwargs):
+                self.fetched.append((kind, identifier))
+                if identifier == 'Missing Inc':
+                    raise Wikirate4PyException('404 Not Found')
+                return f'{kind}:{identifier}'
+            return get
+
+        self.api.get_company = getter('company')
+        self.api.get_metric = getter('metric')
+        self.api.get_source = getter('source')
+        self.answers = [answer_item(1, 'Adidas AG', ['Source-1', 'Source-2']),
+                        answer_item(2, 'adidas ag', ['Source-2']),
+                        answer_item(3, 'Missing Inc', [])]
+
+    def test_fetches_each_related_card_once(self):
+        self.api.prefetch(self.answers, workers=4)
+        self.assertEqual(sorted(self.fetched), [('company', 'Adidas AG'), ('company', 'Missing Inc'),
+                                                ('metric', 'Core+Company Report Available'),
+                                                ('source', 'Source-1'), ('source', 'Source-2')])
+        self.assertEqual(self.answers[1].prefetched['company'], 'company:Adidas AG')
+        self.assertEqual(self.answers[0].prefetched['sources'], ['source:Source-1', 'source:Source-2'])
+        self.assertIsNone(self.answers[2].prefetched['company'])
+
+    def test_source_items_are_fetched_by_id(self):
+        source = SourceItem({'id': 22429361, 'name': 'Source-000241607', 'type': 'Source',
+                             'url': 'https://wikirate.org/Source_000241607.json'})
+        answer = answer_item(4, 'Puma', [])
+        answer.sources = [source]
+        self.api.prefetch([answer], related=['sources'])
+        self.assertEqual(answer.prefetched['sources'], ['source:22429361'])
+
+    def test_prefetch_argument_of_list_methods(self):
+        items = [answer.raw for answer in self.answers[:2]]
+        self.api.get = lambda path, **kwargs: FakeResponse({'items': items})
+        answers = self.api.get_answers(metric_name='Company Report Available', metric_designer='Core',
+                                       prefetch=['company'])
+        self.assertEqual([answer.prefetched['company'] for answer in answers], ['company:Adidas AG'] * 2)
+        self.assertEqual(self.fetched, [('company', 'Adidas AG')])
+
+    def test_unknown_field_raises(self):
+        with self.assertRaises(Wikirate4PyException):
+            self.api.prefetch(self.answers, related=['dataset'])
@@ -0,0 +1,54 @@
+import unittest
+
+from wikirate4py import AnswerQueryEngine, AnswerItem, CompanyItem, MetricItem, Wikirate4PyException
+
+
+def answer_item(id, metric, company, year, value, sources=()):
+    name = f'{metric}+{company}+{year}'
+    return AnswerItem({'id': id, 'name': name, 'type': 'Answer', 'url': f'https://wikirate.org/{name}.json',
+                       'metric': metric, 'company': company, 'year': year, 'value': value,
+                       'sources': list(sources)})
+
+
+class AnswerQueryEngineTests(unittest.TestCase):
+
+    def setUp(self):
+        emissions = 'Global Reporting Initiative+Direct greenhouse gas (GHG) emissions (Scope 1)'
+        self.engine = AnswerQueryEngine(
+            answers=[answer_item(1, 'Core+Company Report Available', 'Adidas AG', 2023, 'Yes', ['Source-1']),
+                     answer_item(2, 'Core+Company Report Available', 'Puma', 2023, 'No'),
+                     answer_item(3, 'Core+Company Report Available', 'Adidas AG', 2022, 'Unknown'),
+                     answer_item(4, emissions, 'Adidas AG', 2023, '1,200.5'),
+                     answer_item(5, emissions, 'Puma', 2023, '300')],
+            companies=[CompanyItem({'id': 7217, 'name': 'Adidas AG', 'type': 'Company', 'headquarters': 'Germany',
+                                    'url': 'https://wikirate.org/Adidas_AG.json'}),
+                       CompanyItem({'id': 9350, 'name': 'Puma', 'type': 'Company', 'headquarters': 'Germany',
+                                    'url': 'https://wikirate.org/Puma.json'})],
+            metrics=[MetricItem({'id': 826615, 'name': emissions, 'designer': 'Global Reporting Initiative',
+                                 'title': 'Direct greenhouse gas (GHG) emissions (Scope 1)', 'type': 'Metric',
+                                 'value_type': 'Number', 'value_options': [], 'topics': ['Climate Change'],
+                                 'url': 'https://wikirate.org/GHG.json'})],
+            company_groups={'Sportswear': ['Puma']})
+
+    def ids(self, **filters):
+        return [answer.id for answer in self.engine.query(limit=None, **filters)]
+
+    def test_indexed_filters(self):
+        self.assertEqual(self.ids(metric_name='Company Report Available', metric_designer='Core', year=2023), [1, 2])
+        self.assertEqual(self.ids(identifier=826615), [4, 5])
+        self.assertEqual(self.ids(identifier='Adidas AG', year=[2022, 2023]), [1, 3, 4])
+        self.assertEqual(self.ids(company=9350, metric='Core+Company Report Available'), [2])
+
+    def test_value_and_attribute_filters(self):
+        self.assertEqual(self.ids(value_from=500), [4])
+        self.assertEqual(self.ids(status='unknown'), [3])
+        self.assertEqual(self.ids(topic='Climate Change', company_group='Sportswear'), [5])
+        self.assertEqual(self.ids(country='germany', source='Source-1'), [1])
+
+    def test_sort_and_paginate(self):
+        answers = self.engine.query(identifier=826615, sort_by='value', sort_dir='desc', offset=1, limit=1)
+        self.assertEqual([answer.id for answer in answers], [5])
+
+    def test_unsupported_filters_raise(self):
+        with self.assertRaises(Wikirate4PyException):
+            self.engine.query(verification='steward_verified')
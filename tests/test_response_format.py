@@ -0,0 +1,42 @@
+import json
+
+import wikirate4py
+from tests.config import Wikirate4PyTestCase, tape, bearer_token, wikirate_api_url
+from wikirate4py import Cursor, Wikirate4PyException
+
+
+class ResponseFormatTests(Wikirate4PyTestCase):
+
+    @tape.use_cassette('test_get_company.yaml', serializer='yaml', allow_playback_repeats=True)
+    def test_per_call_response_format(self):
+        # Keep addressing the company by name, as recorded in the cassette
+        self.api.name_cache = None
+        payload = self.api.get_company('Puma', response_format='json')
+        self.assertTrue(isinstance(payload, dict))
+        self.assertEqual(payload['name'], 'Puma')
+        body = self.api.get_company('Puma', response_format='bytes')
+        self.assertEqual(json.loads(body)['id'], payload['id'])
+
+    @tape.use_cassette('test_get_companies.yaml', serializer='yaml')
+    def test_per_client_response_format(self):
+        api = wikirate4py.API(bearer_token, wikirate_api_url=wikirate_api_url, response_format='json')
+        self.assertEqual(len(api.get_companies(limit=10)['items']), 10)
+
+    def test_cursor_pages_json_payloads(self):
+        calls = []
+
+        def get_companies(offset=0, limit=20):
+            calls.append(offset)
+            return {'items': [{'name': 'Puma'}] if offset == 0 else []}
+
+        cursor = Cursor(get_companies, per_page=20)
+        pages = []
+        while cursor.has_next():
+            pages.append(cursor.next())
+        self.assertEqual(pages, [[{'name': 'Puma'}]])
+        self.assertEqual(calls, [0, 20])
+        self.assertRaises(Wikirate4PyException, Cursor(lambda offset, limit: b'{"items": []}').has_next)
+
+    def test_invalid_response_format(self):
+        with self.assertRaises(Wikirate4PyException):
+            wikirate4py.API('token', response_format='xml')
@@ -0,0 +1,63 @@
+import threading
+import unittest
+from unittest import mock
+
+import wikirate4py
+from wikirate4py import Company, CompanyItem, Metric, NameSearchIndex, Wikirate4PyException
+
+
+def company_item(id, name):
+    return CompanyItem({'id': id, 'name': name, 'type': 'Company', 'url': f'https://wikirate.org/{id}.json'})
+
+
+class NameSearchIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.index = NameSearchIndex()
+        self.index.add(Company, [company_item(1, 'Adidas AG'), company_item(2, 'Puma'),
+                                 company_item(3, 'Marks and Spencer Group plc'), company_item(4, 'H&M')])
+
+    def test_ranks_fuzzy_and_partial_matches(self):
+        self.assertEqual([item.id for item in self.index.search(Company, 'adidas')], [1])
+        self.assertEqual([item.id for item in self.index.search(Company, 'Marks & Spenser')], [3])
+        self.assertEqual(self.index.search(Company, 'Nike'), [])
+
+    def test_search_many_keeps_query_order(self):
+        results = self.index.search_many(Company, ['puma', 'adidas', 'puma'])
+        self.assertEqual([[item.id for item in result] for result in results], [[2], [1], [2]])
+
+    def test_accented_and_non_latin_names(self):
+        self.index.add(Company, [company_item(5, 'Nestlé'), company_item(6, 'Société Générale'),
+                                 company_item(7, 'トヨタ自動車'), company_item(8, 'Газпром')])
+        self.assertEqual([item.id for item in self.index.search(Company, 'nestle')], [5])
+        self.assertEqual([item.id for item in self.index.search(Company, 'Societe Generale')], [6])
+        self.assertEqual([item.id for item in self.index.search(Company, 'トヨタ')], [7])
+        self.assertEqual([item.id for item in self.index.search(Company, 'газпром')], [8])
+        self.assertEqual(self.index.search(Company, '三菱商事'), [])
+        self.assertEqual(self.index.search(Company, '&!'), [])
+
+    def test_search_while_adding(self):
+        def add():
+            for i in range(5, 2000):
+                self.index.add(Company, [company_item(i, f'Company {i}')])
+
+        thread = threading.Thread(target=add)
+        thread.start()
+        while thread.is_alive():
+            self.assertEqual([item.id for item in self.index.search(Company, 'adidas')], [1])
+        thread.join()
+
+    def test_missing_numpy(self):
+        with mock.patch.dict('sys.modules', {'numpy': None}):
+            self.assertRaisesRegex(Wikirate4PyException, r'wikirate4py\[search\]', self.index.search, Company, 'puma')
+
+    def test_search_by_name_falls_back_to_remote(self):
+        api = wikirate4py.API('token', search_index=self.index)
+        api.get_companies = mock.Mock(return_value=['remote'])
+        self.assertEqual(api.search_by_name(Company, 'puma')[0].id, 2)
+        api.get_companies.assert_not_called()
+        self.assertEqual(api.search_by_name(Company, 'Nike'), ['remote'])
+        self.assertEqual(api.search_by_name(Company, '三菱商事'), ['remote'])
+        api.get_metrics = mock.Mock(return_value=[])
+        api.search_by_name(Metric, 'emissions')
+        api.get_metrics.assert_called_once_with(name='emissions')
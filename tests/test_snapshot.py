@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+import wikirate4py
+from wikirate4py import SnapshotReader, SnapshotWriter, AnswerItem
+
+
+class FakeResponse(object):
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class SnapshotTests(unittest.TestCase):
+
+    def setUp(self):
+        self.api = wikirate4py.API('token')
+        self.items = [{'id': i, 'name': f'Core+Company Report Available+Puma+{2000 + i}', 'type': 'Answer',
+                       'url': f'https://wikirate.org/~{i}.json', 'metric': 'Core+Company Report Available',
+                       'company': 'Puma', 'year': 2000 + i, 'value': 'Yes', 'sources': [], 'extra': i}
+                      for i in range(5)]
+        self.requests = []
+
+        def get(path, endpoint_params=(), filters=(), **kwargs):
+            self.requests.append((path, kwargs))
+            offset, limit = kwargs['offset'], kwargs['limit']
+            return FakeResponse({'items': self.items[offset:offset + limit]})
+
+        self.api.get = get
+
+    def test_write_and_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = SnapshotWriter(self.api, shard_size=2).write(
+                directory, 'get_answers', per_page=3, metric_name='Company Report Available', metric_designer='Core')
+            self.assertEqual(manifest['count'], 5)
+            self.assertEqual([shard['count'] for shard in manifest['shards']], [2, 2, 1])
+            self.assertTrue(os.path.exists(os.path.join(directory, 'part-00000.jsonl.gz')))
+            self.assertEqual(self.requests[0][0], '/Core+Company_Report_Available+Answers.json')
+
+            reader = SnapshotReader(directory)
+            self.assertEqual(len(reader), 5)
+            self.assertEqual(list(reader.raw()), self.items)
+            answers = list(reader)
+            self.assertTrue(all(isinstance(answer, AnswerItem) for answer in answers))
+            self.assertEqual([answer.year for answer in answers], [2000, 2001, 2002, 2003, 2004])
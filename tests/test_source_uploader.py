@@ -0,0 +1,91 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from wikirate4py.source_uploader import SourceUploader, SourceHashIndex
+
+
+class FakeSource(object):
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+class FakeAPI(object):
+    def __init__(self):
+        self.uploads = []
+        self.list_updates = []
+        self.lock = threading.Lock()
+
+    def add_source(self, **kwargs):
+        with self.lock:
+            self.uploads.append(kwargs)
+            return FakeSource(len(self.uploads), f"Source-{len(self.uploads)}")
+
+    def update_list_items(self, list_card, add=()):
+        with self.lock:
+            self.list_updates.append((list_card, list(add)))
+
+    def post(self, path, params):
+        with self.lock:
+            self.list_updates.append((params['card[name]'], params['add_item[]']))
+
+
+class SourceUploaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.report = self._write('report.pdf', b'same content')
+        self.copy = self._write('copy.pdf', b'same content')
+        self.other = self._write('other.pdf', b'other content')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def test_uploads_identical_content_once(self):
+        api = FakeAPI()
+        results = SourceUploader(api, workers=4).upload([
+            {'title': 'Report', 'file': self.report, 'company': 1},
+            {'title': 'Report', 'file': self.copy, 'company': 2},
+            {'title': 'Other', 'file': self.other},
+        ])
+        self.assertEqual(len(api.uploads), 2)
+        self.assertEqual(results[0].source_id, results[1].source_id)
+        self.assertFalse(results[0].reused)
+        self.assertTrue(results[1].reused)
+        self.assertNotEqual(results[0].source_id, results[2].source_id)
+        self.assertEqual(api.list_updates, [('~1+Company', [2])])
+
+    def test_reused_sources_gain_companies_and_years(self):
+        index = SourceHashIndex()
+        SourceUploader(FakeAPI(), index=index).upload([{'title': 'Report', 'file': self.report, 'company': 1}])
+        api = FakeAPI()
+        results = SourceUploader(api, index=index).upload([
+            {'title': 'Report', 'file': self.copy, 'company': 2, 'year': 2023},
+            {'title': 'Report', 'file': self.report, 'company': 3, 'year': 2023},
+        ])
+        self.assertTrue(all(result.reused and result.ok for result in results))
+        self.assertEqual(sorted(api.list_updates), [('~1+Company', [2, 3]), ('~1+Year', ['2023'])])
+
+    def test_index_persists_between_runs(self):
+        index_path = os.path.join(self.directory.name, 'index.json')
+        SourceUploader(FakeAPI(), index=index_path).upload([{'title': 'Report', 'file': self.report}])
+
+        api = FakeAPI()
+        results = SourceUploader(api, index=SourceHashIndex(index_path)).upload([{'title': 'Copy', 'file': self.copy}])
+        self.assertEqual(api.uploads, [])
+        self.assertTrue(results[0].reused)
+        self.assertEqual(results[0].source_name, 'Source-1')
+
+    def test_missing_file_is_reported_per_item(self):
+        results = SourceUploader(FakeAPI()).upload([{'title': 'Missing', 'file': 'missing.pdf'},
+                                                    {'title': 'Report', 'file': self.report}])
+        self.assertIsInstance(results[0].error, FileNotFoundError)
+        self.assertTrue(results[1].ok)
@@ -0,0 +1,66 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+from wikirate4py import SupplyChainTraversal
+
+# Brand 1 is supplied by 2 and 3, which share supplier 4; 4 is supplied by 5
+SUPPLIERS = {1: [2, 3], 2: [4], 3: [4], 4: [5], 5: []}
+
+
+class FakeAPI(object):
+
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get_relationships(self, offset=0, limit=20, subject_company_id=None, year=None, **kwargs):
+        with self.lock:
+            self.requests.append((subject_company_id, offset, year))
+        relationships = [SimpleNamespace(id=subject_company_id * 100 + target, subject_company_id=subject_company_id,
+                                         object_company_id=target, object_company_name=f'Company {target}',
+                                         year=year, value='Tier 1 Supplier')
+                         for target in SUPPLIERS[subject_company_id]]
+        return relationships[offset:offset + limit]
+
+
+class SupplyChainTraversalTests(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeAPI()
+        self.traversal = SupplyChainTraversal(self.api, year=2023, workers=4)
+
+    def test_breadth_first_edges_with_depths(self):
+        edges = self.traversal.traverse([1], max_depth=3)
+        self.assertEqual([(edge.depth, edge.source_id, edge.target_id) for edge in edges],
+                         [(1, 1, 2), (1, 1, 3), (2, 2, 4), (2, 3, 4), (3, 4, 5)])
+        self.assertEqual(edges[0].target_name, 'Company 2')
+        self.assertEqual(edges[0].year, 2023)
+        # The shared supplier 4 is listed once
+        self.assertEqual(sorted(company for company, offset, year in self.api.requests if offset == 0), [1, 2, 3, 4])
+
+    def test_neighbours_are_memoized_across_traversals(self):
+        self.traversal.traverse([1], max_depth=2)
+        requests = len(self.api.requests)
+        self.traversal.traverse([2], max_depth=1)
+        self.assertEqual(len(self.api.requests), requests)
+
+    def test_budget_stops_early(self):
+        edges = self.traversal.traverse([1], max_depth=3, budget=2)
+        self.assertTrue(self.traversal.truncated)
+        self.assertEqual([(edge.depth, edge.target_id) for edge in edges], [(1, 2), (1, 3), (2, 4)])
+
+    def test_failed_companies_are_recorded(self):
+        get_relationships = self.api.get_relationships
+
+        def failing(subject_company_id=None, **kwargs):
+            if subject_company_id == 2:
+                raise ConnectionError('unreachable')
+            return get_relationships(subject_company_id=subject_company_id, **kwargs)
+
+        self.api.get_relationships = failing
+        edges = self.traversal.traverse([1], max_depth=3)
+        self.assertEqual([(edge.depth, edge.source_id, edge.target_id) for edge in edges],
+                         [(1, 1, 2), (1, 1, 3), (2, 3, 4), (3, 4, 5)])
+        self.assertEqual([2], [company_id for company_id, error in self.traversal.errors])
+        self.assertIsInstance(self.traversal.errors[0][1], ConnectionError)
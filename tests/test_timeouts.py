@@ -0,0 +1,111 @@
+import unittest
+from unittest import mock
+
+import wikirate4py
+from wikirate4py import Cursor, DeadlineExceededException, TimeoutPolicy, Wikirate4PyException
+from wikirate4py.concurrency import map_concurrently
+from wikirate4py.mock_server import MockWikirateServer
+from wikirate4py.timeouts import DEFAULT_UPLOAD_TIMEOUT, Deadline, current_scope, request_family, timeout_scope
+
+API_URL = "https://wikirate.org/"
+
+
+class TimeoutPolicyTests(unittest.TestCase):
+
+    def test_request_family(self):
+        self.assertEqual("card", request_family(API_URL + "Puma.json"))
+        self.assertEqual("card", request_family(API_URL + "card/create"))
+        self.assertEqual("list", request_family(API_URL + "Companies.json"))
+        self.assertEqual("list", request_family(API_URL + "Core+Company_Report_Available+Answers.json"))
+        self.assertEqual("upload", request_family(API_URL + "card/create", files={"file": object()}))
+
+    def test_precedence(self):
+        policy = TimeoutPolicy(default=(5, 60), methods={"POST": 20}, families={"list": (5, 300)})
+        self.assertEqual((5, 60), policy.resolve("get", API_URL + "Puma.json"))
+        self.assertEqual((20, 20), policy.resolve("post", API_URL + "card/create"))
+        self.assertEqual((5, 300), policy.resolve("get", API_URL + "Companies.json"))
+        self.assertEqual(DEFAULT_UPLOAD_TIMEOUT, policy.resolve("post", API_URL + "card/create", files={"f": 1}))
+        self.assertEqual((1, 2), policy.resolve("get", API_URL + "Companies.json", timeout=(1, 2)))
+        with timeout_scope(timeout=3):
+            self.assertEqual((3, 3), policy.resolve("get", API_URL + "Companies.json"))
+            self.assertEqual((1, 1), policy.resolve("get", API_URL + "Companies.json", timeout=1))
+
+    def test_deadline_caps_timeouts(self):
+        policy = TimeoutPolicy()
+        with timeout_scope(deadline=10):
+            connect, read = policy.resolve("get", API_URL + "Puma.json")
+            self.assertLessEqual(read, 10)
+            self.assertEqual(read, connect)
+            with timeout_scope(deadline=1000):
+                self.assertLessEqual(policy.resolve("get", API_URL + "Puma.json")[1], 10)
+        with timeout_scope(deadline=Deadline(0.001)) as deadline:
+            while deadline.remaining() > 0:
+                pass
+            self.assertRaises(DeadlineExceededException, policy.resolve, "get", API_URL + "Puma.json")
+
+    def test_scope_follows_batch_operations(self):
+        with timeout_scope(timeout=5, deadline=10) as deadline:
+            scopes = [result.value for result in map_concurrently(lambda _: current_scope(), range(4), workers=4)]
+        self.assertEqual([((5, 5), deadline)] * 4, scopes)
+
+    def test_invalid_timeouts(self):
+        self.assertRaises(Wikirate4PyException, TimeoutPolicy, default=0)
+        self.assertRaises(Wikirate4PyException, TimeoutPolicy, default=(1, 2, 3))
+        self.assertRaises(Wikirate4PyException, TimeoutPolicy, families={"bulk": 10})
+
+
+class APITimeoutTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockWikirateServer(companies=30, metrics=1, years=1, suppliers=0).start()
+        self.api = wikirate4py.API("token", wikirate_api_url=self.server.url,
+                                   timeouts=TimeoutPolicy(default=(3, 30), families={"list": (3, 90)}))
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def sent_timeouts(self, call):
+        with mock.patch.object(self.api.session, "request", wraps=self.api.session.request) as request:
+            call()
+        return [kwargs["timeout"] for _, kwargs in request.call_args_list]
+
+    def test_policy_and_per_call_timeouts(self):
+        self.assertEqual([(3, 30)], self.sent_timeouts(lambda: self.api.get_company("Company 00001")))
+        self.assertEqual([(3, 90)], self.sent_timeouts(lambda: self.api.get_companies(limit=5)))
+        self.assertEqual([(1, 5)], self.sent_timeouts(lambda: self.api.get_company("Company 00001",
+                                                                                   timeout=(1, 5))))
+
+    def test_per_call_timeout_of_undecorated_methods(self):
+        company_id = self.api.get_company("Company 00001").id
+        self.assertEqual([(1, 5)] * 2, self.sent_timeouts(
+            lambda: self.api.update_list_items(f"~{company_id}", add=[1, 2], remove=[3], timeout=(1, 5))))
+        self.assertEqual([(2, 2)], self.sent_timeouts(lambda: self.api.get_content("Company 00001", timeout=2)))
+        self.assertEqual([(2, 2)], self.sent_timeouts(lambda: self.api.update_card(company_id, json="{}", timeout=2)))
+
+    def test_per_call_timeout_expires(self):
+        self.server.faults.latency = 0.5
+        self.assertRaises(Wikirate4PyException, self.api.get_company, "Company 00001", timeout=0.1)
+
+    def test_cursor_deadline(self):
+        self.server.faults.latency = 0.05
+        cursor = Cursor(self.api.get_companies, per_page=2, deadline=0.2)
+        pages = 0
+        with self.assertRaises(DeadlineExceededException):
+            while cursor.has_next():
+                cursor.next()
+                pages += 1
+        self.assertGreater(pages, 0)
+        self.assertLess(pages, 15)
+
+    def test_deadline_of_batch_call(self):
+        self.server.faults.latency = 0.05
+        identifiers = [f"Company {i:05d}" for i in range(1, 31)]
+        with timeout_scope(deadline=0.2):
+            results = self.api.get_companies_by_ids(identifiers, workers=2)
+        self.assertTrue(any(result.ok for result in results))
+        self.assertTrue(any(isinstance(result.error, DeadlineExceededException) for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import contextlib
+import unittest
+
+import wikirate4py
+from wikirate4py import NotFoundException
+from wikirate4py.mock_server import MockWikirateServer
+from wikirate4py.tracing import get_tracer
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    TracerProvider = None
+
+
+class RecordingSpan(object):
+
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class RecordingTracer(object):
+    """Minimal tracer with the start_as_current_span interface of OpenTelemetry tracers."""
+
+    def __init__(self):
+        self.spans = []
+        self._current = None
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = RecordingSpan(name, attributes, self._current)
+        self.spans.append(span)
+        self._current, parent = span, self._current
+        try:
+            yield span
+        finally:
+            self._current = parent
+
+
+class TracingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockWikirateServer(companies=10, metrics=2, years=1).start()
+        self.tracer = RecordingTracer()
+        self.api = wikirate4py.API("token", wikirate_api_url=self.server.url, tracer=self.tracer)
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def spans(self):
+        return {span.name: span for span in self.tracer.spans}
+
+    def test_nested_spans(self):
+        self.api.get_answers(metric_name="Metric 001", metric_designer="Mock Designer", year=2024, limit=5)
+        spans = self.spans()
+        self.assertEqual(["wikirate4py.get_answers", "wikirate4py.request", "wikirate4py.decode",
+                          "wikirate4py.build"], [span.name for span in self.tracer.spans])
+        call = spans["wikirate4py.get_answers"]
+        for name in ("wikirate4py.request", "wikirate4py.decode", "wikirate4py.build"):
+            self.assertIs(call, spans[name].parent)
+        request = spans["wikirate4py.request"].attributes
+        self.assertEqual("/{card}+Answers.json", request["url.template"])
+        self.assertEqual(200, request["http.response.status_code"])
+        self.assertEqual("2024", request["wikirate.param.filter[year]"])
+        self.assertEqual("5", request["wikirate.param.limit"])
+        self.assertEqual(5, spans["wikirate4py.build"].attributes["wikirate.items"])
+        self.assertEqual("AnswerItem", spans["wikirate4py.build"].attributes["wikirate.model"])
+
+    def test_write_values_are_not_recorded(self):
+        self.api.add_company(name="Traced Company", headquarters="Germany")
+        request = self.spans()["wikirate4py.request"].attributes
+        self.assertIn("card[name]", request["wikirate.param_names"])
+        self.assertNotIn("Traced Company", str(request))
+
+    def test_error_status(self):
+        with self.assertRaises(NotFoundException):
+            self.api.get_company("Missing Company")
+        self.assertEqual(404, self.spans()["wikirate4py.request"].attributes["http.response.status_code"])
+        self.assertNotIn("wikirate4py.decode", self.spans())
+
+    def test_json_responses_skip_build(self):
+        self.api.get_company("Company 00001", response_format="json")
+        self.assertNotIn("wikirate4py.build", self.spans())
+
+    @unittest.skipIf(TracerProvider is None, "opentelemetry-sdk is not installed")
+    def test_opentelemetry(self):
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        self.api.tracer = get_tracer(provider)
+        tracer = provider.get_tracer("test")
+        with tracer.start_as_current_span("batch") as batch:
+            self.api.get_companies_by_ids(["Company 00001", "Company 00002"], workers=2)
+        spans = exporter.get_finished_spans()
+        calls = [span for span in spans if span.name == "wikirate4py.get_company"]
+        self.assertEqual(2, len(calls))
+        # Calls made by batch workers nest under the caller's span
+        self.assertTrue(all(span.parent.span_id == batch.get_span_context().span_id for span in calls))
+        self.assertEqual(2, len([span for span in spans if span.name == "wikirate4py.request"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,14 +10,30 @@ __author__ = 'Vasiliki Gkatziaki'
 __license__ = 'GPL-3.0'
 
 from wikirate4py.api import API
+from wikirate4py.circuit_breaker import CircuitBreaker
+from wikirate4py.company_index import CompanyIdentifierIndex
+from wikirate4py.concurrency import AdaptiveConcurrencyLimiter, BatchResult, RateLimiter
+from wikirate4py.crawler import Crawler, MemorySink, JsonlSink
 from wikirate4py.cursor import Cursor
 from wikirate4py.exceptions import (IllegalHttpMethod, Wikirate4PyException, HTTPException, BadRequestException,
                                     UnauthorizedException, ForbiddenException, NotFoundException,
                                     TooManyRequestsException,
-                                    WikirateServerErrorException)
+                                    WikirateServerErrorException, CircuitOpenException,
+                                    DeadlineExceededException)
+from wikirate4py.instrumentation import HistogramCollector, PrometheusCollector, RequestRecord
+from wikirate4py.key_pool import ApiKeyPool
+from wikirate4py.lanes import Lane, PriorityLanes
+from wikirate4py.mirror import Mirror
 from wikirate4py.mixins import WikirateEntity
 from wikirate4py.models import (BaseEntity, Company, CompanyItem, Topic, TopicItem, Metric, MetricItem, ResearchGroup,
                                 ResearchGroupItem, Project, ProjectItem, CompanyGroup, CompanyGroupItem, Source,
                                 SourceItem, Answer, AnswerItem, Relationship, RelationshipItem, Region,
                                 Dataset, DatasetItem)
+from wikirate4py.name_cache import NameResolutionCache
+from wikirate4py.query import AnswerQueryEngine
+from wikirate4py.search_index import NameSearchIndex
+from wikirate4py.snapshot import SnapshotReader, SnapshotWriter
+from wikirate4py.source_uploader import SourceUploader, SourceHashIndex
+from wikirate4py.supply_chain import SupplyChainTraversal, SupplyChainEdge
+from wikirate4py.timeouts import TimeoutPolicy
 from wikirate4py.utils import to_dataframe
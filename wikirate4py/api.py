@@ -1,29 +1,62 @@
 import functools
+import inspect
 import logging
 import os
 import sys
 import re
+import time
 from typing import List, Dict, Any, Iterable
 
 import requests
+from requests.adapters import HTTPAdapter
 from os import environ
 from urllib.parse import urljoin
 
+from wikirate4py.circuit_breaker import CircuitBreaker
 from wikirate4py.exceptions import IllegalHttpMethod, BadRequestException, UnauthorizedException, \
     ForbiddenException, NotFoundException, TooManyRequestsException, WikirateServerErrorException, HTTPException, \
-    Wikirate4PyException
+    Wikirate4PyException, DeadlineExceededException
 from wikirate4py.models import (Company, Topic, Metric, ResearchGroup, CompanyGroup, Source, CompanyItem, MetricItem,
                                 Answer, ResearchGroupItem, Relationship, SourceItem, TopicItem, AnswerItem,
                                 CompanyGroupItem, RelationshipItem, Region, Project, ProjectItem, RegionItem,
                                 Dataset, DatasetItem)
+from wikirate4py.multipart import MultipartEncoder
+from wikirate4py.concurrency import map_concurrently, lane_scope, DEFAULT_WORKERS
+from wikirate4py.key_pool import ApiKeyPool
+from wikirate4py.lanes import PriorityLanes
+from wikirate4py.instrumentation import RequestRecord, begin_call, end_call, current_call, emit
+from wikirate4py.name_cache import NameResolutionCache
+from wikirate4py.prefetch import prefetch_related
+from wikirate4py.source_uploader import SourceUploader
+from wikirate4py.timeouts import (TimeoutPolicy, current_scope, expired_deadline, timeout_scope,
+                                  DEFAULT_READ_TIMEOUT_SECONDS)
+# Re-exported: the upload timeouts were defined in this module before moving to wikirate4py.timeouts
+from wikirate4py.timeouts import UPLOAD_CONNECT_TIMEOUT_SECONDS, UPLOAD_READ_TIMEOUT_SECONDS, DEFAULT_UPLOAD_TIMEOUT
+from wikirate4py.tracing import request_attributes
+
+__all__ = ["API", "objectify", "scoped", "check_response_format", "generate_url_key", "build_card_identifier",
+           "construct_endpoint", "list_item_name", "compute_list_delta", "WIKIRATE_API_URL", "DEFAULT_TIMEOUT_SECONDS",
+           "UPLOAD_CONNECT_TIMEOUT_SECONDS", "UPLOAD_READ_TIMEOUT_SECONDS", "DEFAULT_UPLOAD_TIMEOUT", "LIST_CHUNK_SIZE",
+           "DEFAULT_POOL_SIZE", "RESPONSE_FORMATS"]
 
 log = logging.getLogger(__name__)
 
 WIKIRATE_API_URL = environ.get('WIKIRATE_API_URL', 'https://wikirate.org/')
 
-DEFAULT_TIMEOUT_SECONDS = 480
+# Read timeout of requests without a more specific one in the TimeoutPolicy of the client
+DEFAULT_TIMEOUT_SECONDS = DEFAULT_READ_TIMEOUT_SECONDS
 
+# Maximum number of items added to or removed from a list card in one request
+LIST_CHUNK_SIZE = 500
 
+# Connections kept open per host, so concurrent batch requests reuse them instead of reconnecting
+DEFAULT_POOL_SIZE = 32
+
+# What the get_*, add_* and update_* methods return: models, the decoded JSON payload or the raw response body
+RESPONSE_FORMATS = ("model", "json", "bytes")
+
+
+@functools.lru_cache(maxsize=4096)
 def generate_url_key(input_string):
     # Replace spaces, commas, single quotes, dots, and special characters with underscores, and convert to lowercase
     url_key = re.sub(r'[^a-zA-Z0-9_+~]+', lambda x: ' ' if x.group(0) != '+' else '+', input_string)
@@ -46,17 +79,155 @@ def construct_endpoint(entity_id, entity_type):
     return endpoint
 
 
+def list_item_name(item):
+    """Returns the name used for an item of a list card: ``~<id>`` for numeric identifiers, the card name otherwise."""
+    return f"~{item}" if isinstance(item, int) or str(item).isdigit() else str(item)
+
+
+def _list_item_key(item):
+    name = list_item_name(item)
+    return name if name.startswith("~") else generate_url_key(name).strip("_").lower()
+
+
+def compute_list_delta(current, desired):
+    """
+    Computes the minimal changes turning the items of a list card into the desired ones.
+
+    Items are compared by card key, so names differing only in case or punctuation match. Numeric identifiers only
+    match numeric identifiers: compare names with names (e.g. :py:attr:`CompanyGroup.members`) or ids with ids.
+
+    Parameters
+    ----------
+    current : Iterable or CompanyGroup
+        The current items, or a company group whose members are compared.
+    desired : Iterable
+        The items the list should contain.
+
+    Returns
+    -------
+    Tuple[List, List]
+        The items to add and the items to remove, in their original order.
+    """
+    if isinstance(current, CompanyGroup):
+        current = current.members
+    current_keys = {_list_item_key(item): item for item in current}
+    desired_keys = {_list_item_key(item): item for item in desired}
+    to_add = [item for key, item in desired_keys.items() if key not in current_keys]
+    to_remove = [item for key, item in current_keys.items() if key not in desired_keys]
+    return to_add, to_remove
+
+
+def _chunked(items, size):
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def check_response_format(response_format):
+    if response_format not in RESPONSE_FORMATS:
+        raise Wikirate4PyException(f"Invalid response format: {response_format}. "
+                                   f"Expected one of: {', '.join(RESPONSE_FORMATS)}.")
+    return response_format
+
+
+def _construct(wikirate_obj, many, payload):
+    if not many:
+        return wikirate_obj(payload)
+    return [wikirate_obj(item) for item in payload.get("items")]
+
+
+def _build_result(wikirate_obj, many, api, response, response_format, prefetch, record, tracer=None):
+    if response_format == "bytes":
+        return response.content
+    started = time.perf_counter()
+    if tracer is None:
+        payload = response.json()
+    else:
+        with tracer.start_as_current_span("wikirate4py.decode",
+                                          attributes={"http.response.body.size": len(response.content)}):
+            payload = response.json()
+    decoded = time.perf_counter()
+    name_cache = getattr(api, "name_cache", None)
+    if name_cache is not None:
+        name_cache.learn(payload)
+    items = len(payload.get("items") or []) if many and isinstance(payload, dict) else 1
+    if response_format == "json":
+        result = payload
+    elif tracer is None:
+        result = _construct(wikirate_obj, many, payload)
+    else:
+        with tracer.start_as_current_span("wikirate4py.build", attributes={"wikirate.model": wikirate_obj.__name__,
+                                                                           "wikirate.items": items}):
+            result = _construct(wikirate_obj, many, payload)
+    if record is not None:
+        record.decode = decoded - started
+        if response_format == "model":
+            record.build = time.perf_counter() - decoded
+        record.items = items
+    if prefetch:
+        api.prefetch(result if many else [result], prefetch)
+    return result
+
+
+def _call(method, wikirate_obj, many, args, kwargs, response_format, prefetch, tracer):
+    # With hooks registered, the request record is left pending so decoding and model construction are timed
+    hooks = getattr(args[0], "hooks", None)
+    outer = begin_call(method.__name__) if hooks else None
+    try:
+        response = method(*args, **kwargs)
+    finally:
+        record = end_call(outer) if hooks else None
+    try:
+        return _build_result(wikirate_obj, many, args[0], response, response_format, prefetch, record, tracer)
+    except Exception as e:
+        if record is not None:
+            record.error = e
+        raise
+    finally:
+        if record is not None:
+            emit(hooks, record)
+
+
+def _traced_call(method, wikirate_obj, many, args, kwargs, response_format, prefetch):
+    tracer = getattr(args[0], "tracer", None)
+    if tracer is None:
+        return _call(method, wikirate_obj, many, args, kwargs, response_format, prefetch, None)
+    with tracer.start_as_current_span(f"wikirate4py.{method.__name__}",
+                                      attributes={"wikirate.call": method.__name__,
+                                                  "wikirate.response_format": response_format}):
+        return _call(method, wikirate_obj, many, args, kwargs, response_format, prefetch, tracer)
+
+
+def scoped(method):
+    """
+    Lets a method take a ``lane`` and, without a timeout parameter of its own, a ``timeout``, applying to all of its
+    requests.
+    """
+    scopes_timeout = "timeout" not in inspect.signature(method).parameters
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        timeout = kwargs.pop("timeout", None) if scopes_timeout else None
+        lane = kwargs.pop("lane", None)
+        if timeout is None and lane is None:
+            return method(*args, **kwargs)
+        with timeout_scope(timeout=timeout), lane_scope(lane):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
 def objectify(wikirate_obj, many=False):
     def decorator(method):
         @functools.wraps(method)
         def wrapper(*args, **kwargs):
-            payload = method(*args, **kwargs).json()
-            if not many:
-                return wikirate_obj(payload)
-            else:
-                return [wikirate_obj(item) for item in payload.get("items")]
+            response_format = kwargs.pop("response_format", None) or getattr(args[0], "response_format", "model")
+            check_response_format(response_format)
+            prefetch = kwargs.pop("prefetch", None)
+            if prefetch and response_format != "model":
+                raise Wikirate4PyException("Related cards can only be prefetched for model responses.")
+            return _traced_call(method, wikirate_obj, many, args, kwargs, response_format, prefetch)
 
-        return wrapper
+        return scoped(wrapper)
 
     return decorator
 
@@ -77,11 +248,51 @@ Entities include:
 class API(object):
     allowed_methods = ['post', 'get', 'delete']
 
-    def __init__(self, oauth_token, wikirate_api_url=WIKIRATE_API_URL, auth=()):
+    def __init__(self, oauth_token, wikirate_api_url=WIKIRATE_API_URL, auth=(), search_index=None, name_cache=True,
+                 response_format="model", pool_size=DEFAULT_POOL_SIZE, hooks=None, tracer=None,
+                 circuit_breaker=None, timeouts=None, lanes=None):
         self.wikirate_api_url = wikirate_api_url
+        # Default return type of the decorated methods, overridable per call with the response_format keyword
+        self.response_format = check_response_format(response_format)
         self.session = requests.Session()
-        self.session.headers["X-API-Key"] = oauth_token
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # With several keys, each request is sent with a key picked from the pool instead of a session header
+        if oauth_token is None or isinstance(oauth_token, str):
+            self.key_pool = None
+            self.session.headers["X-API-Key"] = oauth_token
+        else:
+            self.key_pool = oauth_token if isinstance(oauth_token, ApiKeyPool) else ApiKeyPool(oauth_token)
         self.session.auth = auth
+        # Optional NameSearchIndex answering search_by_name locally
+        self.search_index = search_index
+        # Name to id mappings learned from responses, so known cards are addressed by id
+        if name_cache is True:
+            name_cache = NameResolutionCache()
+        elif name_cache is False:
+            name_cache = None
+        self.name_cache = name_cache
+        # Callables receiving a RequestRecord after every request
+        self.hooks = list(hooks or [])
+        # OpenTelemetry tracer creating spans around calls, requests, decoding and model construction
+        self.tracer = tracer
+        # Optional CircuitBreaker failing requests fast while the server keeps erroring or timing out
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+        elif circuit_breaker is False:
+            circuit_breaker = None
+        self.circuit_breaker = circuit_breaker
+        # Connect and read timeouts per call, endpoint family, HTTP method or by default
+        if not isinstance(timeouts, TimeoutPolicy):
+            timeouts = TimeoutPolicy() if timeouts is None else TimeoutPolicy(default=timeouts)
+        self.timeouts = timeouts
+        # Optional PriorityLanes keeping interactive requests from queueing behind batch traffic
+        if lanes is True:
+            lanes = PriorityLanes(max_in_flight=pool_size)
+        elif lanes is False:
+            lanes = None
+        self.lanes = lanes
 
     def __enter__(self):
         return self
@@ -112,21 +323,92 @@ class API(object):
     def close(self):
         self.session.close()
 
-    def request(self, method, path, params, files=None):
+    def add_hook(self, hook):
+        """
+        Registers a callable receiving a :class:`~wikirate4py.instrumentation.RequestRecord` after every request.
+
+        Records of the ``get_*``, ``add_*`` and ``update_*`` methods are passed once their response is decoded and
+        turned into models, so they include those timings. Exceptions raised by hooks are logged and ignored.
+
+        Parameters
+        ----------
+        hook : callable
+            E.g. a :class:`~wikirate4py.HistogramCollector` or a :class:`~wikirate4py.PrometheusCollector`.
+
+        Returns
+        -------
+        callable
+            The hook.
+        """
+        self.hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        """Unregisters a hook added with :meth:`add_hook`."""
+        self.hooks.remove(hook)
+
+    @property
+    def circuit_state(self):
+        """State of the circuit breaker: ``closed``, ``open`` or ``half_open``, or None without a breaker."""
+        return self.circuit_breaker.state if self.circuit_breaker is not None else None
+
+    def request(self, method, path, params, files=None, timeout=None, progress_callback=None):
         method = self._normalize_method(method)
+        if self.tracer is None:
+            return self._send_request(method, path, params, files, timeout, progress_callback)
+        with self.tracer.start_as_current_span("wikirate4py.request",
+                                               attributes=request_attributes(method, path, params)) as span:
+            try:
+                response = self._send_request(method, path, params, files, timeout, progress_callback)
+            except HTTPException as e:
+                span.set_attribute("http.response.status_code", e.response.status_code)
+                raise
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    def _send_request(self, method, path, params, files=None, timeout=None, progress_callback=None):
 
         files_payload = files or {}
+        data = params
+        headers = None
+        record = RequestRecord(method, path, call=(current_call() or [None])[0]) if self.hooks else None
+        started = time.perf_counter()
+        breaker = self.circuit_breaker
+        key_pool = self.key_pool
+        try:
+            timeout, lane, key = self._admit(method, path, files_payload, timeout)
+        except Wikirate4PyException as e:
+            self._finish_record(record, started, error=e)
+            raise
 
         try:
-            # Extended timeout for large uploads or long-running operations
+            if key is not None:
+                headers = {"X-API-Key": key}
+            if files_payload:
+                # Stream multipart uploads so memory stays constant regardless of the file size
+                data = MultipartEncoder(fields=params, files=files_payload, callback=progress_callback)
+                headers = dict(headers or {}, **{"Content-Type": data.content_type})
             response = self.session.request(method,
                                             path,
-                                            data=params,
-                                            timeout=DEFAULT_TIMEOUT_SECONDS,
-                                            files=files_payload)
+                                            data=data,
+                                            headers=headers,
+                                            timeout=timeout)
         except Exception as e:
-            raise Wikirate4PyException(f'Failed to send request: {e}').with_traceback(sys.exc_info()[2])
+            if key is not None:
+                key_pool.release(key)
+            # A timeout capped by an operation deadline is the caller running out of time, not the server failing
+            expired = expired_deadline() if isinstance(e, requests.Timeout) else None
+            if breaker is not None:
+                breaker.record(failed=expired is None and isinstance(e, (requests.Timeout, requests.ConnectionError)))
+            if expired is not None:
+                error = DeadlineExceededException(expired.seconds)
+            else:
+                error = Wikirate4PyException(f'Failed to send request: {e}')
+            self._finish_record(record, started, error=error)
+            raise error.with_traceback(sys.exc_info()[2])
         finally:
+            if lane is not None:
+                self.lanes.release(lane)
             # Close any file handles passed for multipart upload to avoid leaking file descriptors.
             for f in files_payload.values():
                 close = getattr(f, "close", None)
@@ -136,9 +418,72 @@ class API(object):
                     except Exception:
                         # Best-effort cleanup; ignore close errors.
                         pass
-        self._raise_for_status(response=response)
+        if breaker is not None:
+            breaker.record(failed=response.status_code >= 500)
+        if key is not None:
+            key_pool.release(key, response.status_code, response.headers.get("Retry-After"))
+        try:
+            self._raise_for_status(response=response)
+        except HTTPException as e:
+            self._finish_record(record, started, response, error=e)
+            raise
+        self._finish_record(record, started, response)
         return response
 
+    def _admit(self, method, path, files, timeout):
+        """
+        Resolves the timeout of a request, then waits for the circuit breaker, an API key and a slot of its lane.
+
+        The key comes first, so requests waiting for a throttled key do not hold lane slots other lanes could use.
+
+        Returns
+        -------
+        tuple
+            The ``(connect, read)`` timeout, the lane and the key, None without lanes or key pool.
+        """
+        timeout = self.timeouts.resolve(method, path, files, timeout)
+        deadline = current_scope()[1]
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_request()
+        lane = key = None
+        try:
+            if self.key_pool is not None:
+                key = self.key_pool.acquire(deadline=deadline)
+            if self.lanes is not None:
+                lane = self.lanes.acquire(path, files, deadline=deadline)
+        except Exception:
+            # The request allowed by the breaker is not sent after all
+            if key is not None:
+                self.key_pool.cancel(key)
+            if breaker is not None:
+                breaker.cancel()
+            raise
+        return timeout, lane, key
+
+    def _finish_record(self, record, started, response=None, error=None):
+        if record is None:
+            return
+        elapsed = time.perf_counter() - started
+        record.error = error
+        if response is None:
+            record.send = elapsed
+        else:
+            record.status = response.status_code
+            # response.elapsed stops once the headers are parsed; the rest is spent reading the body
+            record.send = min(response.elapsed.total_seconds(), elapsed)
+            record.download = elapsed - record.send
+            record.request_bytes = int(response.request.headers.get("Content-Length") or 0)
+            record.response_bytes = len(response.content)
+        call = current_call()
+        if call is None or error is not None:
+            emit(self.hooks, record)
+            return
+        # Left for objectify to complete with the decoding and model construction timings
+        if call[1] is not None:
+            emit(self.hooks, call[1])
+        call[1] = record
+
     def get(self, path, endpoint_params=(), filters=(), **kwargs):
         params = self._build_query_params(endpoint_params=endpoint_params, filters=filters, **kwargs)
 
@@ -147,14 +492,31 @@ class API(object):
         path = self.format_path(path, self.wikirate_api_url)
         return self.request('get', path, params=params or {})
 
-    def post(self, path, params=None, files=None):
+    def post(self, path, params=None, files=None, timeout=None, progress_callback=None):
         path = self.format_path(path, self.wikirate_api_url)
-        return self.request('post', path, params=params or {}, files=files)
+        return self.request('post', path, params=params or {}, files=files, timeout=timeout,
+                            progress_callback=progress_callback)
 
     def delete(self, path, params=None):
         path = self.format_path(path, self.wikirate_api_url)
         return self.request('delete', path, params=params or {})
 
+    def card_identifier(self, card):
+        """
+        Returns the identifier used in card paths and names: ``~<id>`` for numeric identifiers and for names whose id
+        was learned from a previous response, the url key of the name otherwise.
+        """
+        if self.name_cache is not None and not (isinstance(card, int) or str(card).isdigit()):
+            card_id = self.name_cache.resolve(card)
+            if card_id is not None:
+                return f"~{card_id}"
+        return build_card_identifier(card)
+
+    def _list_endpoint(self, identifier, entity_type):
+        if identifier is None:
+            return construct_endpoint(entity_id=None, entity_type=entity_type)
+        return f"{self.card_identifier(identifier)}+{entity_type}.json"
+
     def format_path(self, path, wikirate_api_url=WIKIRATE_API_URL):
         # Probably a webhook path
         if path.startswith(wikirate_api_url):
@@ -340,7 +702,7 @@ class API(object):
         print(company.name)
         ```
         """
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(CompanyItem, many=True)
     def get_companies(self, identifier=None, **kwargs) -> List[CompanyItem]:
@@ -360,7 +722,7 @@ class API(object):
             :py:class:`List`\\[:class:`~wikirate4py.models.CompanyItem`]
 
         """
-        endpoint = construct_endpoint(entity_id=identifier, entity_type="Companies")
+        endpoint = self._list_endpoint(identifier, "Companies")
 
         return self.get(f"/{endpoint}", endpoint_params=('limit', 'offset'),
                         filters=('name', 'company_category', 'company_group', 'country', 'company_identifier'),
@@ -381,7 +743,7 @@ class API(object):
         -------
             :py:class:`~wikirate4py.models.Topic`
         """
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(TopicItem, many=True)
     def get_topics(self, identifier=None, **kwargs) -> List[TopicItem]:
@@ -403,7 +765,7 @@ class API(object):
         :py:class:`List`\\[:class:`~wikirate4py.models.TopicItem`]
 
         """
-        endpoint = construct_endpoint(entity_id=identifier, entity_type="Topics")
+        endpoint = self._list_endpoint(identifier, "Topics")
         return self.get(f"/{endpoint}", endpoint_params=('limit', 'offset'), filters=('name', 'bookmark'), **kwargs)
 
     @objectify(Metric)
@@ -443,9 +805,7 @@ class API(object):
                     "You must provide either `identifier` or both `metric_name` and `metric_designer`."
                 )
 
-        card_name = build_card_identifier(identifier) if identifier is not None else '+'.join([
-            build_card_identifier(metric_designer),
-            build_card_identifier(metric_name)])
+        card_name = self.card_identifier(identifier if identifier is not None else f"{metric_designer}+{metric_name}")
 
         return self.get(f"/{card_name}.json")
 
@@ -504,7 +864,7 @@ class API(object):
             print(metric.name)
         ```
         """
-        endpoint = construct_endpoint(entity_id=identifier, entity_type="Metrics")
+        endpoint = self._list_endpoint(identifier, "Metrics")
         return self.get(f"/{endpoint}", endpoint_params=('limit', 'offset'), filters=(
             'bookmark', 'topic', 'topic_framework', 'designer', 'published', 'metric_type', 'value_type',
             'metric_keyword', 'research_policy', 'dataset'), **kwargs)
@@ -541,7 +901,7 @@ class API(object):
         print(group.name)
         ```
         """
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(ResearchGroupItem, many=True)
     def get_research_groups(self, **kwargs) -> List[ResearchGroupItem]:
@@ -612,7 +972,7 @@ class API(object):
         print(group_by_id.name)
         ```
         """
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(CompanyGroupItem, many=True)
     def get_company_groups(self, **kwargs) -> List[CompanyGroupItem]:
@@ -683,7 +1043,7 @@ class API(object):
         print(source_by_id.title)
         ```
         """
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(SourceItem, many=True)
     def get_sources(self, **kwargs) -> List[SourceItem]:
@@ -763,7 +1123,7 @@ class API(object):
         print(answer.value)
         ```
         """
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(AnswerItem, many=True)
     def get_answers(self, metric_name=None, metric_designer=None, identifier=None, **kwargs) -> List[AnswerItem]:
@@ -841,6 +1201,9 @@ class API(object):
             Sort answers by the specified field.
         sort_dir : str, optional
             Direction of sorting (`asc` for ascending, `desc` for descending).
+        prefetch : Iterable[str], optional
+            Related cards (`company`, `metric`, `sources`) fetched once each and attached to the answers, see
+            :meth:`prefetch`.
 
         Returns
         -------
@@ -861,9 +1224,9 @@ class API(object):
         ```
         """
         if metric_name is not None and metric_designer is not None:
-            endpoint = construct_endpoint(entity_id=f"{metric_designer}+{metric_name}", entity_type="Answers")
+            endpoint = self._list_endpoint(f"{metric_designer}+{metric_name}", "Answers")
         else:
-            endpoint = construct_endpoint(entity_id=identifier, entity_type="Answers")
+            endpoint = self._list_endpoint(identifier, "Answers")
 
         return self.get(f"/{endpoint}", endpoint_params=('limit', 'offset', 'view'),
                         filters=('year', 'status', 'company_group', 'country', 'value', 'value_from', 'value_to',
@@ -905,7 +1268,7 @@ class API(object):
         print(relationship.value)
         ```
         """
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(RelationshipItem, many=True)
     def get_relationships(self, metric_name=None, metric_designer=None, identifier=None, **kwargs) -> List[
@@ -973,6 +1336,9 @@ class API(object):
             Filter relationships by the object company ID.
         subject_company_id : int, optional
             Filter relationships by the subject company ID.
+        prefetch : Iterable[str], optional
+            Related cards (`subject_company`, `object_company`, `metric`, `sources`) fetched once each and attached
+            to the relationships, see :meth:`prefetch`.
 
         Returns
         -------
@@ -994,9 +1360,9 @@ class API(object):
         """
 
         if metric_name is not None and metric_designer is not None:
-            endpoint = construct_endpoint(entity_id=f"{metric_designer}+{metric_name}", entity_type="Relationships")
+            endpoint = self._list_endpoint(f"{metric_designer}+{metric_name}", "Relationships")
         else:
-            endpoint = construct_endpoint(entity_id=identifier, entity_type="Relationships")
+            endpoint = self._list_endpoint(identifier, "Relationships")
 
         return self.get(f"/{endpoint}",
                         endpoint_params=('limit', 'offset'),
@@ -1022,7 +1388,7 @@ class API(object):
 
         """
 
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(ProjectItem, many=True)
     def get_projects(self, **kwargs):
@@ -1060,7 +1426,7 @@ class API(object):
 
         """
 
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     @objectify(DatasetItem, many=True)
     def get_datasets(self, **kwargs):
@@ -1123,7 +1489,7 @@ class API(object):
             :py:class:`~wikirate4py.models.Project`
 
         """
-        return self.get(f"/{build_card_identifier(identifier)}.json")
+        return self.get(f"/{self.card_identifier(identifier)}.json")
 
     def search_by_name(self, entity_type, name, **kwargs):
         """
@@ -1149,6 +1515,10 @@ class API(object):
         limit
             default value 20, the maximum number of entries to return. If the value exceeds the maximum, then the maximum value will be used.
 
+        When a :py:class:`~wikirate4py.search_index.NameSearchIndex` covering the entity type is attached to the
+        client (``api.search_index``) and no other filter is given, the search runs locally, ranked by name
+        similarity. Queries without a local match are sent to Wikirate.
+
         Returns
         -------
 
@@ -1171,6 +1541,14 @@ class API(object):
 
         search_endpoint = search_functions.get(entity_type)
 
+        if self.search_index is not None and self.search_index.covers(entity_type) \
+                and set(kwargs) <= {'offset', 'limit'} and self.response_format == "model":
+            results = self.search_index.search(entity_type, name, offset=kwargs.get('offset', 0),
+                                               limit=kwargs.get('limit', 20))
+            if results:
+                return results
+            log.debug("No local match for %r, searching Wikirate", name)
+
         if search_endpoint is not None:
             return search_endpoint(name=name, **kwargs)
         raise Wikirate4PyException(f"Type of parameter 'entity_type' ({type(entity_type)}) is not allowed")
@@ -1307,7 +1685,7 @@ class API(object):
             log.warning(f"Unexpected parameters: {unexpected_params}")
 
         log.debug("Company update parameters: %r", params)
-        return self.post(f"/update/{build_card_identifier(identifier)}", params=params)
+        return self.post(f"/update/{self.card_identifier(identifier)}", params=params)
 
     @objectify(Answer)
     def add_answer(self, **kwargs) -> Answer:
@@ -1351,7 +1729,9 @@ class API(object):
         # Prepare main params
         params = {
             "card[type]": "Answer",
-            "card[name]": f"{build_card_identifier(kwargs['metric_designer'])}+{build_card_identifier(kwargs['metric_name'])}+{build_card_identifier(kwargs['company'])}+{kwargs['year']}",
+            "card[name]": f"{self.card_identifier(kwargs['metric_designer'])}"
+                          f"+{self.card_identifier(kwargs['metric_name'])}"
+                          f"+{self.card_identifier(kwargs['company'])}+{kwargs['year']}",
             "card[subcards][+:value]": kwargs['value'] if not isinstance(kwargs['value'], list) else '\n'.join(
                 kwargs['value']),
             "card[subcards][+:source]": kwargs['source'] if not isinstance(kwargs['source'], list) else '\n'.join(
@@ -1411,8 +1791,9 @@ class API(object):
         self._warn_unexpected(kwargs, required_params + optional_params)
 
         card_name = f"~{kwargs['identifier']}" if 'identifier' in kwargs \
-            else (f"{build_card_identifier(kwargs['metric_designer'])}+{build_card_identifier(kwargs['metric_name'])}"
-                  f"+{build_card_identifier(kwargs['company'])}+{kwargs['year']}")
+            else (f"{self.card_identifier(kwargs['metric_designer'])}"
+                  f"+{self.card_identifier(kwargs['metric_name'])}"
+                  f"+{self.card_identifier(kwargs['company'])}+{kwargs['year']}")
 
         # Prepare main params for the update request
         params = {
@@ -1431,6 +1812,7 @@ class API(object):
         log.debug("Answer update parameters: %r", params)
         return self.post("/card/update", params=params)
 
+    @scoped
     def update_card(self, identifier, **kwargs):
         self._require(kwargs, required=("json",), message_prefix="Missing required param")
 
@@ -1500,11 +1882,11 @@ class API(object):
         self._warn_unexpected(kwargs, allowed=required_params + ('comment',))
 
         card_name = '+'.join([
-            build_card_identifier(kwargs['metric_designer']),
-            build_card_identifier(kwargs['metric_name']),
-            build_card_identifier(kwargs['subject_company']),
+            self.card_identifier(kwargs['metric_designer']),
+            self.card_identifier(kwargs['metric_name']),
+            self.card_identifier(kwargs['subject_company']),
             str(kwargs['year']),
-            build_card_identifier(kwargs['object_company'])
+            self.card_identifier(kwargs['object_company'])
         ])
         params = {
             "card[type]": "Relationship",
@@ -1661,9 +2043,7 @@ class API(object):
                     "You must provide either `identifier` or both `metric_name` and `metric_designer`."
                 )
         
-        card_name = build_card_identifier(identifier) if identifier is not None else '+'.join([
-            build_card_identifier(metric_designer),
-            build_card_identifier(metric_name)])
+        card_name = self.card_identifier(identifier if identifier is not None else f"{metric_designer}+{metric_name}")
 
         optional_params = (
             'metric_type', 'value_type', 'question', 'about', 'methodology', 'unit', 'topic', 'topic_framework',
@@ -1745,11 +2125,11 @@ class API(object):
 
         # Construct the card name
         card_name = f"~{kwargs['identifier']}" if 'identifier' in kwargs else '+'.join([
-            build_card_identifier(kwargs['metric_designer']),
-            build_card_identifier(kwargs['metric_name']),
-            build_card_identifier(kwargs['subject_company']),
+            self.card_identifier(kwargs['metric_designer']),
+            self.card_identifier(kwargs['metric_name']),
+            self.card_identifier(kwargs['subject_company']),
             str(kwargs['year']),
-            build_card_identifier(kwargs['object_company'])
+            self.card_identifier(kwargs['object_company'])
         ])
 
         # Prepare main parameters for the update request
@@ -1770,7 +2150,7 @@ class API(object):
         return self.post("/card/update", params=params)
 
     @objectify(Source)
-    def add_source(self, **kwargs) -> Source:
+    def add_source(self, progress_callback=None, timeout=None, **kwargs) -> Source:
         """
         Adds and returns a new source.
 
@@ -1788,6 +2168,12 @@ class API(object):
             Type of the report (e.g., "Sustainability Report").
         year : int, optional
             Reporting year.
+        progress_callback : callable, optional
+            Called with a :class:`~wikirate4py.multipart.UploadProgress` while the file is streamed to Wikirate.
+        timeout : float or tuple, optional
+            Timeout of the upload, either a single value or a ``(connect, read)`` tuple.
+            Defaults to the ``upload`` timeout of the client's :class:`~wikirate4py.timeouts.TimeoutPolicy` when a
+            file is given.
 
         Returns
         -------
@@ -1846,10 +2232,11 @@ class API(object):
                     params[param_key] = f"~{v}" if k == 'company' and isinstance(v, int) else str(v)
 
         log.debug("Source creation parameters: %r", params)
-        return self.post("/card/create", params=params, files=files)
+        return self.post("/card/create", params=params, files=files, timeout=timeout,
+                         progress_callback=progress_callback)
 
     @objectify(Source)
-    def upload_source_file(self, source: str, file: str) -> Source:
+    def upload_source_file(self, source: str, file: str, progress_callback=None, timeout=None) -> Source:
         """
         Uploads a file to an existing source.
 
@@ -1859,6 +2246,11 @@ class API(object):
             The unique identifier or name of the source to update.
         file : str
             The file path of the file to upload.
+        progress_callback : callable, optional
+            Called with a :class:`~wikirate4py.multipart.UploadProgress` while the file is streamed to Wikirate.
+        timeout : float or tuple, optional
+            Timeout of the upload, either a single value or a ``(connect, read)`` tuple.
+            Defaults to the ``upload`` timeout of the client's :class:`~wikirate4py.timeouts.TimeoutPolicy`.
 
         Returns
         -------
@@ -1893,7 +2285,44 @@ class API(object):
         files = {"card[subcards][+file][file]": data_file}
 
         log.debug("Uploading file to source: %s with file: %s", source, file_path)
-        return self.post(f"/update/{source}", params=params, files=files)
+        return self.post(f"/update/{source}", params=params, files=files, timeout=timeout,
+                         progress_callback=progress_callback)
+
+    @scoped
+    def add_sources(self, items, index=None, workers=DEFAULT_WORKERS, verify=False):
+        """
+        Uploads many source files concurrently, skipping files whose content was already uploaded.
+
+        Files are hashed locally and looked up in a content-hash index, so identical files are uploaded once and
+        later batches reuse the existing source cards. The companies and years of the items reusing a source are
+        added to it.
+
+        Parameters
+        ----------
+        items : Iterable[dict]
+            Keyword arguments of :meth:`add_source`, each with a ``file`` path.
+        index : SourceHashIndex or str, optional
+            The content-hash index, or the path of the JSON file persisting it between runs.
+        workers : int or AdaptiveConcurrencyLimiter, optional
+            Maximum number of files hashed or uploaded at the same time.
+        verify : bool, optional
+            Check that indexed sources still exist before reusing them.
+
+        Returns
+        -------
+        List[SourceUploadResult]
+            One result per item, in the order of ``items``, with the id and name of the created or reused source.
+
+        Example
+        -------
+        ```python
+        results = api.add_sources([
+            {"title": "Annual Report 2023", "file": "reports/ar2023.pdf", "company": 7217, "year": 2023},
+            {"title": "Annual Report 2023", "file": "reports/ar2023.pdf", "company": 5505, "year": 2023},
+        ], index="source_hashes.json")
+        ```
+        """
+        return SourceUploader(self, index=index, workers=workers, verify=verify).upload(items)
 
     @objectify(Source)
     def update_source(self, **kwargs) -> Source:
@@ -1958,6 +2387,142 @@ class API(object):
         log.debug("Source update parameters: %r", params)
         return self.post("/card/update", params=params)
 
+    @staticmethod
+    def _unique(identifiers):
+        return list(dict.fromkeys(identifiers))
+
+    @scoped
+    def prefetch(self, items, related=("company", "metric", "sources"), workers=DEFAULT_WORKERS, rate_limit=None):
+        """
+        Fetches the companies, metrics and sources referenced by answers or relationships, each exactly once.
+
+        The resolved models are attached to every item as ``item.prefetched[field]``. The list methods accept
+        the same fields as a ``prefetch`` argument, e.g. ``get_answers(..., prefetch=("company", "sources"))``.
+
+        Parameters
+        ----------
+        items : Iterable
+            Answers or relationships, e.g. the result of :meth:`get_answers`.
+        related : Iterable[str], optional
+            Any of ``company``, ``metric`` and ``sources`` for answers, and ``subject_company``,
+            ``object_company``, ``metric`` and ``sources`` for relationships.
+        workers : int or AdaptiveConcurrencyLimiter, optional
+            Maximum number of requests running at the same time.
+        rate_limit : RateLimiter or float, optional
+            Maximum number of requests started per second.
+
+        Returns
+        -------
+        List
+            The items, with their related cards attached.
+
+        Example
+        -------
+        ```python
+        answers = api.prefetch(api.get_answers(metric_name="Address", metric_designer="Clean Clothes Campaign"),
+                               related=("company", "sources"))
+        for answer in answers:
+            print(answer.prefetched["company"].headquarters, [s.title for s in answer.prefetched["sources"]])
+        ```
+        """
+        return prefetch_related(self, items, related=related, workers=workers, rate_limit=rate_limit)
+
+    def _get_many(self, getter, identifiers, workers, rate_limit, **kwargs):
+        return map_concurrently(lambda identifier: getter(identifier, **kwargs), self._unique(identifiers),
+                                workers=workers, rate_limit=rate_limit)
+
+    def get_companies_by_ids(self, identifiers, workers=DEFAULT_WORKERS, rate_limit=None, **kwargs):
+        """
+        Retrieves many companies concurrently with :meth:`get_company`.
+
+        Parameters
+        ----------
+        identifiers : Iterable[int or str]
+            Numeric identifiers or names of the companies. Duplicates are fetched once.
+        workers : int or AdaptiveConcurrencyLimiter, optional
+            Maximum number of requests running at the same time. Keep it within the ``pool_size`` of the client,
+            otherwise the extra connections are not reused.
+        rate_limit : RateLimiter or float, optional
+            Maximum number of requests started per second.
+        kwargs
+            Passed to every call, e.g. ``response_format``.
+
+        Returns
+        -------
+        List[BatchResult]
+            One result per distinct identifier, in input order: ``value`` is the :class:`~wikirate4py.models.Company`
+            and ``error`` the exception raised for a failed request.
+
+        Example
+        -------
+        ```python
+        results = api.get_companies_by_ids(company_ids, workers=32, rate_limit=50)
+        companies = {result.key: result.value for result in results if result.ok}
+        ```
+        """
+        return self._get_many(self.get_company, identifiers, workers, rate_limit, **kwargs)
+
+    def get_metrics_by_ids(self, identifiers, workers=DEFAULT_WORKERS, rate_limit=None, **kwargs):
+        """
+        Retrieves many metrics concurrently with :meth:`get_metric`.
+
+        Takes the same arguments as :meth:`get_companies_by_ids` and returns one
+        :class:`~wikirate4py.concurrency.BatchResult` per distinct identifier holding a
+        :class:`~wikirate4py.models.Metric`.
+        """
+        return self._get_many(self.get_metric, identifiers, workers, rate_limit, **kwargs)
+
+    def get_sources_by_ids(self, identifiers, workers=DEFAULT_WORKERS, rate_limit=None, **kwargs):
+        """
+        Retrieves many sources concurrently with :meth:`get_source`.
+
+        Takes the same arguments as :meth:`get_companies_by_ids` and returns one
+        :class:`~wikirate4py.concurrency.BatchResult` per distinct identifier holding a
+        :class:`~wikirate4py.models.Source`.
+        """
+        return self._get_many(self.get_source, identifiers, workers, rate_limit, **kwargs)
+
+    def get_answers_by_ids(self, identifiers, workers=DEFAULT_WORKERS, rate_limit=None, **kwargs):
+        """
+        Retrieves many answers concurrently with :meth:`get_answer`.
+
+        Takes the same arguments as :meth:`get_companies_by_ids` and returns one
+        :class:`~wikirate4py.concurrency.BatchResult` per distinct identifier holding an
+        :class:`~wikirate4py.models.Answer`.
+        """
+        return self._get_many(self.get_answer, identifiers, workers, rate_limit, **kwargs)
+
+    @scoped
+    def delete_wikirate_entities(self, identifiers, workers=DEFAULT_WORKERS, rate_limit=None):
+        """
+        Deletes many Wikirate entities concurrently.
+
+        Parameters
+        ----------
+        identifiers : Iterable[int]
+            Numeric identifiers of the entities to delete. Duplicates are deleted once.
+        workers : int or AdaptiveConcurrencyLimiter, optional
+            Maximum number of deletions running at the same time.
+        rate_limit : RateLimiter or float, optional
+            Maximum number of deletions started per second.
+
+        Returns
+        -------
+        List[BatchResult]
+            One result per identifier: ``value`` is the outcome of :meth:`delete_wikirate_entity` (``False`` when
+            Wikirate did not confirm the deletion) and ``error`` the exception raised for a failed request.
+
+        Example
+        -------
+        ```python
+        results = api.delete_wikirate_entities([123, 456], workers=4, rate_limit=5)
+        failed = [result.key for result in results if not (result.ok and result.value)]
+        ```
+        """
+        return map_concurrently(self.delete_wikirate_entity, self._unique(identifiers), workers=workers,
+                                rate_limit=rate_limit)
+
+    @scoped
     def delete_wikirate_entity(self, identifier: int) -> bool:
         """
         Deletes a Wikirate entity based on the given numeric identifier.
@@ -1991,26 +2556,27 @@ class API(object):
         response = self.delete(f"/~{identifier}")
 
         if response.status_code == 200:
+            if self.name_cache is not None:
+                self.name_cache.forget(identifier)
             log.info(f"Wikirate entity with ID {identifier} deleted successfully.")
             return True
         else:
             log.error(f"Failed to delete Wikirate entity with ID {identifier}. Response: {response.text}")
             return False
 
+    @scoped
     def add_companies_to_group(self, group_id, items=[]):
-        ids = ""
-        for item in items:
-            ids += '~[[' + item + ']]\n'
         params = {
             "card[type]": "List",
-            "card[name]": f"{build_card_identifier(group_id)}+Company",
-            "card[content]": ids,
+            "card[name]": f"{self.card_identifier(group_id)}+Company",
+            "card[content]": ''.join(f'~[[{item}]]\n' for item in items),
             "format": "json",
             "success[format]": "json"
         }
 
         return self.post("/card/update", params)
 
+    @scoped
     def add_companies_to_dataset(self, dataset_id, items=[]):
         ids = []
         for item in items:
@@ -2025,20 +2591,176 @@ class API(object):
 
         return self.post("/card/update", params)
 
+    @scoped
     def add_metrics_to_dataset(self, dataset_id, items=[]):
-        ids = ""
-        for item in items:
-            ids += '~[[' + item.__str__() + ']]\n'
         params = {
             "card[type]": "List",
             "card[name]": '~' + dataset_id.__str__() + '+' + 'Metric',
-            "card[content]": ids,
+            "card[content]": ''.join(f'~[[{item}]]\n' for item in items),
             "format": "json",
             "success[format]": "json"
         }
 
         return self.post("/card/update", params)
 
+    @scoped
+    def update_list_items(self, list_card, add=(), remove=(), chunk_size=LIST_CHUNK_SIZE):
+        """
+        Incrementally adds and removes items of a list card (e.g. the companies of a company group).
+
+        Only the changed items are sent, in requests of at most ``chunk_size`` items, instead of the full list.
+
+        Parameters
+        ----------
+        list_card : str
+            Name of the list card, e.g. ``"~12345+Company"``.
+        add : Iterable, optional
+            Items to add: numeric identifiers or card names.
+        remove : Iterable, optional
+            Items to remove: numeric identifiers or card names.
+        chunk_size : int, optional
+            Maximum number of items per request.
+
+        Returns
+        -------
+        List[requests.Response]
+            The responses of the update requests, in the order they were sent.
+        """
+        responses = []
+        for param, items in (("add_item[]", add), ("drop_item[]", remove)):
+            for chunk in _chunked(items, chunk_size):
+                params = {
+                    "card[type]": "List",
+                    "card[name]": list_card,
+                    param: [list_item_name(item) for item in chunk],
+                    "format": "json",
+                    "success[format]": "json"
+                }
+                log.debug("Updating %s: %s %d items", list_card, param, len(chunk))
+                responses.append(self.post("/card/update", params))
+        return responses
+
+    @scoped
+    def update_lists(self, changes, chunk_size=LIST_CHUNK_SIZE, workers=DEFAULT_WORKERS):
+        """
+        Applies incremental changes to several list cards concurrently.
+
+        The chunks of a single list are sent one after the other, so concurrent requests never edit the same card.
+
+        Parameters
+        ----------
+        changes : dict
+            List card name to an ``(add, remove)`` tuple of items.
+        chunk_size : int, optional
+            Maximum number of items per request.
+        workers : int or AdaptiveConcurrencyLimiter, optional
+            Maximum number of lists updated at the same time.
+
+        Returns
+        -------
+        List[BatchResult]
+            One result per list card holding the responses of its requests, or the error that interrupted it.
+        """
+        return map_concurrently(
+            lambda list_card: self.update_list_items(list_card, *changes[list_card], chunk_size=chunk_size),
+            changes, workers)
+
+    @scoped
+    def update_company_group(self, group_id, add=(), remove=(), chunk_size=LIST_CHUNK_SIZE):
+        """
+        Adds and removes companies of a company group without resending its full member list.
+
+        Parameters
+        ----------
+        group_id : str or int
+            Numeric identifier or name of the company group.
+        add : Iterable, optional
+            Companies to add: numeric identifiers or names.
+        remove : Iterable, optional
+            Companies to remove: numeric identifiers or names.
+        chunk_size : int, optional
+            Maximum number of companies per request.
+
+        Returns
+        -------
+        List[requests.Response]
+            The responses of the update requests.
+        """
+        return self.update_list_items(f"{self.card_identifier(group_id)}+Company", add=add, remove=remove,
+                                      chunk_size=chunk_size)
+
+    @scoped
+    def sync_company_group(self, group_id, companies, chunk_size=LIST_CHUNK_SIZE):
+        """
+        Makes the members of a company group match the given companies, sending only the difference.
+
+        Parameters
+        ----------
+        group_id : str or int
+            Numeric identifier or name of the company group.
+        companies : Iterable[str]
+            Names of all the companies the group should contain.
+        chunk_size : int, optional
+            Maximum number of companies per request.
+
+        Returns
+        -------
+        List[requests.Response]
+            The responses of the update requests, empty when the group is already up to date.
+        """
+        to_add, to_remove = compute_list_delta(self.get_company_group(group_id, response_format="model"), companies)
+        log.info("Company group %s: adding %d and removing %d companies", group_id, len(to_add), len(to_remove))
+        return self.update_company_group(group_id, add=to_add, remove=to_remove, chunk_size=chunk_size)
+
+    @scoped
+    def update_dataset_companies(self, dataset_id, add=(), remove=(), chunk_size=LIST_CHUNK_SIZE):
+        """
+        Adds and removes companies of a dataset in bounded requests.
+
+        Parameters
+        ----------
+        dataset_id : str or int
+            Numeric identifier or name of the dataset.
+        add : Iterable, optional
+            Companies to add: numeric identifiers or names.
+        remove : Iterable, optional
+            Companies to remove: numeric identifiers or names.
+        chunk_size : int, optional
+            Maximum number of companies per request.
+
+        Returns
+        -------
+        List[requests.Response]
+            The responses of the update requests.
+        """
+        return self.update_list_items(f"{self.card_identifier(dataset_id)}+Company", add=add, remove=remove,
+                                      chunk_size=chunk_size)
+
+    @scoped
+    def update_dataset_metrics(self, dataset_id, add=(), remove=(), chunk_size=LIST_CHUNK_SIZE):
+        """
+        Adds and removes metrics of a dataset in bounded requests.
+
+        Parameters
+        ----------
+        dataset_id : str or int
+            Numeric identifier or name of the dataset.
+        add : Iterable, optional
+            Metrics to add: numeric identifiers or names (e.g. ``"Core+Country"``).
+        remove : Iterable, optional
+            Metrics to remove: numeric identifiers or names.
+        chunk_size : int, optional
+            Maximum number of metrics per request.
+
+        Returns
+        -------
+        List[requests.Response]
+            The responses of the update requests.
+        """
+        return self.update_list_items(f"{self.card_identifier(dataset_id)}+Metric", add=add, remove=remove,
+                                      chunk_size=chunk_size)
+
+    @scoped
     def verify_answer(self, identifier):
         params = {
             "card[type]": "List",
@@ -2050,8 +2772,32 @@ class API(object):
 
         return self.post("/card/update", params)
 
+    @scoped
+    def verify_answers(self, identifiers, workers=DEFAULT_WORKERS, rate_limit=None):
+        """
+        Verifies many answers concurrently.
+
+        Parameters
+        ----------
+        identifiers : Iterable[int]
+            Numeric identifiers of the answers to verify. Duplicates are verified once.
+        workers : int or AdaptiveConcurrencyLimiter, optional
+            Maximum number of verifications running at the same time.
+        rate_limit : RateLimiter or float, optional
+            Maximum number of verifications started per second.
+
+        Returns
+        -------
+        List[BatchResult]
+            One result per identifier, holding the response of :meth:`verify_answer` or the exception it raised.
+        """
+        return map_concurrently(self.verify_answer, self._unique(identifiers), workers=workers,
+                                rate_limit=rate_limit)
+
+    @scoped
     def get_comments(self, identifier):
         return self.get("/~{0}+discussion.json".format(identifier)).json().get('content', '')
 
+    @scoped
     def get_content(self, identifier):
         return self.get("/{0}.json".format(identifier)).json().get('content', '')
@@ -0,0 +1,173 @@
+import collections
+import logging
+import threading
+import time
+
+from wikirate4py.exceptions import CircuitOpenException, Wikirate4PyException
+
+log = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker(object):
+    """
+    Thread-safe circuit breaker failing requests fast while the server is down.
+
+    The breaker starts ``closed`` and counts the outcomes of the requests of the last ``window`` seconds. Server
+    errors (5xx responses) and requests that timed out or could not connect are failures; any other response,
+    including 4xx ones, shows the server is up. Once at least ``minimum_requests`` were counted and the share of
+    failures reaches ``failure_rate``, the breaker opens: requests raise
+    :class:`~wikirate4py.exceptions.CircuitOpenException` without being sent. After ``recovery_timeout`` seconds it
+    half-opens and lets ``probes`` requests through. It closes again once they all succeed, and reopens on the first
+    failing probe.
+
+    Parameters
+    ----------
+    failure_rate : float, optional
+        Share of failed requests opening the breaker, between 0 and 1.
+    minimum_requests : int, optional
+        Number of requests of the window needed before the failure rate is considered.
+    window : float, optional
+        Length in seconds of the sliding window of counted requests.
+    recovery_timeout : float, optional
+        Seconds the breaker stays open before probing the server.
+    probes : int, optional
+        Number of successful probe requests closing a half-open breaker. Only this many run at the same time.
+    clock : callable, optional
+        Monotonic clock returning seconds, for tests.
+
+    Example
+    -------
+    ```python
+    api = API(token, circuit_breaker=CircuitBreaker(failure_rate=0.5, recovery_timeout=60))
+    ...
+    if api.circuit_state == "open":
+        print("Wikirate is down")
+    ```
+    """
+
+    def __init__(self, failure_rate=0.5, minimum_requests=20, window=60.0, recovery_timeout=30.0, probes=1,
+                 clock=time.monotonic):
+        if not 0 < failure_rate <= 1:
+            raise Wikirate4PyException(f"Invalid failure rate: {failure_rate}. It must be between 0 and 1.")
+        self.failure_rate = failure_rate
+        self.minimum_requests = max(1, minimum_requests)
+        self.window = window
+        self.recovery_timeout = recovery_timeout
+        self.probes = max(1, probes)
+        self._clock = clock
+        self._state = CLOSED
+        self._outcomes = collections.deque()
+        self._failures = 0
+        self._opened_at = None
+        self._probes_running = 0
+        self._probes_succeeded = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            self._update(self._clock())
+            return self._state
+
+    def stats(self):
+        """Returns the state and the number of requests and failures counted in the current window."""
+        with self._lock:
+            now = self._clock()
+            self._update(now)
+            return {"state": self._state, "requests": len(self._outcomes), "failures": self._failures,
+                    "retry_after": self._retry_after(now)}
+
+    def reset(self):
+        """Closes the breaker and forgets the counted requests."""
+        with self._lock:
+            self._close()
+
+    def before_request(self):
+        """
+        Registers a request about to be sent.
+
+        Raises
+        ------
+        CircuitOpenException
+            If the breaker is open, or half-open with all its probes running.
+        """
+        with self._lock:
+            now = self._clock()
+            self._update(now)
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes_running + self._probes_succeeded < self.probes:
+                self._probes_running += 1
+                return
+            retry_after = self._retry_after(now)
+        raise CircuitOpenException(retry_after)
+
+    def record(self, failed):
+        """Registers the outcome of a request allowed by :meth:`before_request`."""
+        with self._lock:
+            now = self._clock()
+            if self._state == HALF_OPEN:
+                self._probes_running = max(0, self._probes_running - 1)
+                if failed:
+                    log.warning("Circuit breaker reopened: a probe request failed")
+                    self._open(now)
+                else:
+                    self._probes_succeeded += 1
+                    if self._probes_succeeded >= self.probes:
+                        log.info("Circuit breaker closed: the server recovered")
+                        self._close()
+                return
+            if self._state == OPEN:
+                # A request sent before the breaker opened
+                return
+            self._outcomes.append((now, failed))
+            self._failures += failed
+            self._expire(now)
+            if len(self._outcomes) >= self.minimum_requests and \
+                    self._failures >= self.failure_rate * len(self._outcomes):
+                log.warning("Circuit breaker open: %d of the last %d requests failed; failing fast for %ss",
+                            self._failures, len(self._outcomes), self.recovery_timeout)
+                self._open(now)
+
+    def cancel(self):
+        """Registers that a request allowed by :meth:`before_request` was not sent after all."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_running = max(0, self._probes_running - 1)
+
+    def _expire(self, now):
+        while self._outcomes and self._outcomes[0][0] <= now - self.window:
+            self._failures -= self._outcomes.popleft()[1]
+
+    def _update(self, now):
+        if self._state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            log.info("Circuit breaker half-open: probing the server")
+            self._state = HALF_OPEN
+            self._probes_running = 0
+            self._probes_succeeded = 0
+        elif self._state == CLOSED:
+            self._expire(now)
+
+    def _retry_after(self, now):
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - now)
+
+    def _open(self, now):
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._failures = 0
+
+    def _close(self):
+        self._state = CLOSED
+        self._opened_at = None
+        self._outcomes.clear()
+        self._failures = 0
+        self._probes_running = 0
+        self._probes_succeeded = 0
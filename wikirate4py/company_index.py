@@ -0,0 +1,215 @@
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+
+from wikirate4py.cursor import Cursor
+
+log = logging.getLogger(__name__)
+
+# Company attribute holding each kind of identifier, in lookup priority order
+IDENTIFIER_ATTRIBUTES = {
+    "lei": "lei",
+    "isin": "isin",
+    "sec_cik": "sec_cik",
+    "open_corporates": "open_corporates",
+    "os_id": "os_id",
+    "uk_company_number": "uk_company_number",
+    "australian_business_number": "australian_business_number",
+    "name": "name",
+    "alias": "aliases",
+}
+
+NAME_KINDS = ("name", "alias")
+
+
+def normalize_identifier(kind, value):
+    """Normalizes an identifier so lookups ignore case and surrounding or repeated whitespace."""
+    value = re.sub(r"\s+", " ", str(value)).strip()
+    return value.casefold() if kind in NAME_KINDS else value.upper()
+
+
+class CompanyIdentifierIndex(object):
+    """
+    Local index resolving company identifiers (LEI, ISIN, SEC CIK, OpenCorporates, Open Supply, UK company number,
+    names and aliases) to Wikirate company ids without calling the API.
+
+    The index is populated once by paging :meth:`~wikirate4py.API.get_companies`, kept up to date with
+    :meth:`refresh` or :meth:`add`, and can be saved to disk between runs.
+
+    Parameters
+    ----------
+    path : str, optional
+        JSON file (gzip-compressed when it ends with ``.gz``) the index is loaded from and saved to.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._companies = {}
+        self._lookup = {kind: {} for kind in IDENTIFIER_ATTRIBUTES}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._companies)
+
+    def __contains__(self, company_id):
+        return company_id in self._companies
+
+    @staticmethod
+    def _identifiers(company):
+        identifiers = {}
+        for kind, attribute in IDENTIFIER_ATTRIBUTES.items():
+            value = getattr(company, attribute, None)
+            values = value if isinstance(value, (list, tuple)) else [value]
+            values = [item for item in values if item not in (None, "")]
+            if values:
+                identifiers[kind] = values
+        return identifiers
+
+    def _index(self, company_id, identifiers):
+        for kind, values in identifiers.items():
+            lookup = self._lookup[kind]
+            for value in values:
+                lookup[normalize_identifier(kind, value)] = company_id
+
+    def _unindex(self, company_id, identifiers):
+        for kind, values in identifiers.items():
+            lookup = self._lookup[kind]
+            for value in values:
+                key = normalize_identifier(kind, value)
+                if lookup.get(key) == company_id:
+                    del lookup[key]
+
+    def add(self, company):
+        """
+        Adds or updates a company in the index.
+
+        Parameters
+        ----------
+        company : Company or CompanyItem
+            The company to index.
+
+        Returns
+        -------
+        bool
+            True if the index changed.
+        """
+        company_id = int(company.id)
+        identifiers = self._identifiers(company)
+        with self._lock:
+            previous = self._companies.get(company_id)
+            if previous == identifiers:
+                return False
+            if previous is not None:
+                self._unindex(company_id, previous)
+            self._companies[company_id] = identifiers
+            self._index(company_id, identifiers)
+        return True
+
+    def remove(self, company_id):
+        with self._lock:
+            identifiers = self._companies.pop(company_id, None)
+            if identifiers is not None:
+                self._unindex(company_id, identifiers)
+
+    def refresh(self, api, per_page=200, prune=None, **filters):
+        """
+        Pages through :meth:`~wikirate4py.API.get_companies`, indexes new or changed companies and drops the ones no
+        longer listed, such as deleted or merged companies.
+
+        This is a full re-scan of the listing, costing as many requests as building the index: the companies
+        endpoint has no filter or sort on update time to page through the changed companies only. Only the local
+        updates are incremental, unchanged companies are left as they are.
+
+        Parameters
+        ----------
+        api : API
+            The client used to list companies.
+        per_page : int, optional
+            Number of companies requested per page.
+        prune : bool, optional
+            Remove indexed companies missing from the listing. Defaults to True without ``filters``, since a filtered
+            listing does not cover every indexed company.
+        filters
+            Filters of :meth:`~wikirate4py.API.get_companies` (e.g. ``company_group`` or ``country``) restricting
+            the companies to index.
+
+        Returns
+        -------
+        int
+            The number of companies added, updated or removed.
+        """
+        if prune is None:
+            prune = not filters
+        changed = 0
+        seen = set()
+        cursor = Cursor(api.get_companies, per_page=per_page, response_format="model", **filters)
+        while cursor.has_next():
+            for company in cursor.next():
+                seen.add(int(company.id))
+                changed += self.add(company)
+        removed = 0
+        if prune:
+            with self._lock:
+                stale = [company_id for company_id in self._companies if company_id not in seen]
+            for company_id in stale:
+                self.remove(company_id)
+            removed = len(stale)
+        log.info("Indexed %d companies, %d new or changed, %d removed", len(seen), changed, removed)
+        return changed + removed
+
+    def lookup(self, identifier, kinds=None):
+        """
+        Returns the id of the company with the given identifier, or None if it is unknown.
+
+        Parameters
+        ----------
+        identifier : str
+            The identifier, e.g. an LEI, an ISIN or a company name.
+        kinds : Iterable[str], optional
+            Kinds of identifier to search (keys of ``IDENTIFIER_ATTRIBUTES``). By default, registry identifiers are
+            searched first, then names and aliases.
+        """
+        for kind in kinds or IDENTIFIER_ATTRIBUTES:
+            company_id = self._lookup[kind].get(normalize_identifier(kind, identifier))
+            if company_id is not None:
+                return company_id
+        return None
+
+    def lookup_many(self, identifiers, kinds=None):
+        """
+        Resolves many identifiers at once.
+
+        Returns
+        -------
+        dict
+            Identifier to company id, with None for unknown identifiers.
+        """
+        return {identifier: self.lookup(identifier, kinds) for identifier in identifiers}
+
+    @staticmethod
+    def _open(path, mode):
+        if path.endswith(".gz"):
+            return gzip.open(path, mode + "t", encoding="utf-8")
+        return open(path, mode, encoding="utf-8")
+
+    def load(self):
+        with self._open(self.path, "r") as index_file:
+            companies = json.load(index_file)
+        with self._lock:
+            self._companies = {int(company_id): identifiers for company_id, identifiers in companies.items()}
+            self._lookup = {kind: {} for kind in IDENTIFIER_ATTRIBUTES}
+            for company_id, identifiers in self._companies.items():
+                self._index(company_id, identifiers)
+
+    def save(self, path=None):
+        path = path or self.path
+        tmp_path = f"{path}.tmp.gz" if path.endswith(".gz") else f"{path}.tmp"
+        with self._lock:
+            with self._open(tmp_path, "w") as index_file:
+                json.dump(self._companies, index_file)
+            os.replace(tmp_path, path)
@@ -0,0 +1,328 @@
+import collections
+import contextlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import contextvars
+except ImportError:  # Python 3.6
+    contextvars = None
+
+from wikirate4py.exceptions import (Wikirate4PyException, DeadlineExceededException, TooManyRequestsException,
+                                    WikirateServerErrorException)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+
+# Errors showing that the server is overloaded, on which the adaptive limiter backs off
+OVERLOAD_ERRORS = (TooManyRequestsException, WikirateServerErrorException)
+
+# Lane of PriorityLanes the calls of map_concurrently run in, unless the caller selected one
+BATCH_LANE = "batch"
+
+# Lane selected for the requests of the current context. A context variable follows calls onto the worker threads
+# of map_concurrently, which run in a copy of the caller's context.
+if contextvars is not None:
+    _selected_lane = contextvars.ContextVar("wikirate4py_lane", default=None)
+else:
+    _lane_state = threading.local()
+
+
+def selected_lane():
+    """Returns the lane selected by the innermost :func:`lane_scope`, or None."""
+    if contextvars is not None:
+        return _selected_lane.get()
+    return getattr(_lane_state, "lane", None)
+
+
+@contextlib.contextmanager
+def lane_scope(name, override=True):
+    """
+    Sends the requests made inside the block through the lane ``name`` of the client's
+    :class:`~wikirate4py.lanes.PriorityLanes`.
+
+    Parameters
+    ----------
+    name : str
+        Name of the lane, e.g. ``interactive`` or ``batch``. None leaves the selection unchanged.
+    override : bool, optional
+        Whether to replace a lane selected by an enclosing scope. Bulk operations use ``False`` to default to the
+        batch lane while honouring a lane chosen by the caller.
+    """
+    if name is None or (not override and selected_lane() is not None):
+        yield
+        return
+    if contextvars is not None:
+        token = _selected_lane.set(name)
+        try:
+            yield
+        finally:
+            _selected_lane.reset(token)
+    else:
+        outer = selected_lane()
+        _lane_state.lane = name
+        try:
+            yield
+        finally:
+            _lane_state.lane = outer
+
+
+class BatchResult(object):
+    """Outcome of one item of a batch operation: either a ``value`` or the ``error`` raised while processing it."""
+    __slots__ = ("key", "value", "error")
+
+    def __init__(self, key, value=None, error=None):
+        self.key = key
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def json(self):
+        return {"key": self.key, "value": self.value, "error": None if self.error is None else str(self.error)}
+
+    def __repr__(self):
+        return str(self.json())
+
+
+class RateLimiter(object):
+    """
+    Thread-safe token bucket limiting how many calls start per second.
+
+    Parameters
+    ----------
+    rate : float
+        Sustained number of calls allowed per second.
+    burst : int, optional
+        Number of calls that may start back to back after an idle period. Defaults to one.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0:
+            raise Wikirate4PyException(f"Invalid rate limit: {rate}. It must be a positive number.")
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        """
+        Blocks until a call is allowed to start.
+
+        Parameters
+        ----------
+        deadline : Deadline, optional
+            Deadline of the call's operation.
+
+        Raises
+        ------
+        DeadlineExceededException
+            If the call cannot start before the deadline.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and deadline.remaining() < wait:
+                raise DeadlineExceededException(deadline.seconds)
+            time.sleep(wait)
+
+
+def as_rate_limiter(rate_limit):
+    """Accepts a :class:`RateLimiter`, a number of calls per second, or ``None`` for no limit."""
+    if rate_limit is None or isinstance(rate_limit, RateLimiter):
+        return rate_limit
+    return RateLimiter(rate_limit)
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Thread-safe limit on the number of calls running at the same time, adapted to how the server copes (AIMD).
+
+    Each call that succeeds while at least half of the limit is in use, with a healthy latency, raises the limit by
+    ``1 / limit``, i.e. by one per round of calls. A latency is healthy while it stays below ``latency_tolerance``
+    times the lowest latency of the last ``window`` calls. A call failing with
+    :class:`~wikirate4py.exceptions.TooManyRequestsException` or
+    :class:`~wikirate4py.exceptions.WikirateServerErrorException` multiplies the limit by ``backoff``, once per
+    round: calls started before the last backoff do not back off again. Other errors leave the limit unchanged.
+
+    Pass it as the ``workers`` of :func:`map_concurrently`, the batch methods of :class:`~wikirate4py.API`,
+    :class:`~wikirate4py.Crawler` or :class:`~wikirate4py.SupplyChainTraversal`. A single limiter can be shared
+    by several of them.
+
+    Parameters
+    ----------
+    initial : int, optional
+        Starting limit.
+    minimum, maximum : int, optional
+        Bounds of the limit. Thread pools using the limiter get ``maximum`` threads.
+    backoff : float, optional
+        Factor applied to the limit on overload, between 0 and 1.
+    latency_tolerance : float, optional
+        Ratio to the lowest recent latency above which the limit stops growing. None to ignore latency.
+    window : int, optional
+        Number of recent latencies the lowest one is taken from.
+
+    Example
+    -------
+    ```python
+    limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=64)
+    collector.add_gauge("concurrency_limit", "Concurrent requests allowed.", lambda: limiter.limit)
+    results = api.get_companies_by_ids(company_ids, workers=limiter)
+    print(limiter.stats())
+    ```
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=64, backoff=0.5, latency_tolerance=2.0, window=100):
+        if not 1 <= minimum <= initial <= maximum:
+            raise Wikirate4PyException(f"Invalid concurrency limits: expected 1 <= minimum ({minimum}) <= initial "
+                                       f"({initial}) <= maximum ({maximum}).")
+        if not 0 < backoff < 1:
+            raise Wikirate4PyException(f"Invalid backoff: {backoff}. It must be between 0 and 1.")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._latencies = collections.deque(maxlen=window)
+        self._backed_off_at = float("-inf")
+        self._increases = 0
+        self._decreases = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """Current number of calls allowed to run at the same time."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """Number of calls running."""
+        return self._in_flight
+
+    def acquire(self):
+        """Blocks until a call may start, and returns its start time to pass to :meth:`release`."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+        return time.monotonic()
+
+    def release(self, started, error=None):
+        """Registers the end of a call started by :meth:`acquire`, failed with ``error`` if given."""
+        latency = time.monotonic() - started
+        with self._condition:
+            saturated = 2 * self._in_flight >= self._limit
+            self._in_flight -= 1
+            if isinstance(error, OVERLOAD_ERRORS):
+                if started > self._backed_off_at:
+                    self._backed_off_at = time.monotonic()
+                    self._set_limit(max(self.minimum, self._limit * self.backoff))
+                    self._decreases += 1
+            elif error is None:
+                healthy = self.latency_tolerance is None or not self._latencies or \
+                    latency <= self.latency_tolerance * min(self._latencies)
+                self._latencies.append(latency)
+                # Only grow while at least half of the limit is in use, so an idle limiter does not inflate
+                if healthy and saturated and self._limit < self.maximum:
+                    self._set_limit(min(self.maximum, self._limit + 1 / self._limit))
+                    self._increases += 1
+            self._condition.notify_all()
+
+    def _set_limit(self, limit):
+        if int(limit) != int(self._limit):
+            log.debug("Concurrency limit %d -> %d", int(self._limit), int(limit))
+        self._limit = limit
+
+    def call(self, func, *args, **kwargs):
+        """Runs ``func`` once a call may start, and registers its outcome."""
+        started = self.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.release(started, e)
+            raise
+        self.release(started)
+        return result
+
+    def stats(self):
+        """Returns the current limit, the running calls, the lowest recent latency and the number of changes."""
+        with self._condition:
+            return {"limit": int(self._limit), "in_flight": self._in_flight,
+                    "min_latency": min(self._latencies) if self._latencies else None,
+                    "increases": self._increases, "decreases": self._decreases}
+
+
+def pool_size(workers):
+    """Returns the number of threads to run with ``workers``, a number or an :class:`AdaptiveConcurrencyLimiter`."""
+    if isinstance(workers, AdaptiveConcurrencyLimiter):
+        return workers.maximum
+    return workers
+
+
+def map_concurrently(func, items, workers=DEFAULT_WORKERS, rate_limit=None):
+    """
+    Calls ``func`` on every item using a bounded thread pool.
+
+    Exceptions raised by ``func`` are captured per item instead of aborting the batch.
+
+    Parameters
+    ----------
+    func : callable
+        Function called with a single item.
+    items : Iterable
+        The items to process.
+    workers : int or AdaptiveConcurrencyLimiter, optional
+        Maximum number of calls running at the same time, or a limiter adapting it.
+    rate_limit : RateLimiter or float, optional
+        Maximum number of calls started per second, shared by all workers.
+
+    Returns
+    -------
+    List[BatchResult]
+        One result per item, in the order of ``items``.
+    """
+    items = list(items)
+    limiter = as_rate_limiter(rate_limit)
+    concurrency = workers if isinstance(workers, AdaptiveConcurrencyLimiter) else None
+    workers = pool_size(workers)
+
+    def run(item):
+        try:
+            if limiter is not None:
+                limiter.acquire()
+            with lane_scope(BATCH_LANE, override=False):
+                if concurrency is not None:
+                    return BatchResult(item, value=concurrency.call(func, item))
+                return BatchResult(item, value=func(item))
+        except Exception as e:
+            return BatchResult(item, error=e)
+
+    if workers <= 1 or len(items) <= 1:
+        return [run(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        futures = [submit_in_context(executor, run, item) for item in items]
+        return [future.result() for future in futures]
+
+
+def submit_in_context(executor, func, *args):
+    """
+    Submits a call to an executor, running it in a copy of the caller's context so the tracing spans, lane and
+    timeout scope of the caller apply to it.
+    """
+    if contextvars is None:
+        return executor.submit(func, *args)
+    return executor.submit(contextvars.copy_context().run, func, *args)
@@ -0,0 +1,269 @@
+import gzip
+import heapq
+import itertools
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from wikirate4py.concurrency import (DEFAULT_WORKERS, BATCH_LANE, AdaptiveConcurrencyLimiter, as_rate_limiter,
+                                     lane_scope, pool_size, submit_in_context)
+from wikirate4py.exceptions import Wikirate4PyException
+
+log = logging.getLogger(__name__)
+
+# Lower values are crawled first: scopes, then their listings, then cards referenced by the listed items
+DEFAULT_PRIORITIES = {
+    "dataset": 0,
+    "project": 0,
+    "metrics_of": 1,
+    "companies_of": 1,
+    "metric": 2,
+    "company": 2,
+    "answers_of": 3,
+    "relationships_of": 3,
+    "source": 4,
+}
+
+# Task kind fetching a single card, and the API getter used for it
+CARD_GETTERS = {
+    "dataset": "get_dataset",
+    "project": "get_project",
+    "metric": "get_metric",
+    "company": "get_company",
+    "source": "get_source",
+}
+
+# Task kind listing the cards of a scope page by page, the API list method used for it and the kind of the items
+LIST_METHODS = {
+    "metrics_of": ("get_metrics", "metric"),
+    "companies_of": ("get_companies", "company"),
+    "answers_of": ("get_answers", "answer"),
+    "relationships_of": ("get_relationships", "relationship"),
+}
+
+RELATIONSHIP_METRIC_TYPES = ("Relationship", "Inverse Relationship")
+
+
+class CrawlTask(object):
+    """A unit of crawl work: fetching one card, or one page of a listing."""
+    __slots__ = ("kind", "identifier", "depth", "offset")
+
+    def __init__(self, kind, identifier, depth=0, offset=0):
+        self.kind = kind
+        self.identifier = identifier
+        self.depth = depth
+        self.offset = offset
+
+    @property
+    def key(self):
+        return self.kind, str(self.identifier), self.offset
+
+    def __repr__(self):
+        return f"CrawlTask({self.kind}, {self.identifier!r}, depth={self.depth}, offset={self.offset})"
+
+
+class MemorySink(object):
+    """Crawl sink keeping the crawled entities in memory, grouped by entity kind."""
+
+    def __init__(self):
+        self.entities = {}
+
+    def __call__(self, kind, entity):
+        self.entities.setdefault(kind, []).append(entity)
+
+
+class JsonlSink(object):
+    """
+    Crawl sink writing each crawled entity as a ``{"kind": ..., "data": ...}`` JSON line holding its raw payload.
+
+    Parameters
+    ----------
+    path : str
+        Output file, gzip-compressed when it ends with ``.gz``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8") if path.endswith(".gz") else \
+            open(path, "w", encoding="utf-8")
+
+    def __call__(self, kind, entity):
+        self._file.write(json.dumps({"kind": kind, "data": entity.raw}, ensure_ascii=False))
+        self._file.write("\n")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Crawler(object):
+    """
+    Crawls the cards reachable from datasets, projects, metrics or companies with bounded concurrency.
+
+    Starting from seed cards, the crawler fetches each card and follows its links: a dataset lists its metrics,
+    companies and answers, a project its metrics, companies and answers, a relationship metric its relationships,
+    and answers their sources. Tasks run on a pool of worker threads in priority order, every card is emitted to
+    the sink once (keyed by card id), and links deeper than ``max_depth`` are not followed. The sink is always
+    called from the thread running :meth:`run`.
+
+    Parameters
+    ----------
+    api : API
+        The client used to fetch the cards.
+    sink : callable, optional
+        Called with the kind (e.g. ``"answer"``) and the model of every crawled card. Defaults to a
+        :class:`MemorySink`.
+    workers : int or AdaptiveConcurrencyLimiter, optional
+        Maximum number of requests running at the same time.
+    max_depth : int, optional
+        Maximum number of links followed from a seed. Seeds are at depth 0.
+    priorities : dict, optional
+        Overrides of ``DEFAULT_PRIORITIES``, task kind to priority (lower first).
+    per_page : int, optional
+        Number of items requested per listing page.
+    rate_limit : RateLimiter or float, optional
+        Maximum number of requests started per second.
+    follow_sources : bool, optional
+        Fetch the sources of crawled answers.
+
+    Example
+    -------
+    ```python
+    with JsonlSink("bundle.jsonl.gz") as sink:
+        stats = Crawler(api, sink=sink, workers=16).run(datasets=["Fashion Transparency Index 2023"])
+    ```
+    """
+
+    def __init__(self, api, sink=None, workers=DEFAULT_WORKERS, max_depth=3, priorities=None, per_page=200,
+                 rate_limit=None, follow_sources=True):
+        self.api = api
+        self.sink = sink if sink is not None else MemorySink()
+        # Optional limiter adapting the number of running tasks to how the server copes
+        self.concurrency = workers if isinstance(workers, AdaptiveConcurrencyLimiter) else None
+        self.workers = max(1, pool_size(workers))
+        self.max_depth = max_depth
+        self.priorities = dict(DEFAULT_PRIORITIES, **(priorities or {}))
+        self.per_page = min(per_page, 200)
+        self.rate_limiter = as_rate_limiter(rate_limit)
+        self.follow_sources = follow_sources
+        self.visited = set()
+        self.errors = []
+        self.counts = {}
+        self._queued = set()
+        self._queue = []
+        self._order = itertools.count()
+
+    def add(self, kind, identifier, depth=0):
+        """Queues a card or listing to crawl, unless it has already been queued or is too deep."""
+        if kind not in self.priorities:
+            raise Wikirate4PyException(f"Invalid crawl task kind: {kind}. Expected one of: "
+                                       f"{', '.join(self.priorities)}.")
+        self._push(CrawlTask(kind, identifier, depth))
+
+    def _push(self, task):
+        if task.depth > self.max_depth or task.key in self._queued:
+            return
+        self._queued.add(task.key)
+        heapq.heappush(self._queue, (self.priorities[task.kind], task.depth, next(self._order), task))
+
+    def run(self, datasets=(), projects=(), metrics=(), companies=()):
+        """
+        Crawls from the given seeds, plus any task queued with :meth:`add`, until no work is left.
+
+        Returns
+        -------
+        dict
+            Number of emitted cards per kind, with the number of failed tasks under ``errors``.
+        """
+        for kind, seeds in (("dataset", datasets), ("project", projects), ("metric", metrics),
+                            ("company", companies)):
+            for seed in seeds:
+                self.add(kind, seed)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            running = {}
+            while self._queue or running:
+                slots = self.workers if self.concurrency is None else self.concurrency.limit
+                while self._queue and len(running) < slots:
+                    task = heapq.heappop(self._queue)[-1]
+                    if self.concurrency is None:
+                        running[submit_in_context(executor, self._execute, task)] = task
+                    else:
+                        running[submit_in_context(executor, self.concurrency.call, self._execute, task)] = task
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        entities, children = future.result()
+                    except Exception as e:
+                        log.warning("Crawl task %r failed: %s", task, e)
+                        self.errors.append((task, e))
+                        continue
+                    for kind, entity in entities:
+                        self._emit(kind, entity)
+                    for child in children:
+                        self._push(child)
+
+        log.info("Crawl finished: %s", self.counts)
+        return dict(self.counts, errors=len(self.errors))
+
+    def _emit(self, kind, entity):
+        key = getattr(entity, "id", None)
+        if key is None or key in self.visited:
+            return
+        self.visited.add(key)
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.sink(kind, entity)
+
+    def _execute(self, task):
+        """Runs a task on a worker thread and returns the entities it found and the tasks it links to."""
+        # Default to the batch lane while honouring a lane chosen by the caller
+        with lane_scope(BATCH_LANE, override=False):
+            return self._fetch(task)
+
+    def _fetch(self, task):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        if task.kind in CARD_GETTERS:
+            card = getattr(self.api, CARD_GETTERS[task.kind])(task.identifier, response_format="model")
+            entities = [(task.kind, card)]
+            if task.kind == "project":
+                # The answers of a project come with it rather than from a listing
+                entities += [("answer", answer) for answer in card.answers]
+            return entities, self._links(task, card)
+
+        method, kind = LIST_METHODS[task.kind]
+        items = getattr(self.api, method)(identifier=task.identifier, offset=task.offset, limit=self.per_page,
+                                          response_format="model")
+        children = []
+        if len(items) == self.per_page:
+            children.append(CrawlTask(task.kind, task.identifier, task.depth, task.offset + self.per_page))
+        for item in items:
+            children.extend(self._links(task, item))
+        return [(kind, item) for item in items], children
+
+    def _links(self, task, card):
+        depth = task.depth + 1
+        if task.kind == "dataset":
+            return [CrawlTask(kind, card.id, depth) for kind in ("metrics_of", "companies_of", "answers_of")]
+        if task.kind == "project":
+            links = [CrawlTask("metric", name, depth) for name in card.metrics or []]
+            links += [CrawlTask("company", name, depth) for name in card.companies or []]
+            for answer in card.answers:
+                links += self._source_links(answer, depth)
+            return links
+        if task.kind in ("metric", "metrics_of") and getattr(card, "metric_type", None) in RELATIONSHIP_METRIC_TYPES:
+            return [CrawlTask("relationships_of", card.id, depth)]
+        if task.kind == "answers_of":
+            return self._source_links(card, depth)
+        return []
+
+    def _source_links(self, answer, depth):
+        if not self.follow_sources:
+            return []
+        return [CrawlTask("source", getattr(source, "id", None) or source, depth) for source in answer.sources or []]
@@ -1,6 +1,10 @@
+from wikirate4py.exceptions import Wikirate4PyException
+from wikirate4py.timeouts import Deadline, timeout_scope
+
+
 class Cursor(object):
 
-    def __init__(self, method, per_page=20, offset=0, **kwargs):
+    def __init__(self, method, per_page=20, offset=0, deadline=None, **kwargs):
         self.method = method
         self.kwargs = kwargs
         if per_page > 200:
@@ -11,11 +15,29 @@ class Cursor(object):
         self.offset = offset
         self.limit = per_page
         self.items = None
+        # Overall time budget of the iteration in seconds, counted from the creation of the cursor
+        self.deadline = Deadline(deadline) if deadline is not None else None
 
     def has_next(self) -> bool:
-        self.items = self.method(offset=self.offset, limit=self.limit, **self.kwargs)
+        if self.deadline is None:
+            page = self.method(offset=self.offset, limit=self.limit, **self.kwargs)
+        else:
+            # No page is requested once the deadline has passed, and each request is bounded by the time left
+            with timeout_scope(deadline=self.deadline):
+                page = self.method(offset=self.offset, limit=self.limit, **self.kwargs)
+        self.items = self._page_items(page)
         return len(self.items) > 0
 
+    @staticmethod
+    def _page_items(page):
+        # Pages of a client with the json response format are list payloads, whose items are the cards listed
+        if isinstance(page, dict):
+            return page.get("items") or []
+        if isinstance(page, (bytes, bytearray)):
+            raise Wikirate4PyException("A Cursor cannot page through raw responses: use the 'model' or 'json' "
+                                       "response format.")
+        return page
+
     def next(self):
         self.offset += self.per_page
         return self.items
@@ -64,3 +64,21 @@ class TooManyRequestsException(HTTPException):
 class WikirateServerErrorException(HTTPException):
     """Exception raised for a 5xx HTTP status code"""
     pass
+
+
+class CircuitOpenException(Wikirate4PyException):
+    """Exception raised instead of sending a request while the circuit breaker of the client is open"""
+
+    def __init__(self, retry_after):
+        # Seconds until the breaker lets probe requests through
+        self.retry_after = retry_after
+        super().__init__(f"Circuit breaker open: the server is failing, retry in {retry_after:.0f}s")
+
+
+class DeadlineExceededException(Wikirate4PyException):
+    """Exception raised instead of sending a request once the deadline of its operation has passed"""
+
+    def __init__(self, seconds):
+        # Time budget of the operation
+        self.seconds = seconds
+        super().__init__(f"Deadline of {seconds}s exceeded")
@@ -0,0 +1,342 @@
+import bisect
+import logging
+import threading
+import time
+from urllib.parse import urlsplit, unquote
+
+log = logging.getLogger(__name__)
+
+# Path names that are endpoints of their own rather than card names, e.g. /Companies.json or /<metric>+Answers.json
+ENDPOINT_NAMES = ("Answers", "Relationships", "Companies", "Metrics", "Topics", "Sources", "Datasets", "Projects",
+                  "Company_Groups", "Research_Groups", "Region", "Source_by_url", "discussion")
+
+# Upper bounds in seconds of the request duration histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Phases of a request, in the order they happen
+PHASES = ("send", "download", "decode", "build")
+
+# API method being called on each thread, so requests can be attributed to it and completed by objectify
+_state = threading.local()
+
+
+def endpoint_template(path):
+    """
+    Returns the endpoint of a request path with card names replaced by ``{card}``, e.g. ``/{card}+Answers.json``
+    for ``https://wikirate.org/Core+Company_Report_Available+Answers.json``.
+    """
+    path = unquote(urlsplit(path).path)
+    if path in ("/card/create", "/card/update"):
+        return path
+    if path.startswith("/update/"):
+        return "/update/{card}"
+    name, json_suffix = (path[1:-len(".json")], ".json") if path.endswith(".json") else (path[1:], "")
+    if name in ENDPOINT_NAMES:
+        return path
+    card, _, endpoint = name.rpartition("+")
+    if card and endpoint in ENDPOINT_NAMES:
+        return f"/{{card}}+{endpoint}{json_suffix}"
+    return f"/{{card}}{json_suffix}"
+
+
+class RequestRecord(object):
+    """
+    What happened during one request of the client, passed to the hooks of :class:`~wikirate4py.API`.
+
+    Durations are in seconds. ``send`` runs from sending the request to receiving the response headers, so it
+    includes DNS resolution, connecting and the server's processing time; ``download`` is the time spent reading the
+    body. ``decode`` (JSON parsing) and ``build`` (model construction) are only set for calls returning models or
+    JSON.
+
+    Attributes
+    ----------
+    call : str
+        Name of the API method that made the request, if any, e.g. ``get_answers``.
+    method : str
+        HTTP method.
+    endpoint : str
+        Endpoint template, see :func:`endpoint_template`.
+    path : str
+        Requested URL.
+    status : int
+        HTTP status, None if no response was received.
+    request_bytes, response_bytes : int
+        Size of the request and response bodies.
+    items : int
+        Number of items of list responses, 1 for single cards.
+    error : Exception
+        Exception raised to the caller, e.g. a :class:`~wikirate4py.exceptions.TooManyRequestsException`.
+    started_at : float
+        Unix time the request started at.
+    """
+    __slots__ = ("call", "method", "endpoint", "path", "status", "request_bytes", "response_bytes", "items", "error",
+                 "started_at", "send", "download", "decode", "build")
+
+    def __init__(self, method, path, call=None):
+        self.call = call
+        self.method = method.upper()
+        self.endpoint = endpoint_template(path)
+        self.path = path
+        self.status = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.items = None
+        self.error = None
+        self.started_at = time.time()
+        self.send = None
+        self.download = None
+        self.decode = None
+        self.build = None
+
+    @property
+    def elapsed(self):
+        """Total duration of the phases that ran."""
+        return sum(getattr(self, phase) or 0.0 for phase in PHASES)
+
+    def json(self):
+        data = {key: getattr(self, key) for key in self.__slots__}
+        data["error"] = None if self.error is None else f"{type(self.error).__name__}: {self.error}"
+        data["elapsed"] = self.elapsed
+        return data
+
+    def __repr__(self):
+        return str(self.json())
+
+
+def begin_call(name):
+    """Marks the start of an API method call on the current thread and returns the call it is nested in."""
+    outer = getattr(_state, "call", None)
+    _state.call = [name, None]
+    return outer
+
+
+def end_call(outer):
+    """Marks the end of the current call and returns the record of its request, if it is still pending."""
+    call = getattr(_state, "call", None)
+    _state.call = outer
+    return call[1] if call is not None else None
+
+
+def current_call():
+    """Returns the ``[name, pending record]`` of the API method running on the current thread, or None."""
+    return getattr(_state, "call", None)
+
+
+def emit(hooks, record):
+    """Passes a record to every hook. Failing hooks are logged and never break the request."""
+    for hook in list(hooks):
+        try:
+            hook(record)
+        except Exception:
+            log.exception("Request hook %r failed", hook)
+
+
+class _Aggregate(object):
+    __slots__ = ("count", "errors", "statuses", "buckets", "total", "max", "phases", "request_bytes",
+                 "response_bytes", "items")
+
+    def __init__(self, bucket_count):
+        self.count = 0
+        self.errors = {}
+        self.statuses = {}
+        self.buckets = [0] * (bucket_count + 1)
+        self.total = 0.0
+        self.max = 0.0
+        self.phases = {phase: 0.0 for phase in PHASES}
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.items = 0
+
+
+class HistogramCollector(object):
+    """
+    Request hook aggregating records in memory, per endpoint template and HTTP method.
+
+    Durations are counted in fixed buckets, from which :meth:`summary` estimates percentiles the way Prometheus'
+    ``histogram_quantile`` does.
+
+    Parameters
+    ----------
+    buckets : Iterable[float], optional
+        Upper bounds in seconds of the duration buckets.
+
+    Example
+    -------
+    ```python
+    collector = HistogramCollector()
+    api.add_hook(collector)
+    ...
+    for (endpoint, method), stats in collector.summary().items():
+        print(endpoint, method, stats["count"], stats["p90"])
+    ```
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._aggregates = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        elapsed = record.elapsed
+        with self._lock:
+            aggregate = self._aggregates.get((record.endpoint, record.method))
+            if aggregate is None:
+                aggregate = self._aggregates[(record.endpoint, record.method)] = _Aggregate(len(self.buckets))
+            aggregate.count += 1
+            aggregate.statuses[record.status] = aggregate.statuses.get(record.status, 0) + 1
+            if record.error is not None:
+                name = type(record.error).__name__
+                aggregate.errors[name] = aggregate.errors.get(name, 0) + 1
+            aggregate.buckets[bisect.bisect_left(self.buckets, elapsed)] += 1
+            aggregate.total += elapsed
+            aggregate.max = max(aggregate.max, elapsed)
+            for phase in PHASES:
+                aggregate.phases[phase] += getattr(record, phase) or 0.0
+            aggregate.request_bytes += record.request_bytes or 0
+            aggregate.response_bytes += record.response_bytes or 0
+            aggregate.items += record.items or 0
+
+    def reset(self):
+        with self._lock:
+            self._aggregates = {}
+
+    def _quantile(self, aggregate, q):
+        rank = q * aggregate.count
+        cumulative = 0
+        for index, count in enumerate(aggregate.buckets):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    return aggregate.max
+                lower = self.buckets[index - 1] if index else 0.0
+                return min(aggregate.max, lower + (self.buckets[index] - lower) * (rank - cumulative) / count)
+            cumulative += count
+        return 0.0
+
+    def summary(self):
+        """
+        Returns the statistics of each ``(endpoint, method)``.
+
+        Returns
+        -------
+        dict
+            ``count``, ``errors`` (per exception type), ``statuses``, ``mean``, ``p50``, ``p90``, ``p99`` and ``max``
+            durations in seconds, mean duration of each phase, total ``request_bytes``, ``response_bytes`` and
+            ``items``.
+        """
+        with self._lock:
+            summary = {}
+            for key, aggregate in self._aggregates.items():
+                summary[key] = {
+                    "count": aggregate.count,
+                    "errors": dict(aggregate.errors),
+                    "statuses": dict(aggregate.statuses),
+                    "mean": aggregate.total / aggregate.count,
+                    "p50": self._quantile(aggregate, 0.5),
+                    "p90": self._quantile(aggregate, 0.9),
+                    "p99": self._quantile(aggregate, 0.99),
+                    "max": aggregate.max,
+                    "phases": {phase: total / aggregate.count for phase, total in aggregate.phases.items()},
+                    "request_bytes": aggregate.request_bytes,
+                    "response_bytes": aggregate.response_bytes,
+                    "items": aggregate.items,
+                }
+            return summary
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class PrometheusCollector(HistogramCollector):
+    """
+    Request hook exposing the aggregated records in the Prometheus text exposition format.
+
+    Serve :meth:`exposition` from a ``/metrics`` endpoint, or write it to a file read by the node exporter's
+    textfile collector.
+
+    Parameters
+    ----------
+    namespace : str, optional
+        Prefix of the metric names.
+    buckets : Iterable[float], optional
+        Upper bounds in seconds of the duration buckets.
+    """
+
+    def __init__(self, namespace="wikirate4py", buckets=DEFAULT_BUCKETS):
+        super().__init__(buckets)
+        self.namespace = namespace
+        self._gauges = []
+
+    def add_gauge(self, name, help_text, value):
+        """
+        Adds a gauge to the exposition, read when it is generated.
+
+        Parameters
+        ----------
+        name : str
+            Name of the metric, after the namespace prefix.
+        help_text : str
+            Description of the metric.
+        value : callable
+            Returns the current value, e.g. ``lambda: limiter.limit`` for an
+            :class:`~wikirate4py.AdaptiveConcurrencyLimiter`.
+        """
+        self._gauges.append((name, help_text, value))
+
+    def exposition(self):
+        """Returns the collected metrics as Prometheus text (format version 0.0.4)."""
+        prefix = self.namespace
+        with self._lock:
+            aggregates = sorted(self._aggregates.items())
+            lines = [f"# HELP {prefix}_requests_total Requests sent, by endpoint, method and status.",
+                     f"# TYPE {prefix}_requests_total counter"]
+            for (endpoint, method), aggregate in aggregates:
+                for status, count in sorted(aggregate.statuses.items(), key=lambda item: str(item[0])):
+                    lines.append(f'{prefix}_requests_total{{endpoint="{_label(endpoint)}",method="{method}",'
+                                 f'status="{"" if status is None else status}"}} {count}')
+
+            lines += [f"# HELP {prefix}_request_errors_total Requests that raised, by exception type.",
+                      f"# TYPE {prefix}_request_errors_total counter"]
+            for (endpoint, method), aggregate in aggregates:
+                for error, count in sorted(aggregate.errors.items()):
+                    lines.append(f'{prefix}_request_errors_total{{endpoint="{_label(endpoint)}",method="{method}",'
+                                 f'error="{_label(error)}"}} {count}')
+
+            lines += [f"# HELP {prefix}_request_duration_seconds Duration of requests, from sending to model "
+                      f"construction.",
+                      f"# TYPE {prefix}_request_duration_seconds histogram"]
+            for (endpoint, method), aggregate in aggregates:
+                labels = f'endpoint="{_label(endpoint)}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), aggregate.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {aggregate.total!r}")
+                lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {aggregate.count}")
+
+            lines += [f"# HELP {prefix}_request_phase_seconds_total Time spent in each phase of requests.",
+                      f"# TYPE {prefix}_request_phase_seconds_total counter"]
+            for (endpoint, method), aggregate in aggregates:
+                for phase in PHASES:
+                    lines.append(f'{prefix}_request_phase_seconds_total{{endpoint="{_label(endpoint)}",'
+                                 f'method="{method}",phase="{phase}"}} {aggregate.phases[phase]!r}')
+
+            for name, attribute, help_text in (("request_bytes_total", "request_bytes", "Bytes of request bodies."),
+                                               ("response_bytes_total", "response_bytes",
+                                                "Bytes of response bodies."),
+                                               ("response_items_total", "items", "Items of responses.")):
+                lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} counter"]
+                for (endpoint, method), aggregate in aggregates:
+                    lines.append(f'{prefix}_{name}{{endpoint="{_label(endpoint)}",method="{method}"}} '
+                                 f'{getattr(aggregate, attribute)}')
+
+        for name, help_text, value in self._gauges:
+            try:
+                current = value()
+            except Exception:
+                log.exception("Gauge %s failed", name)
+                continue
+            lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} gauge",
+                      f"{prefix}_{name} {current!r}"]
+        return "\n".join(lines) + "\n"
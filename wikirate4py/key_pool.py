@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+
+from wikirate4py.exceptions import DeadlineExceededException, Wikirate4PyException
+
+log = logging.getLogger(__name__)
+
+# Seconds a throttled key rests when the response has no usable Retry-After header
+DEFAULT_COOLDOWN_SECONDS = 60.0
+
+
+def mask_key(key, index):
+    """Returns a label identifying the ``index``-th API key in logs and statistics without revealing it."""
+    return f"key {index} (...{key[-4:]})" if len(key) > 8 else f"key {index}"
+
+
+def retry_after_seconds(value, default=DEFAULT_COOLDOWN_SECONDS):
+    """Parses a ``Retry-After`` header given in seconds, falling back to ``default``."""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return default
+    return seconds if seconds >= 0 else default
+
+
+class _KeyState(object):
+    __slots__ = ("key", "label", "tokens", "updated_at", "cooldown_until", "in_flight", "requests", "throttled",
+                 "errors")
+
+    def __init__(self, key, label, tokens, now):
+        self.key = key
+        self.label = label
+        self.tokens = tokens
+        self.updated_at = now
+        self.cooldown_until = None
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+
+class ApiKeyPool(object):
+    """
+    Thread-safe pool of API keys sharing the requests of a client.
+
+    Every request is sent with the key that has the most budget left. With a ``rate``, each key has a token bucket
+    of its own and the budget is its number of tokens. Otherwise the key with the fewest requests running is picked.
+    A key answered with ``429 Too Many Requests`` rests for the ``Retry-After`` of the response, or ``cooldown``
+    seconds, while the other keys carry on. When no key is available, requests wait for the first one to be.
+
+    Parameters
+    ----------
+    keys : Iterable[str] or dict
+        The API keys, or labels mapped to the keys. Labels default to the position and last characters of the keys.
+    rate : float, optional
+        Sustained number of requests per second allowed for each key.
+    burst : int, optional
+        Number of requests a key may send back to back after an idle period.
+    cooldown : float, optional
+        Seconds a throttled key rests when the response does not say how long to wait.
+    clock : callable, optional
+        Monotonic clock returning seconds, for tests.
+
+    Example
+    -------
+    ```python
+    pool = ApiKeyPool(["key-1", "key-2", "key-3"], rate=10)
+    api = API(pool)
+    ...
+    print(pool.stats())
+    ```
+    """
+
+    def __init__(self, keys, rate=None, burst=1, cooldown=DEFAULT_COOLDOWN_SECONDS, clock=time.monotonic):
+        if rate is not None and rate <= 0:
+            raise Wikirate4PyException(f"Invalid rate limit: {rate}. It must be a positive number.")
+        if isinstance(keys, dict):
+            labelled = keys.items()
+        else:
+            labelled = [(mask_key(key, index), key) for index, key in enumerate(keys, 1)]
+        self.rate = float(rate) if rate is not None else None
+        self.burst = max(1, burst)
+        self.cooldown = cooldown
+        self._clock = clock
+        now = clock()
+        self._keys = {}
+        for label, key in labelled:
+            if not key:
+                raise Wikirate4PyException("Invalid API key: keys cannot be empty.")
+            if key not in self._keys:
+                self._keys[key] = _KeyState(key, label, float(self.burst), now)
+        if not self._keys:
+            raise Wikirate4PyException("An API key pool needs at least one key.")
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _refill(self, state, now):
+        if self.rate is not None:
+            state.tokens = min(self.burst, state.tokens + (now - state.updated_at) * self.rate)
+        state.updated_at = now
+        if state.cooldown_until is not None and state.cooldown_until <= now:
+            log.info("API key %s is back from its cooldown", state.label)
+            state.cooldown_until = None
+
+    def _wait_time(self, state, now):
+        if state.cooldown_until is not None:
+            return state.cooldown_until - now
+        if self.rate is not None and state.tokens < 1:
+            return (1 - state.tokens) / self.rate
+        return 0.0
+
+    def acquire(self, deadline=None):
+        """
+        Blocks until a key is available and returns it. Pass it to :meth:`release` once the request is done.
+
+        Parameters
+        ----------
+        deadline : Deadline, optional
+            Deadline of the request's operation.
+
+        Raises
+        ------
+        DeadlineExceededException
+            If no key becomes available before the deadline.
+        """
+        with self._condition:
+            while True:
+                now = self._clock()
+                for state in self._keys.values():
+                    self._refill(state, now)
+                available = [state for state in self._keys.values() if self._wait_time(state, now) <= 0]
+                if available:
+                    state = max(available, key=lambda state: (state.tokens, -state.in_flight, -state.requests))
+                    if self.rate is not None:
+                        state.tokens -= 1
+                    state.in_flight += 1
+                    state.requests += 1
+                    return state.key
+                wait = min(self._wait_time(state, now) for state in self._keys.values())
+                if deadline is not None:
+                    remaining = deadline.remaining()
+                    if remaining < wait:
+                        raise DeadlineExceededException(deadline.seconds)
+                self._condition.wait(wait)
+
+    def release(self, key, status=None, retry_after=None):
+        """
+        Registers the end of a request sent with a key from :meth:`acquire`.
+
+        Parameters
+        ----------
+        key : str
+            The key.
+        status : int, optional
+            HTTP status of the response. None if no response was received.
+        retry_after : str, optional
+            ``Retry-After`` header of the response.
+        """
+        with self._condition:
+            state = self._keys[key]
+            state.in_flight -= 1
+            if status is None or status >= 500:
+                state.errors += 1
+            elif status == 429:
+                state.throttled += 1
+                seconds = retry_after_seconds(retry_after, self.cooldown)
+                log.warning("API key %s was throttled, resting it for %ss", state.label, seconds)
+                state.cooldown_until = max(state.cooldown_until or 0.0, self._clock() + seconds)
+            self._condition.notify_all()
+
+    def cancel(self, key):
+        """Registers that a request given a key by :meth:`acquire` was not sent after all, refunding its token."""
+        with self._condition:
+            state = self._keys[key]
+            state.in_flight -= 1
+            state.requests -= 1
+            if self.rate is not None:
+                state.tokens = min(self.burst, state.tokens + 1)
+            self._condition.notify_all()
+
+    def stats(self):
+        """
+        Returns the usage of each key, by label.
+
+        Returns
+        -------
+        dict
+            ``requests`` sent, ``throttled`` and failed (``errors``) ones, requests running (``in_flight``), and
+            seconds left of the ``cooldown`` of the key.
+        """
+        with self._condition:
+            now = self._clock()
+            return {state.label: {"requests": state.requests, "throttled": state.throttled, "errors": state.errors,
+                                  "in_flight": state.in_flight,
+                                  "cooldown": max(0.0, state.cooldown_until - now)
+                                  if state.cooldown_until is not None else 0.0}
+                    for state in self._keys.values()}
@@ -0,0 +1,197 @@
+import threading
+import time
+
+from wikirate4py.concurrency import BATCH_LANE, RateLimiter, selected_lane
+from wikirate4py.exceptions import DeadlineExceededException, Wikirate4PyException
+from wikirate4py.timeouts import request_family
+
+INTERACTIVE = "interactive"
+BATCH = BATCH_LANE
+
+# Lane of requests not sent from a lane_scope, per endpoint family: single cards are user-facing lookups, listings
+# and uploads are bulk work
+DEFAULT_FAMILY_LANES = {"card": INTERACTIVE, "list": BATCH, "upload": BATCH}
+
+# Requests running at the same time across all lanes, the default pool_size of API
+DEFAULT_MAX_IN_FLIGHT = 32
+
+
+class Lane(object):
+    """
+    A class of traffic with its own share of the connections and of the request rate of a client.
+
+    Parameters
+    ----------
+    name : str
+        Name used to select the lane.
+    priority : int, optional
+        Lanes with lower values get the shared connection slots first.
+    reserved : int, optional
+        Connection slots only this lane may use, so it never waits behind other lanes for them.
+    limit : int, optional
+        Maximum number of requests of this lane running at the same time.
+    share : float, optional
+        Share of the ``rate`` of :class:`PriorityLanes` this lane may send, between 0 and 1.
+    """
+    __slots__ = ("name", "priority", "reserved", "limit", "share", "rate_limiter", "in_flight", "waiting",
+                 "requests", "waited", "max_wait")
+
+    def __init__(self, name, priority=0, reserved=0, limit=None, share=None):
+        if share is not None and not 0 < share <= 1:
+            raise Wikirate4PyException(f"Invalid rate share of lane {name}: {share}. It must be between 0 and 1.")
+        self.name = name
+        self.priority = priority
+        self.reserved = max(0, reserved)
+        self.limit = limit
+        self.share = share
+        self.rate_limiter = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+    def __repr__(self):
+        return f"Lane({self.name!r}, priority={self.priority}, reserved={self.reserved}, limit={self.limit}, " \
+               f"share={self.share})"
+
+
+def default_lanes(max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+    """Returns an ``interactive`` lane with a quarter of the slots reserved and first pick of the others, and a
+    ``batch`` lane, each allowed half of the rate."""
+    return [Lane(INTERACTIVE, priority=0, reserved=max(1, max_in_flight // 4), share=0.5),
+            Lane(BATCH, priority=1, share=0.5)]
+
+
+class PriorityLanes(object):
+    """
+    Thread-safe scheduler sharing the connections and request rate of a client between lanes of traffic.
+
+    Each request runs in a lane. The lane is chosen with the ``lane`` argument of the API methods or an enclosing
+    :func:`lane_scope`; otherwise it depends on the endpoint family of the request (``card``, ``list`` or
+    ``upload``). By default, single-card lookups run in the ``interactive`` lane, while listings, uploads and the
+    batch methods run in the ``batch`` lane.
+
+    At most ``max_in_flight`` requests run at the same time. A lane may always use its ``reserved`` slots. The other
+    slots are shared, and a free one goes to the waiting lane with the lowest priority value, so interactive
+    requests never queue behind more than the batch requests already running. With a ``rate``, each lane is paced to
+    its ``share`` of it.
+
+    Parameters
+    ----------
+    lanes : Iterable[Lane], optional
+        The lanes. Defaults to :func:`default_lanes`.
+    max_in_flight : int, optional
+        Maximum number of requests running at the same time. Keep it within the ``pool_size`` of the client.
+    rate : float, optional
+        Maximum number of requests started per second, split between the lanes by their ``share``.
+    families : dict, optional
+        Overrides of ``DEFAULT_FAMILY_LANES``, endpoint family to lane name.
+
+    Example
+    -------
+    ```python
+    api = API(token, lanes=PriorityLanes(max_in_flight=32, rate=20))
+    company = api.get_company("Puma")  # interactive lane
+    answers = api.get_answers(metric_name="Address", metric_designer="Clean Clothes Campaign",
+                              lane="batch")
+    ```
+    """
+
+    def __init__(self, lanes=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT, rate=None, families=None, default=BATCH):
+        lanes = list(lanes) if lanes is not None else default_lanes(max_in_flight)
+        self.lanes = {lane.name: lane for lane in lanes}
+        self.max_in_flight = max_in_flight
+        self.families = dict(DEFAULT_FAMILY_LANES, **(families or {}))
+        self.default = default
+        for name in list(self.families.values()) + [default]:
+            if name not in self.lanes:
+                raise Wikirate4PyException(f"Unknown lane: {name}. Expected one of: {', '.join(self.lanes)}.")
+        self.shared = max_in_flight - sum(lane.reserved for lane in lanes)
+        if self.shared < 0:
+            raise Wikirate4PyException(f"The lanes reserve more than the {max_in_flight} slots available.")
+        if rate is not None:
+            for lane in lanes:
+                if lane.share is not None:
+                    lane.rate_limiter = RateLimiter(rate * lane.share)
+        self._condition = threading.Condition()
+
+    def lane_of(self, path, files=None):
+        """Returns the lane of a request."""
+        name = selected_lane() or self.families.get(request_family(path, files)) or self.default
+        lane = self.lanes.get(name)
+        if lane is None:
+            raise Wikirate4PyException(f"Unknown lane: {name}. Expected one of: {', '.join(self.lanes)}.")
+        return lane
+
+    def _shared_in_use(self):
+        return sum(max(0, lane.in_flight - lane.reserved) for lane in self.lanes.values())
+
+    def _can_start(self, lane):
+        if lane.limit is not None and lane.in_flight >= lane.limit:
+            return False
+        if lane.in_flight < lane.reserved:
+            return True
+        if self._shared_in_use() >= self.shared:
+            return False
+        # Shared slots go to the most urgent lane waiting for one
+        return not any(other.waiting and other.priority < lane.priority and
+                       (other.limit is None or other.in_flight < other.limit)
+                       for other in self.lanes.values())
+
+    def acquire(self, path, files=None, deadline=None):
+        """
+        Blocks until the request may start in its lane, and returns the lane. Pass it to :meth:`release` once the
+        request is done.
+
+        Raises
+        ------
+        DeadlineExceededException
+            If the request cannot start before ``deadline``.
+        """
+        lane = self.lane_of(path, files)
+        if lane.rate_limiter is not None:
+            lane.rate_limiter.acquire(deadline)
+        started = time.monotonic()
+        with self._condition:
+            lane.waiting += 1
+            try:
+                while not self._can_start(lane):
+                    wait = None
+                    if deadline is not None:
+                        wait = deadline.remaining()
+                        if wait <= 0:
+                            raise DeadlineExceededException(deadline.seconds)
+                    self._condition.wait(wait)
+            finally:
+                lane.waiting -= 1
+                # A lane leaving the queue may let lower priority lanes take shared slots
+                self._condition.notify_all()
+            lane.in_flight += 1
+            lane.requests += 1
+            waited = time.monotonic() - started
+            lane.waited += waited
+            lane.max_wait = max(lane.max_wait, waited)
+        return lane
+
+    def release(self, lane):
+        """Registers the end of a request started by :meth:`acquire`."""
+        with self._condition:
+            lane.in_flight -= 1
+            self._condition.notify_all()
+
+    def stats(self):
+        """
+        Returns the activity of each lane, by name.
+
+        Returns
+        -------
+        dict
+            Requests running (``in_flight``) and ``waiting``, ``requests`` started, and their ``mean_wait`` and
+            ``max_wait`` for a slot in seconds.
+        """
+        with self._condition:
+            return {lane.name: {"in_flight": lane.in_flight, "waiting": lane.waiting, "requests": lane.requests,
+                                "mean_wait": lane.waited / lane.requests if lane.requests else 0.0,
+                                "max_wait": lane.max_wait}
+                    for lane in self.lanes.values()}
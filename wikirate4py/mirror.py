@@ -0,0 +1,416 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from wikirate4py.cursor import Cursor
+from wikirate4py.exceptions import Wikirate4PyException
+from wikirate4py.models import CompanyItem, MetricItem, TopicItem, SourceItem, AnswerItem, RelationshipItem
+from wikirate4py.name_cache import card_key
+
+log = logging.getLogger(__name__)
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Widest `updated` filter covering the time since the last sync, with a day of margin for clock and timezone skew
+UPDATED_PERIODS = (("week", 6 * DAY_SECONDS), ("month", 27 * DAY_SECONDS))
+
+
+def _year(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _metric_name(data):
+    return "+".join(data["name"].split("+")[:2])
+
+
+class _Table(object):
+    """Describes how one entity type is listed from the API and stored in the mirror."""
+    __slots__ = ("name", "list_method", "model", "columns", "indexes", "incremental")
+
+    def __init__(self, name, list_method, model, columns=None, indexes=(), incremental=False):
+        self.name = name
+        self.list_method = list_method
+        self.model = model
+        self.columns = columns or {}
+        self.indexes = indexes
+        self.incremental = incremental
+
+    def row(self, data):
+        values = [int(data["id"]), data["name"], card_key(data["name"])]
+        values += [extract(data) for extract in self.columns.values()]
+        values.append(json.dumps(data))
+        return values
+
+
+TABLES = {table.name: table for table in (
+    _Table("companies", "get_companies", CompanyItem),
+    _Table("metrics", "get_metrics", MetricItem,
+           columns={"designer_key": lambda data: card_key(data.get("designer") or "")},
+           indexes=("designer_key",)),
+    _Table("topics", "get_topics", TopicItem),
+    _Table("sources", "get_sources", SourceItem,
+           columns={"year": lambda data: _year(data.get("year"))},
+           indexes=("year",)),
+    _Table("answers", "get_answers", AnswerItem,
+           columns={"metric_key": lambda data: card_key(data["metric"]),
+                    "company_key": lambda data: card_key(data["company"]),
+                    "year": lambda data: _year(data.get("year")),
+                    "value": lambda data: data.get("value")},
+           indexes=("metric_key, year", "company_key, year"),
+           incremental=True),
+    _Table("relationships", "get_relationships", RelationshipItem,
+           columns={"metric_key": lambda data: card_key(_metric_name(data)),
+                    "metric_id": lambda data: data.get("metric_id"),
+                    "subject_company_id": lambda data: data.get("subject_company_id"),
+                    "object_company_id": lambda data: data.get("object_company_id"),
+                    "year": lambda data: _year(data.get("year"))},
+           indexes=("metric_key, year", "metric_id", "subject_company_id", "object_company_id"),
+           incremental=True),
+)}
+
+
+class SyncResult(object):
+    """Summary of a :meth:`Mirror.sync` run."""
+    __slots__ = ("entity", "scope", "count", "updated", "pruned", "elapsed")
+
+    def __init__(self, entity, scope, count, updated=None, pruned=0, elapsed=0.0):
+        self.entity = entity
+        self.scope = scope
+        self.count = count
+        self.updated = updated
+        self.pruned = pruned
+        self.elapsed = elapsed
+
+    def json(self):
+        return {"entity": self.entity, "scope": self.scope, "count": self.count, "updated": self.updated,
+                "pruned": self.pruned, "elapsed": self.elapsed}
+
+    def __repr__(self):
+        return str(self.json())
+
+
+class Mirror(object):
+    """
+    Local SQLite mirror of Wikirate companies, metrics, topics, sources, answers and relationships.
+
+    :meth:`sync` pages through the list endpoints of the API and upserts the listed items. Answers and
+    relationships are synced incrementally: once a scope has been synced, later syncs only request the items
+    ``updated`` since then. The ``get_*`` read methods mirror the ones of :class:`~wikirate4py.API` and return the
+    same item models, served from the local database.
+
+    Parameters
+    ----------
+    api : API, optional
+        The client used to sync the mirror. Not needed to only read from an existing database.
+    path : str, optional
+        SQLite database file. Defaults to an in-memory database.
+
+    Example
+    -------
+    ```python
+    mirror = Mirror(api, "wikirate.sqlite")
+    mirror.sync("answers", metric_name="Company Report Available", metric_designer="Core")
+    answers = mirror.get_answers(metric_name="Company Report Available", metric_designer="Core", year=2023)
+    ```
+    """
+
+    def __init__(self, api=None, path=":memory:"):
+        self.api = api
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._connection:
+            for table in TABLES.values():
+                columns = "".join(f", {column}" for column in table.columns)
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table.name} "
+                    f"(id INTEGER PRIMARY KEY, name TEXT, key TEXT{columns}, data TEXT)")
+                for index in ("key",) + table.indexes:
+                    index_name = f"{table.name}_{index.replace(', ', '_')}"
+                    self._connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table.name} ({index})")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state "
+                "(scope TEXT PRIMARY KEY, entity TEXT, started_at REAL, finished_at REAL, count INTEGER)")
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _table(entity):
+        if entity not in TABLES:
+            raise Wikirate4PyException(f"Invalid entity type: {entity}. Expected one of: {', '.join(TABLES)}.")
+        return TABLES[entity]
+
+    @staticmethod
+    def _scope(entity, filters):
+        return f"{entity}:{json.dumps(filters, sort_keys=True, default=str)}"
+
+    def _upsert(self, table, items):
+        columns = ", ".join(("id", "name", "key") + tuple(table.columns) + ("data",))
+        placeholders = ", ".join("?" * (len(table.columns) + 4))
+        rows = [table.row(item.raw) for item in items]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {table.name} ({columns}) VALUES ({placeholders})", rows)
+
+    def last_synced(self, entity, **filters):
+        """Returns the time (in seconds since the epoch) the given sync scope was last synced, or None."""
+        with self._lock:
+            row = self._connection.execute("SELECT started_at FROM sync_state WHERE scope = ?",
+                                           (self._scope(entity, filters),)).fetchone()
+        return row[0] if row else None
+
+    def sync(self, entity, full=False, per_page=200, **filters):
+        """
+        Syncs one entity type, optionally restricted by the filters of its API list method.
+
+        Each entity type and filter combination is a sync scope with its own watermark.
+
+        Parameters
+        ----------
+        entity : str
+            One of ``companies``, ``metrics``, ``topics``, ``sources``, ``answers`` and ``relationships``.
+        full : bool, optional
+            Re-page the whole scope even if an incremental sync is possible. Full syncs of unfiltered scopes also
+            remove the items that no longer exist.
+        per_page : int, optional
+            Number of items requested per page.
+        filters
+            Arguments of the matching API list method, e.g. ``metric_name`` and ``metric_designer`` for answers.
+
+        Returns
+        -------
+        SyncResult
+            The number of items synced and the ``updated`` period requested, if any.
+        """
+        if self.api is None:
+            raise Wikirate4PyException("This mirror has no API client to sync from.")
+        table = self._table(entity)
+        scope = self._scope(entity, filters)
+        started_at = time.time()
+
+        updated = None
+        last_synced = None if full or not table.incremental else self.last_synced(entity, **filters)
+        if last_synced is not None:
+            elapsed = started_at - last_synced
+            updated = next((period for period, seconds in UPDATED_PERIODS if elapsed <= seconds), None)
+
+        kwargs = dict(filters, updated=updated) if updated else filters
+        cursor = Cursor(getattr(self.api, table.list_method), per_page=per_page, response_format="model",
+                        **kwargs)
+        seen = []
+        while cursor.has_next():
+            page = cursor.next()
+            self._upsert(table, page)
+            seen.extend(int(item.id) for item in page)
+
+        pruned = 0
+        if updated is None and not filters:
+            pruned = self._prune(table, seen)
+
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                                     (scope, entity, started_at, time.time(), len(seen)))
+        result = SyncResult(entity, scope, len(seen), updated=updated, pruned=pruned,
+                            elapsed=time.time() - started_at)
+        log.info("Synced %d %s (%s)", len(seen), entity, f"updated: {updated}" if updated else "full")
+        return result
+
+    def _prune(self, table, seen):
+        with self._lock, self._connection:
+            self._connection.execute("CREATE TEMP TABLE IF NOT EXISTS seen_ids (id INTEGER PRIMARY KEY)")
+            self._connection.execute("DELETE FROM seen_ids")
+            self._connection.executemany("INSERT OR IGNORE INTO seen_ids VALUES (?)", [(i,) for i in seen])
+            deleted = self._connection.execute(
+                f"DELETE FROM {table.name} WHERE id NOT IN (SELECT id FROM seen_ids)").rowcount
+            self._connection.execute("DELETE FROM seen_ids")
+        return deleted
+
+    def sync_all(self, entities=tuple(TABLES), **filters):
+        """Syncs several entity types with the same filters and returns their :class:`SyncResult` objects."""
+        return [self.sync(entity, **filters) for entity in entities]
+
+    def remove(self, entity, identifier):
+        """Removes an item, e.g. after deleting it on Wikirate."""
+        table = self._table(entity)
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {table.name} WHERE id = ?", (int(identifier),))
+
+    def count(self, entity):
+        table = self._table(entity)
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM {table.name}").fetchone()[0]
+
+    def _select(self, entity, conditions=(), offset=0, limit=20):
+        table = self._table(entity)
+        where = " AND ".join(condition for condition, _ in conditions) or "1"
+        params = []
+        for _, param in conditions:
+            params.extend(param if isinstance(param, tuple) else (param,))
+        query = f"SELECT data FROM {table.name} WHERE {where} ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [table.model(json.loads(data)) for data, in rows]
+
+    def _get(self, entity, identifier):
+        if isinstance(identifier, int) or str(identifier).lstrip("~").isdigit():
+            condition = ("id = ?", int(str(identifier).lstrip("~")))
+        else:
+            condition = ("key = ?", card_key(identifier))
+        items = self._select(entity, [condition], limit=1)
+        return items[0] if items else None
+
+    @staticmethod
+    def _name_condition(name):
+        escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "name LIKE ? ESCAPE '\\'", f"%{escaped}%"
+
+    def _company_key(self, company):
+        if isinstance(company, int) or str(company).lstrip("~").isdigit():
+            item = self._get("companies", company)
+            return card_key(item.name) if item is not None else None
+        return card_key(company)
+
+    def _metric_key(self, identifier):
+        """Returns the name key of a metric given by name or id, or None if it is not a known metric."""
+        if "+" in str(identifier):
+            return card_key(identifier)
+        metric = self._get("metrics", identifier)
+        return card_key(metric.raw["name"]) if metric is not None else None
+
+    def get_company(self, identifier):
+        """Returns the mirrored company with the given id or name, or None."""
+        return self._get("companies", identifier)
+
+    def get_companies(self, name=None, offset=0, limit=20):
+        """Returns mirrored companies, optionally those whose name contains ``name``."""
+        return self._select("companies", [self._name_condition(name)] if name else [], offset, limit)
+
+    def get_topic(self, identifier):
+        """Returns the mirrored topic with the given id or name, or None."""
+        return self._get("topics", identifier)
+
+    def get_topics(self, name=None, offset=0, limit=20):
+        """Returns mirrored topics, optionally those whose name contains ``name``."""
+        return self._select("topics", [self._name_condition(name)] if name else [], offset, limit)
+
+    def get_metric(self, identifier=None, metric_name=None, metric_designer=None):
+        """Returns the mirrored metric with the given id or ``designer+name``, or None."""
+        if metric_name is not None and metric_designer is not None:
+            identifier = f"{metric_designer}+{metric_name}"
+        return self._get("metrics", identifier)
+
+    def get_metrics(self, name=None, designer=None, offset=0, limit=20):
+        """Returns mirrored metrics, optionally filtered by partial name and by designer."""
+        conditions = [self._name_condition(name)] if name else []
+        if designer is not None:
+            conditions.append(("designer_key = ?", card_key(designer)))
+        return self._select("metrics", conditions, offset, limit)
+
+    def get_source(self, identifier):
+        """Returns the mirrored source with the given id or name, or None."""
+        return self._get("sources", identifier)
+
+    def get_sources(self, name=None, year=None, offset=0, limit=20):
+        """Returns mirrored sources, optionally filtered by partial name and by year."""
+        conditions = [self._name_condition(name)] if name else []
+        if year is not None:
+            conditions.append(("year = ?", int(year)))
+        return self._select("sources", conditions, offset, limit)
+
+    def get_answer(self, identifier):
+        """Returns the mirrored answer with the given id or name, or None."""
+        return self._get("answers", identifier)
+
+    def get_answers(self, metric_name=None, metric_designer=None, identifier=None, company=None, year=None,
+                    value=None, offset=0, limit=20):
+        """
+        Returns mirrored answers, filtered like :meth:`~wikirate4py.API.get_answers`.
+
+        Parameters
+        ----------
+        metric_name, metric_designer : str, optional
+            Name and designer of the metric of the answers.
+        identifier : str or int, optional
+            A metric (``designer+name`` or id) or, otherwise, a company (name or id) the answers belong to. Metric
+            ids are only recognized once metrics have been synced.
+        company : str or int, optional
+            Name or id of the company of the answers.
+        year : int, optional
+            Year of the answers.
+        value : str, optional
+            Value of the answers.
+        offset, limit : int, optional
+            Pagination of the results, ordered by answer id. A limit of None returns all matches.
+
+        Returns
+        -------
+        List[AnswerItem]
+        """
+        conditions = []
+        if metric_name is not None and metric_designer is not None:
+            conditions.append(("metric_key = ?", card_key(f"{metric_designer}+{metric_name}")))
+        elif identifier is not None:
+            metric_key = self._metric_key(identifier)
+            if metric_key is not None:
+                conditions.append(("metric_key = ?", metric_key))
+            else:
+                conditions.append(("company_key = ?", self._company_key(identifier)))
+        if company is not None:
+            conditions.append(("company_key = ?", self._company_key(company)))
+        if year is not None:
+            conditions.append(("year = ?", int(year)))
+        if value is not None:
+            conditions.append(("value = ?", str(value)))
+        return self._select("answers", conditions, offset, limit)
+
+    def get_relationship(self, identifier):
+        """Returns the mirrored relationship with the given id or name, or None."""
+        return self._get("relationships", identifier)
+
+    def get_relationships(self, metric_name=None, metric_designer=None, identifier=None, subject_company_id=None,
+                          object_company_id=None, year=None, offset=0, limit=20):
+        """
+        Returns mirrored relationships, filtered like :meth:`~wikirate4py.API.get_relationships`.
+
+        Returns
+        -------
+        List[RelationshipItem]
+        """
+        conditions = []
+        if metric_name is not None and metric_designer is not None:
+            identifier = f"{metric_designer}+{metric_name}"
+        if identifier is not None:
+            metric_key = self._metric_key(identifier)
+            if metric_key is not None:
+                # Listings of a metric may name the answers after its inverse metric, so ids are matched as well
+                metric = self._get("metrics", identifier)
+                conditions.append(("(metric_key = ? OR metric_id = ?)",
+                                   (metric_key, metric.id if metric is not None else None)))
+            else:
+                company = self._get("companies", identifier)
+                company_id = int(company.id) if company is not None else None
+                conditions.append(("(subject_company_id = ? OR object_company_id = ?)", (company_id, company_id)))
+        for column, value in (("subject_company_id", subject_company_id), ("object_company_id", object_company_id)):
+            if value is not None:
+                conditions.append((f"{column} = ?", int(value)))
+        if year is not None:
+            conditions.append(("year = ?", int(year)))
+        return self._select("relationships", conditions, offset, limit)
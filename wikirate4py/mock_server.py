@@ -0,0 +1,661 @@
+"""
+Local stand-in for the Wikirate API, serving synthetic cards over HTTP for load and concurrency testing.
+
+Run it standalone with ``python -m wikirate4py.mock_server --port 8080 --companies 1000``.
+"""
+import argparse
+import email.parser
+import email.policy
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlsplit, unquote, parse_qs
+
+from wikirate4py.exceptions import Wikirate4PyException
+from wikirate4py.name_cache import card_key
+
+log = logging.getLogger(__name__)
+
+# Card type ids checked by the card models
+TYPE_IDS = {
+    "Company": 651,
+    "Metric": 43576,
+    "Topic": 1010,
+    "Source": 629,
+    "Answer": 43678,
+    "Relationship": 2534606,
+}
+
+# Card type listed by each list endpoint, e.g. /Companies.json or /<metric>+Answers.json
+LIST_TYPES = {
+    "Companies": "Company",
+    "Metrics": "Metric",
+    "Topics": "Topic",
+    "Sources": "Source",
+    "Answers": "Answer",
+    "Relationships": "Relationship",
+}
+
+# Fields that full cards wrap as subcards ({"content": ...}) while list items carry them inline
+SUBCARD_FIELDS = {
+    "Company": ("headquarters", "alias", "website", "open_supply_id", "wikipedia", "open_corporates_id",
+                "legal_entity_identifier", "international_securities_identification_number",
+                "sec_central_index_key", "uk_company_number", "australian_business_number"),
+    "Metric": ("question", "metric_type", "about", "methodology", "value_type", "value_options", "report_type",
+               "research_policy", "unit", "range", "hybrid", "topics", "topic_frameworks", "scores", "formula"),
+    "Source": ("title", "description", "file", "link", "year", "report_type", "company", "metric"),
+}
+
+# Subcards of create and update requests, e.g. card[subcards][+:value], and the card field they set
+SUBCARD_ALIASES = {
+    ":value": "value",
+    ":source": "sources",
+    ":discussion": "comments",
+    "*metric_type": "metric_type",
+    "Company": "companies",
+}
+
+COUNTRIES = ("Germany", "United States", "China", "Bangladesh", "India", "Vietnam", "Turkey", "United Kingdom")
+
+RELATIONSHIP_METRIC = "Commons+Supplied By"
+DESIGNER = "Mock Designer"
+TOPIC_FRAMEWORK = "Mock Topics"
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+ERROR_STATUSES = (500, 502, 503)
+
+
+def _list(value):
+    if value is None or value == "":
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class MockWikirate(object):
+    """
+    Thread-safe in-memory card store behind :class:`MockWikirateServer`.
+
+    Synthetic companies, metrics, topics, sources, answers (one per metric, company and year) and supply chain
+    relationships are generated up front from ``seed``, so runs with the same parameters serve the same data.
+    Answers are generated eagerly: ``companies * metrics * years`` of them are kept in memory.
+
+    Parameters
+    ----------
+    companies : int, optional
+        Number of companies.
+    metrics : int, optional
+        Number of researched metrics, each with an answer per company and year.
+    years : int, optional
+        Number of consecutive years answered, ending with ``last_year``.
+    topics : int, optional
+        Number of topics.
+    sources : int, optional
+        Number of sources cited by the answers. Defaults to one per company.
+    suppliers : int, optional
+        Number of ``Commons+Supplied By`` relationships per company, in the latest year.
+    last_year : int, optional
+        Latest year answered.
+    seed : int, optional
+        Seed of the generated values.
+    """
+
+    def __init__(self, companies=100, metrics=10, years=3, topics=5, sources=None, suppliers=3, last_year=2024,
+                 seed=0, base_url="http://127.0.0.1/"):
+        self.base_url = base_url
+        self.cards = {}
+        self._names = {}
+        self._lists = {card_type: [] for card_type in LIST_TYPES.values()}
+        # Answers and relationships of each metric and company: (card type, scope card id) to card ids
+        self._scoped = {}
+        self._next_id = 1
+        self._lock = threading.RLock()
+        self._generate(companies, metrics, years, topics, companies if sources is None else sources, suppliers,
+                       last_year, random.Random(seed))
+
+    def __len__(self):
+        return len(self.cards)
+
+    def count(self, card_type):
+        return len(self._lists.get(card_type, ()))
+
+    def _generate(self, companies, metrics, years, topics, sources, suppliers, last_year, rng):
+        topic_names = [self._add("Topic", f"{TOPIC_FRAMEWORK}+Topic {i + 1}", title=f"Topic {i + 1}",
+                                 framework=TOPIC_FRAMEWORK, family=f"Topic {i + 1}", parent=TOPIC_FRAMEWORK,
+                                 children=[])["name"] for i in range(topics)]
+        company_cards = [self._add("Company", f"Company {i + 1:05d}", headquarters=[COUNTRIES[i % len(COUNTRIES)]],
+                                   alias=[], website=f"https://company-{i + 1}.example.com/")
+                         for i in range(companies)]
+        source_names = [self._add("Source", f"Source-{i + 1:09d}", title=f"Report {i + 1}",
+                                  link=f"https://reports.example.com/{i + 1}.pdf", year=[str(last_year)],
+                                  report_type=["Sustainability Report"])["name"] for i in range(sources)]
+        metric_cards = [self._add("Metric", f"{DESIGNER}+Metric {i + 1:03d}", designer=DESIGNER,
+                                  title=f"Metric {i + 1:03d}", question=f"What is the value of metric {i + 1}?",
+                                  metric_type="Researched", value_type="Number", value_options=[],
+                                  research_policy="Community Assessed", unit="tonnes", about="", methodology="",
+                                  topics=[topic_names[i % len(topic_names)]] if topic_names else [])
+                        for i in range(metrics)]
+        for metric in metric_cards:
+            for index, company in enumerate(company_cards):
+                for year in range(last_year - years + 1, last_year + 1):
+                    self._add_answer(metric, company, year, str(rng.randint(0, 100000)),
+                                     [source_names[index % len(source_names)]] if source_names else [])
+        if suppliers and companies > 1:
+            designer, title = RELATIONSHIP_METRIC.split("+")
+            metric = self._add("Metric", RELATIONSHIP_METRIC, designer=designer, title=title,
+                               metric_type="Relationship", value_type="Category", value_options=["Tier 1 Supplier"],
+                               about="", methodology="")
+            for index, company in enumerate(company_cards):
+                targets = {(index + rng.randint(1, companies - 1)) % companies for _ in range(suppliers)}
+                for target in sorted(targets):
+                    self._add_relationship(metric, company, company_cards[target], last_year, "Tier 1 Supplier",
+                                           source_names[:1])
+
+    def _url(self, name):
+        return self.base_url + name.replace(" ", "_") + ".json"
+
+    def _add(self, card_type, name, **fields):
+        if card_key(name) in self._names:
+            raise Wikirate4PyException(f"Card already exists: {name}")
+        card = dict(fields, id=self._next_id, name=name, type=card_type, url=self._url(name))
+        self._next_id += 1
+        self.cards[card["id"]] = card
+        self._names[card_key(name)] = card["id"]
+        if card_type in self._lists:
+            self._lists[card_type].append(card["id"])
+        return card
+
+    def _add_scoped(self, card, scopes):
+        for scope in scopes:
+            self._scoped.setdefault((card["type"], scope["id"]), []).append(card["id"])
+        card["scopes"] = [scope["id"] for scope in scopes]
+        return card
+
+    def _add_answer(self, metric, company, year, value, sources, comments=None):
+        name = f"{metric['name']}+{company['name']}+{year}"
+        answer = self._add("Answer", name, metric=metric["name"], company=company["name"], year=int(year),
+                           value=value, sources=sources, comments=comments,
+                           answer_url=self._url(f"{metric['name']}+{company['name']}"))
+        return self._add_scoped(answer, (metric, company))
+
+    def _add_relationship(self, metric, subject, target, year, value, sources, comments=None):
+        name = f"{metric['name']}+{subject['name']}+{year}+{target['name']}"
+        relationship = self._add("Relationship", name, metric_id=metric["id"], subject_company_id=subject["id"],
+                                 subject_company=subject["name"], object_company_id=target["id"],
+                                 object_company=target["name"], year=int(year), value=value, sources=sources,
+                                 comments=comments)
+        return self._add_scoped(relationship, (metric, subject, target))
+
+    def resolve(self, identifier):
+        """Returns the card addressed by ``~<id>`` or by name, or None."""
+        identifier = str(identifier).strip()
+        if identifier.startswith("~") and identifier[1:].isdigit():
+            return self.cards.get(int(identifier[1:]))
+        card_id = self._names.get(card_key(identifier))
+        if card_id is None and "+" in identifier:
+            # Compound names may address their parts by id, e.g. ~<metric id>+~<company id>+2024
+            parts = [self.resolve(part) if part.startswith("~") else None for part in identifier.split("+")]
+            if any(parts):
+                name = "+".join(part["name"] if part is not None else original
+                                for part, original in zip(parts, identifier.split("+")))
+                card_id = self._names.get(card_key(name))
+        return self.cards.get(card_id) if card_id is not None else None
+
+    def _resolve_parts(self, parts, count):
+        """Resolves the first card of ``count`` or fewer ``+``-separated name parts, longest names first."""
+        for size in range(min(count, len(parts)), 0, -1):
+            card = self.resolve("+".join(parts[:size]))
+            if card is not None:
+                return card, parts[size:]
+        return None, parts
+
+    # Reads
+
+    def card_payload(self, card):
+        """Returns a card in the form of the single card endpoints."""
+        card_type = card["type"]
+        payload = dict(self.item_payload(card), type={"id": TYPE_IDS.get(card_type), "name": card_type, "type": "Cardtype"},
+                       html_url=card["url"][:-len(".json")], items=[], links=[], ancestors=[])
+        for field in SUBCARD_FIELDS.get(card_type, ()):
+            payload[field] = {"name": f"{card['name']}+{field}", "content": card.get(field)}
+        if card_type == "Metric":
+            payload["value_options"] = {"content": card.get("value_options") or []}
+        elif card_type in ("Answer", "Relationship"):
+            payload["sources"] = [self.item_payload(source) for source in
+                                  filter(None, (self.resolve(name) for name in card.get("sources") or []))]
+            if card_type == "Relationship":
+                payload["subject_company"] = {"id": card["subject_company_id"], "name": card["subject_company"]}
+                payload["object_company"] = {"id": card["object_company_id"], "name": card["object_company"]}
+                payload["checked_by"] = {"name": f"{card['name']}+checked_by", "content": []}
+        return payload
+
+    def item_payload(self, card):
+        """Returns a card in the form of the items of list endpoints."""
+        item = {key: value for key, value in card.items() if key != "scopes"}
+        if card["type"] == "Relationship":
+            item["sources"] = [{"name": name} for name in card.get("sources") or []]
+        return item
+
+    def get(self, identifier):
+        with self._lock:
+            card = self.resolve(identifier)
+            return self.card_payload(card) if card is not None else None
+
+    def list(self, list_type, scope=None, offset=0, limit=DEFAULT_PAGE_SIZE, filters=None):
+        """
+        Returns a page of the cards of a list endpoint.
+
+        Parameters
+        ----------
+        list_type : str
+            Plural card type of the endpoint, e.g. ``Answers``.
+        scope : str, optional
+            Card the list belongs to, e.g. the metric or company of ``<card>+Answers``.
+        offset, limit : int, optional
+            Pagination of the list.
+        filters : dict, optional
+            ``year``, ``name``, ``company``, ``subject_company_id`` and ``object_company_id`` filters, each a list
+            of accepted values. Other filters are ignored.
+
+        Returns
+        -------
+        dict or None
+            The list payload, or None if the scope card does not exist.
+        """
+        card_type = LIST_TYPES[list_type]
+        with self._lock:
+            predicates = [self._filter(name, values) for name, values in (filters or {}).items()]
+            card_ids = self._lists[card_type]
+            if scope is not None:
+                scope_card = self.resolve(scope)
+                if scope_card is None:
+                    return None
+                card_ids = self._scoped.get((card_type, scope_card["id"]), ())
+            matches = (self.cards[card_id] for card_id in card_ids)
+            page, total = [], 0
+            for card in matches:
+                if all(predicate(card) for predicate in predicates if predicate is not None):
+                    if offset <= total < offset + limit:
+                        page.append(self.item_payload(card))
+                    total += 1
+        name = f"{scope}+{list_type}" if scope is not None else list_type
+        payload = {"id": None, "name": name, "type": {"id": 30, "name": "Search", "type": "Cardtype"},
+                   "url": self._url(name), "items": page, "links": [], "ancestors": [], "paging": {}}
+        if offset + limit < total:
+            payload["paging"]["next"] = f"{self._url(name)}?limit={limit}&offset={offset + limit}"
+        return payload
+
+    def _filter(self, name, values):
+        if name == "year":
+            years = {int(value) for value in values if str(value).isdigit()}
+            return lambda card: card.get("year") in years
+        if name == "name":
+            keywords = [str(value).casefold() for value in values]
+            return lambda card: any(keyword in card["name"].casefold() for keyword in keywords)
+        if name == "company":
+            companies = {card["name"] for card in filter(None, (self.resolve(value) for value in values))}
+            return lambda card: card.get("company") in companies
+        if name in ("subject_company_id", "object_company_id"):
+            ids = {int(str(value).lstrip("~")) for value in values if str(value).lstrip("~").isdigit()}
+            return lambda card: card.get(name) in ids
+        return None
+
+    # Writes
+
+    def create(self, params):
+        """Creates a card from the parameters of a ``/card/create`` request and returns its payload."""
+        card_type = params.get("card[type]")
+        name = params.get("card[name]") or ""
+        fields = self._subcards(params)
+        with self._lock:
+            if card_type == "Answer":
+                card = self._create_answer(name, fields)
+            elif card_type == "Relationship":
+                card = self._create_relationship(name, fields)
+            else:
+                if card_type == "Source" and not name:
+                    name = f"Source-{self._next_id:09d}"
+                if card_type == "Metric":
+                    fields.setdefault("designer", name.split("+")[0])
+                    fields.setdefault("title", name.split("+")[-1])
+                    fields.setdefault("value_options", [])
+                if card_type == "Company" and "headquarters" in fields:
+                    fields["headquarters"] = _list(fields["headquarters"])
+                if not name:
+                    raise Wikirate4PyException("A card name is required.")
+                if card_type not in TYPE_IDS:
+                    # List cards and other types the client writes but never reads back through the mock
+                    fields["content"] = params.get("card[content]")
+                card = self._add(card_type or "Basic", name, **fields)
+            return self.card_payload(card)
+
+    def _create_answer(self, name, fields):
+        metric, rest = self._resolve_parts(name.split("+"), 2)
+        company, rest = self._resolve_parts(rest, 1)
+        if metric is None or company is None or len(rest) != 1:
+            raise Wikirate4PyException(f"Invalid answer name: {name}")
+        return self._add_answer(metric, company, rest[0], fields.get("value"), _list(fields.get("sources")),
+                                fields.get("comments"))
+
+    def _create_relationship(self, name, fields):
+        metric, rest = self._resolve_parts(name.split("+"), 2)
+        subject, rest = self._resolve_parts(rest, 1)
+        year, rest = rest[:1], rest[1:]
+        target, rest = self._resolve_parts(rest, len(rest))
+        if metric is None or subject is None or target is None or not year or rest:
+            raise Wikirate4PyException(f"Invalid relationship name: {name}")
+        return self._add_relationship(metric, subject, target, year[0], fields.get("value"),
+                                      _list(fields.get("sources")), fields.get("comments"))
+
+    def update(self, identifier, params):
+        """Updates a card from the parameters of an update request and returns its payload, or None if missing."""
+        fields = self._subcards(params)
+        if "card[content]" in params:
+            fields["content"] = params["card[content]"]
+        with self._lock:
+            card = self.resolve(identifier)
+            if card is None:
+                return None
+            if card["type"] == "Company" and "headquarters" in fields:
+                fields["headquarters"] = _list(fields["headquarters"])
+            card.update(fields)
+            return self.card_payload(card)
+
+    def delete(self, identifier):
+        with self._lock:
+            card = self.resolve(identifier)
+            if card is None:
+                return False
+            del self.cards[card["id"]]
+            self._names.pop(card_key(card["name"]), None)
+            if card["type"] in self._lists:
+                self._lists[card["type"]].remove(card["id"])
+            for scope in card.get("scopes", ()):
+                self._scoped[(card["type"], scope)].remove(card["id"])
+            return True
+
+    @staticmethod
+    def _subcards(params):
+        fields = {}
+        for key, value in params.items():
+            if not key.startswith("card[subcards][+"):
+                continue
+            subcard = key[len("card[subcards][+"):].split("]")[0]
+            field = SUBCARD_ALIASES.get(subcard, subcard)
+            if field == "sources":
+                value = [line.strip() for line in str(value).split("\n") if line.strip()]
+            fields[field] = value
+        return fields
+
+
+class FaultInjector(object):
+    """
+    Decides the artificial latency and failures of each request served by :class:`MockWikirateServer`.
+
+    Parameters
+    ----------
+    latency : float or Tuple[float, float], optional
+        Seconds added to every response, or the bounds of a uniformly random delay.
+    throttle_rate : float, optional
+        Fraction of requests answered with ``429 Too Many Requests``.
+    error_rate : float, optional
+        Fraction of requests answered with a server error, one of ``error_statuses``.
+    error_statuses : Iterable[int], optional
+        Server error statuses to pick from.
+    retry_after : int, optional
+        Value of the ``Retry-After`` header of throttled responses.
+    seed : int, optional
+        Seed of the random draws.
+    """
+
+    def __init__(self, latency=0.0, throttle_rate=0.0, error_rate=0.0, error_statuses=ERROR_STATUSES, retry_after=1,
+                 seed=None):
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self._forced = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fail_next(self, status, count=1):
+        """Answers the next ``count`` requests with ``status``, before any random failure."""
+        with self._lock:
+            self._forced.extend([status] * count)
+
+    def delay(self):
+        if isinstance(self.latency, (tuple, list)):
+            with self._lock:
+                return self._random.uniform(*self.latency)
+        return self.latency
+
+    def failure(self):
+        """Returns the status to fail the current request with, or None."""
+        with self._lock:
+            if self._forced:
+                return self._forced.pop(0)
+            draw = self._random.random()
+            if draw < self.throttle_rate:
+                return 429
+            if draw < self.throttle_rate + self.error_rate:
+                return self._random.choice(self.error_statuses)
+        return None
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this keep-alive clients wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method):
+        mock = self.server.mock
+        params = self._params()
+        delay = mock.faults.delay()
+        if delay:
+            time.sleep(delay)
+        failure = mock.faults.failure()
+        if failure is not None:
+            mock.record(method, failure)
+            headers = {"Retry-After": str(mock.faults.retry_after)} if failure == 429 else {}
+            return self._send(failure, {"errors": {"mock": [f"injected {failure} response"]}}, headers)
+        try:
+            status, payload = mock.route(method, unquote(urlsplit(self.path).path), params)
+        except Wikirate4PyException as e:
+            status, payload = 400, {"errors": {"card": [str(e)]}}
+        mock.record(method, status)
+        self._send(status, payload)
+
+    def _params(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type") or ""
+        query = urlsplit(self.path).query
+        params = {}
+        for source in (query, body.decode("utf-8") if body and "multipart" not in content_type else ""):
+            for key, values in parse_qs(source, keep_blank_values=True).items():
+                params[key] = values if key.endswith("[]") or len(values) > 1 else values[0]
+        if body and content_type.startswith("multipart/form-data"):
+            message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+                b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body)
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                if part.get_filename():
+                    params[name] = part.get_filename()
+                else:
+                    params[name] = part.get_payload(decode=True).decode("utf-8")
+        return params
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting, e.g. after its read timeout
+            self.close_connection = True
+
+
+class MockWikirateServer(object):
+    """
+    Local HTTP server standing in for the Wikirate API, for load, concurrency and retry testing offline.
+
+    It serves the endpoints used by :class:`~wikirate4py.API`: single cards (``/<card>.json``, ``/~<id>.json``),
+    lists (``/Companies.json``, ``/<metric>+Answers.json``, ``/<company>+Relationships.json``, ... paged with
+    ``offset`` and ``limit``), ``/card/create``, ``/card/update``, ``/update/<card>`` and deletes. Data comes from a
+    :class:`MockWikirate` store, and every request can be slowed down or failed through :attr:`faults`. Requests
+    are served concurrently, one thread per connection.
+
+    Parameters
+    ----------
+    data : MockWikirate, optional
+        The card store. Defaults to one generated with ``scale``.
+    host : str, optional
+        Interface to listen on.
+    port : int, optional
+        Port to listen on. The default, 0, picks a free port.
+    latency, throttle_rate, error_rate, retry_after, seed
+        Fault injection settings, see :class:`FaultInjector`.
+    scale
+        Arguments of :class:`MockWikirate`, e.g. ``companies=1000, metrics=20``.
+
+    Example
+    -------
+    ```python
+    with MockWikirateServer(companies=1000, latency=0.02, throttle_rate=0.01) as server:
+        api = API("token", wikirate_api_url=server.url)
+        answers = api.get_answers(metric_name="Metric 001", metric_designer="Mock Designer", limit=100)
+    ```
+    """
+
+    def __init__(self, data=None, host="127.0.0.1", port=0, latency=0.0, throttle_rate=0.0, error_rate=0.0,
+                 retry_after=1, seed=None, **scale):
+        self.faults = FaultInjector(latency=latency, throttle_rate=throttle_rate, error_rate=error_rate,
+                                    retry_after=retry_after, seed=seed)
+        self.requests = {}
+        self._stats_lock = threading.Lock()
+        self._server = _ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.mock = self
+        self._thread = None
+        self.data = data if data is not None else MockWikirate(base_url=self.url, **scale)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        """Serves requests on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="mock-wikirate", daemon=True)
+            self._thread.start()
+            log.info("Mock Wikirate server listening on %s", self.url)
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def record(self, method, status):
+        with self._stats_lock:
+            self.requests[(method, status)] = self.requests.get((method, status), 0) + 1
+
+    def request_count(self, method=None, status=None):
+        """Returns the number of requests served, optionally only those with the given method and status."""
+        with self._stats_lock:
+            return sum(count for (request_method, request_status), count in self.requests.items()
+                       if method in (None, request_method) and status in (None, request_status))
+
+    def route(self, method, path, params):
+        """Answers a request and returns its status and JSON payload."""
+        path = path.lstrip("/")
+        if method == "DELETE":
+            return (200, {}) if self.data.delete(path) else (404, {"errors": {"card": ["not found"]}})
+        if method == "POST":
+            if path == "card/create":
+                return 200, self.data.create(params)
+            if path == "card/update" or path.startswith("update/"):
+                identifier = params.get("card[name]", "") if path == "card/update" else path[len("update/"):]
+                payload = self.data.update(identifier, params)
+                return (200, payload) if payload is not None else (404, {"errors": {"card": ["not found"]}})
+            return 404, {"errors": {"path": [f"unknown endpoint: {path}"]}}
+
+        if path.endswith(".json"):
+            path = path[:-len(".json")]
+        scope, _, list_type = path.rpartition("+")
+        if list_type in LIST_TYPES:
+            offset = int(params.get("offset") or 0)
+            limit = min(int(params.get("limit") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+            filters = {key[len("filter["):].split("]")[0]: _list(value) for key, value in params.items()
+                       if key.startswith("filter[")}
+            payload = self.data.list(list_type, scope or None, offset, limit, filters)
+        else:
+            payload = self.data.get(path)
+        return (200, payload) if payload is not None else (404, {"errors": {"card": ["not found"]}})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic Wikirate cards for load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--companies", type=int, default=100)
+    parser.add_argument("--metrics", type=int, default=10)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--suppliers", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 5xx")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockWikirateServer(host=args.host, port=args.port, latency=args.latency,
+                                throttle_rate=args.throttle_rate, error_rate=args.error_rate, seed=args.seed,
+                                companies=args.companies, metrics=args.metrics, years=args.years,
+                                suppliers=args.suppliers)
+    log.info("Serving %d cards", len(server.data))
+    server.start()
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
-from pandas import DataFrame
-
 from wikirate4py.mixins import WikirateEntity
-import html2text
+
+
+def _html_to_text(html):
+    """Converts the HTML of a metric's text fields to Markdown. html2text is only imported once it is needed."""
+    import html2text
+    return html2text.HTML2Text().handle(html)
 
 
 class BaseEntity(WikirateEntity):
@@ -131,6 +134,7 @@ class Project(BaseEntity):
         answers = []
         for answer in self.answers:
             answers.append(answer.json())
+        from pandas import DataFrame
         return DataFrame.from_dict(answers)
 
 
@@ -162,6 +166,7 @@ class Dataset(BaseEntity):
         answers = []
         for answer in self.answers:
             answers.append(answer.json())
+        from pandas import DataFrame
         return DataFrame.from_dict(answers)
 
 
@@ -204,14 +209,13 @@ class Metric(BaseEntity):
 
     def __init__(self, data):
         super().__init__(data, expected_type_id=43576)
-        h = html2text.HTML2Text()
 
         self.id = data.get("id")
         self.designer = data["designer"]
         self.name = data["title"]
         self.question = self.extract_content(data, "question")
-        self.about = h.handle(self.extract_content(data, "about", default=""))
-        self.methodology = h.handle(self.extract_content(data, "methodology", default=""))
+        self.about = _html_to_text(self.extract_content(data, "about", default=""))
+        self.methodology = _html_to_text(self.extract_content(data, "methodology", default=""))
         self.value_type = self.extract_content(data, "value_type")
         self.value_options = data.get("value_options", {}).get("content", [])
         if len(self.value_options) == 1 and self.value_options[0] == "Unknown":
@@ -244,16 +248,15 @@ class MetricItem(BaseEntity):
 
     def __init__(self, data):
         super().__init__(data, expected_type_name='Metric')
-        h = html2text.HTML2Text()
 
         self.id = data.get("id")
         self.designer = data["designer"]
         self.name = data["title"]
         self.question = data.get("question")
         if data.get("about") is not None:
-            self.about = h.handle(data.get("about", " "))
+            self.about = _html_to_text(data.get("about", " "))
         if data.get("methodology") is not None:
-            self.methodology = h.handle(data.get("methodology", ""))
+            self.methodology = _html_to_text(data.get("methodology", ""))
         self.value_type = data.get("value_type")
         self.value_options = data.get("value_options")
         if len(self.value_options) == 1 and self.value_options[0] == "Unknown":
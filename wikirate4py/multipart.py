@@ -0,0 +1,191 @@
+import io
+import logging
+import mimetypes
+import os
+import time
+import uuid
+
+from wikirate4py.exceptions import Wikirate4PyException
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Characters percent-encoded in the names and filenames of Content-Disposition headers, as browsers and urllib3 do
+_HEADER_PARAM_ESCAPES = {'"': "%22", "\r": "%0D", "\n": "%0A"}
+
+
+class UploadProgress(object):
+    """Progress of a streamed upload, handed to progress callbacks as it advances."""
+    __slots__ = ("bytes_sent", "total_bytes", "started_at", "elapsed")
+
+    def __init__(self, total_bytes):
+        self.bytes_sent = 0
+        self.total_bytes = total_bytes
+        self.started_at = None
+        self.elapsed = 0.0
+
+    @property
+    def percent(self):
+        if not self.total_bytes:
+            return 100.0
+        return 100.0 * self.bytes_sent / self.total_bytes
+
+    @property
+    def throughput(self):
+        """Average upload speed in bytes per second."""
+        if not self.elapsed:
+            return 0.0
+        return self.bytes_sent / self.elapsed
+
+    @property
+    def done(self):
+        return self.bytes_sent >= self.total_bytes
+
+    def json(self):
+        return {"bytes_sent": self.bytes_sent, "total_bytes": self.total_bytes, "elapsed": self.elapsed,
+                "percent": self.percent, "throughput": self.throughput}
+
+    def __repr__(self):
+        return str(self.json())
+
+
+class MultipartEncoder(object):
+    """
+    Streams a ``multipart/form-data`` body without loading the files in memory.
+
+    The encoder is a file-like object: ``requests`` reads it in blocks while sending, so the memory needed for an
+    upload stays the same whatever the size of the files.
+
+    Parameters
+    ----------
+    fields : dict, optional
+        Form fields, as accepted by the ``data`` argument of ``requests``. List values are sent as repeated fields.
+    files : dict, optional
+        Field name to an open binary file, or to a ``(filename, file)`` / ``(filename, file, content_type)`` tuple.
+    boundary : str, optional
+        Multipart boundary, generated when omitted.
+    chunk_size : int, optional
+        Size of the blocks yielded when the encoder is iterated.
+    callback : callable, optional
+        Called with an :class:`UploadProgress` after every block read from the encoder.
+    """
+
+    def __init__(self, fields=None, files=None, boundary=None, chunk_size=DEFAULT_CHUNK_SIZE, callback=None):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self._parts = []
+        self._build(fields or {}, files or {})
+        self.len = sum(size for _, size, _ in self._parts)
+        self.progress = UploadProgress(self.len)
+        self._current = 0
+        self._current_read = 0
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self.len
+
+    def _add_bytes(self, data):
+        self._parts.append((io.BytesIO(data), len(data), False))
+
+    @staticmethod
+    def _header_param(value):
+        return "".join(_HEADER_PARAM_ESCAPES.get(char, char) for char in str(value))
+
+    def _part_header(self, name, filename=None, content_type=None):
+        disposition = f'form-data; name="{self._header_param(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{self._header_param(filename)}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type is not None:
+            header += f"Content-Type: {content_type}\r\n"
+        return (header + "\r\n").encode("utf-8")
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode("utf-8")
+
+    @staticmethod
+    def _remaining_size(file):
+        try:
+            return os.fstat(file.fileno()).st_size - file.tell()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            position = file.tell()
+            file.seek(0, os.SEEK_END)
+            size = file.tell() - position
+            file.seek(position)
+            return size
+
+    def _build(self, fields, files):
+        for name, value in fields.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for item in values:
+                if item is None:
+                    continue
+                self._add_bytes(self._part_header(name) + self._encode_value(item) + b"\r\n")
+
+        for name, value in files.items():
+            if isinstance(value, (list, tuple)):
+                filename, file = value[0], value[1]
+                content_type = value[2] if len(value) > 2 else None
+            else:
+                file = value
+                filename = os.path.basename(getattr(file, "name", name))
+                content_type = None
+            if content_type is None:
+                content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            self._add_bytes(self._part_header(name, filename, content_type))
+            self._parts.append((file, self._remaining_size(file), True))
+            self._add_bytes(b"\r\n")
+
+        self._add_bytes(f"--{self.boundary}--\r\n".encode("utf-8"))
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.len - self.progress.bytes_sent
+        if self.progress.started_at is None:
+            self.progress.started_at = time.monotonic()
+
+        chunks = []
+        wanted = size
+        while wanted > 0 and self._current < len(self._parts):
+            stream, part_size, is_file = self._parts[self._current]
+            data = stream.read(min(wanted, part_size - self._current_read)) if self._current_read < part_size else b""
+            if not data:
+                # The Content-Length sent was computed from the sizes of the files when the encoder was built
+                if is_file and (self._current_read < part_size or self._remaining_size(stream)):
+                    raise Wikirate4PyException(f"The size of {getattr(stream, 'name', 'an uploaded file')} "
+                                               f"changed during the upload.")
+                self._current += 1
+                self._current_read = 0
+                continue
+            chunks.append(data)
+            wanted -= len(data)
+            self._current_read += len(data)
+
+        block = b"".join(chunks)
+        self._record(len(block))
+        return block
+
+    def _record(self, sent):
+        progress = self.progress
+        progress.bytes_sent += sent
+        progress.elapsed = time.monotonic() - progress.started_at
+        if self.callback is not None and sent:
+            self.callback(progress)
+        if sent and progress.done:
+            log.debug("Uploaded %d bytes in %.2fs (%.1f KB/s)", progress.bytes_sent, progress.elapsed,
+                      progress.throughput / 1024)
+
+    def __iter__(self):
+        while True:
+            block = self.read(self.chunk_size)
+            if not block:
+                break
+            yield block
@@ -0,0 +1,105 @@
+import re
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 100000
+
+# Keys of card payloads holding other cards whose id and name are worth learning
+NESTED_CARD_KEYS = ("items", "ancestors", "sources")
+
+# Relationship payloads carry the ids of their companies next to their names
+NAME_ID_PAIRS = (("subject_company", "subject_company_id"), ("object_company", "object_company_id"))
+
+
+def card_key(name):
+    """
+    Normalizes a card name the way Wikirate compares names: case, spaces and punctuation are ignored within
+    each ``+``-separated part.
+    """
+    return "+".join(re.sub(r"[^0-9a-z~]+", "_", part.casefold()).strip("_") for part in str(name).split("+"))
+
+
+class NameResolutionCache(object):
+    """
+    Bounded, thread-safe cache of card name to numeric id mappings learned from API responses.
+
+    Once a card has been seen, requests addressing it by name can use its ``~<id>`` form instead, which skips name
+    resolution on the server.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximum number of names kept; the least recently used ones are evicted first.
+    """
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._ids = OrderedDict()
+        # Reverse index of the names cached for each id, so forgetting a card does not scan the cache
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, name, identifier):
+        if not name or identifier is None or not str(identifier).isdigit():
+            return
+        key = card_key(name)
+        identifier = int(identifier)
+        with self._lock:
+            previous = self._ids.get(key)
+            if previous != identifier:
+                if previous is not None:
+                    self._unlink(key, previous)
+                self._keys.setdefault(identifier, set()).add(key)
+            self._ids[key] = identifier
+            self._ids.move_to_end(key)
+            if len(self._ids) > self.max_size:
+                self._unlink(*self._ids.popitem(last=False))
+
+    def _unlink(self, key, identifier):
+        keys = self._keys.get(identifier)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[identifier]
+
+    def resolve(self, name):
+        """Returns the id of the card with the given name, or None if it has not been seen."""
+        key = card_key(name)
+        with self._lock:
+            identifier = self._ids.get(key)
+            if identifier is not None:
+                self._ids.move_to_end(key)
+            return identifier
+
+    def _learn_card(self, card):
+        self.add(card.get("name"), card.get("id"))
+        for name_key, id_key in NAME_ID_PAIRS:
+            name = card.get(name_key)
+            if isinstance(name, str):
+                self.add(name, card.get(id_key))
+
+    def learn(self, payload):
+        """Records the id and name of the card in a response payload and of the cards listed in it."""
+        if not isinstance(payload, dict):
+            return
+        self._learn_card(payload)
+        for key in NESTED_CARD_KEYS:
+            nested = payload.get(key)
+            if isinstance(nested, list):
+                for card in nested:
+                    if isinstance(card, dict):
+                        self._learn_card(card)
+
+    def forget(self, identifier):
+        """Drops the names mapped to a card id, e.g. after the card was deleted."""
+        with self._lock:
+            for key in self._keys.pop(int(identifier), ()):
+                del self._ids[key]
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+            self._keys.clear()
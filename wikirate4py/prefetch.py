@@ -0,0 +1,105 @@
+import logging
+
+from wikirate4py.concurrency import map_concurrently, DEFAULT_WORKERS
+from wikirate4py.exceptions import Wikirate4PyException
+from wikirate4py.name_cache import card_key
+
+log = logging.getLogger(__name__)
+
+# Related card of answers and relationships: attribute referencing it and API getter resolving it
+RELATED_FIELDS = {
+    "company": ("company", "get_company"),
+    "subject_company": ("subject_company_id", "get_company"),
+    "object_company": ("object_company_id", "get_company"),
+    "metric": ("metric", "get_metric"),
+    "sources": ("sources", "get_source"),
+}
+
+# Fields holding a list of references rather than a single one
+MANY_FIELDS = ("sources",)
+
+
+def _reference(value):
+    """Returns the identifier to fetch a referenced card with, from a name, an id or a listed item."""
+    if value is None or value == "":
+        return None
+    if hasattr(value, "id") and value.id is not None:
+        return value.id
+    return getattr(value, "name", value)
+
+
+def _key(reference):
+    return reference if isinstance(reference, int) else card_key(reference)
+
+
+def prefetch_related(api, items, related=("company", "metric", "sources"), workers=DEFAULT_WORKERS,
+                     rate_limit=None):
+    """
+    Fetches the cards referenced by answers or relationships once each and attaches them to the items.
+
+    The distinct companies, metrics and sources referenced by all items are collected first, then fetched
+    concurrently. Each item gets a ``prefetched`` dict mapping the related field to the fetched model (a list of
+    models for ``sources``); cards that could not be fetched are None and logged.
+
+    Parameters
+    ----------
+    api : API
+        The client used to fetch the cards.
+    items : Iterable
+        Answers or relationships, e.g. :class:`~wikirate4py.models.AnswerItem` objects.
+    related : Iterable[str], optional
+        Any of ``company``, ``metric`` and ``sources`` for answers, and ``subject_company``, ``object_company``,
+        ``metric`` and ``sources`` for relationships.
+    workers : int or AdaptiveConcurrencyLimiter, optional
+        Maximum number of requests running at the same time.
+    rate_limit : RateLimiter or float, optional
+        Maximum number of requests started per second.
+
+    Returns
+    -------
+    List
+        The items, with their related cards attached.
+    """
+    items = list(items)
+    related = [related] if isinstance(related, str) else list(related)
+    unknown = [field for field in related if field not in RELATED_FIELDS]
+    if unknown:
+        raise Wikirate4PyException(f"Cannot prefetch {', '.join(unknown)}. Expected any of: "
+                                   f"{', '.join(RELATED_FIELDS)}.")
+
+    # Distinct references per getter, so a company referenced as subject and as object is fetched once
+    wanted = {}
+    for field in related:
+        attribute, getter = RELATED_FIELDS[field]
+        references = wanted.setdefault(getter, {})
+        for item in items:
+            values = getattr(item, attribute, None)
+            for value in (values or []) if field in MANY_FIELDS else [values]:
+                reference = _reference(value)
+                if reference is not None:
+                    references.setdefault(_key(reference), reference)
+
+    fetched = {}
+    for getter, references in wanted.items():
+        fetch = getattr(api, getter)
+        results = map_concurrently(lambda reference: fetch(reference, response_format="model"),
+                                   references.values(), workers=workers, rate_limit=rate_limit)
+        for result in results:
+            if not result.ok:
+                log.warning("Could not prefetch %s: %s", result.key, result.error)
+            fetched[(getter, _key(result.key))] = result.value
+        log.debug("Prefetched %d cards with %s", len(results), getter)
+
+    for item in items:
+        prefetched = getattr(item, "prefetched", None) or {}
+        for field in related:
+            attribute, getter = RELATED_FIELDS[field]
+            values = getattr(item, attribute, None)
+            if field in MANY_FIELDS:
+                prefetched[field] = [fetched.get((getter, _key(_reference(value)))) for value in values or []
+                                     if _reference(value) is not None]
+            else:
+                reference = _reference(values)
+                prefetched[field] = fetched.get((getter, _key(reference))) if reference is not None else None
+        item.prefetched = prefetched
+    return items
@@ -0,0 +1,314 @@
+import logging
+import threading
+
+from wikirate4py.exceptions import Wikirate4PyException
+from wikirate4py.name_cache import card_key
+
+log = logging.getLogger(__name__)
+
+# Filters of API.get_answers that need data local answer sets do not carry
+UNSUPPORTED_FILTERS = ("updated", "updater", "verification", "bookmark", "published", "dataset", "project",
+                       "company_category", "company_identifier")
+
+# Metric attributes matched by the metric filters of API.get_answers
+METRIC_FILTERS = {
+    "metric_type": "metric_type",
+    "value_type": "value_type",
+    "research_policy": "research_policy",
+    "topic": "topics",
+    "topic_framework": "topic_frameworks",
+}
+
+SORT_FIELDS = {
+    "id": lambda answer: answer.id,
+    "year": lambda answer: _year(answer.year) or 0,
+    "value": lambda answer: _sortable_value(answer.value),
+    "company": lambda answer: card_key(answer.company),
+    "company_name": lambda answer: card_key(answer.company),
+    "metric": lambda answer: card_key(answer.metric),
+    "metric_name": lambda answer: card_key(answer.metric),
+}
+
+
+def _year(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _number(value):
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def _sortable_value(value):
+    number = _number(value)
+    return (0, number, "") if number is not None else (1, 0.0, str(value).casefold())
+
+
+def _as_list(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+def _is_id(value):
+    return isinstance(value, int) or str(value).lstrip("~").isdigit()
+
+
+class AnswerQueryEngine(object):
+    """
+    Evaluates :meth:`~wikirate4py.API.get_answers` filters against a locally stored answer set.
+
+    Answers are indexed by metric, company and year; the remaining filters are applied to the indexed candidates
+    only. Filters on company attributes (``country``) and metric attributes (``metric_type``, ``value_type``,
+    ``research_policy``, ``topic``, ``topic_framework``, ``designer``) need the companies and metrics to be loaded
+    as well. Filters the answer set has no data for (e.g. ``verification`` or ``updated``) raise a
+    :class:`~wikirate4py.exceptions.Wikirate4PyException`.
+
+    Parameters
+    ----------
+    answers : Iterable[AnswerItem], optional
+        The answers to query.
+    companies : Iterable[CompanyItem], optional
+        Companies of the answers, used to resolve company ids and to filter by country.
+    metrics : Iterable[MetricItem], optional
+        Metrics of the answers, used to resolve metric ids and to filter by metric attributes.
+    company_groups : dict, optional
+        Company group name to the names of its member companies, used by the ``company_group`` filter.
+
+    Example
+    -------
+    ```python
+    engine = AnswerQueryEngine.from_mirror(mirror)
+    answers = engine.query(metric_name="Company Report Available", metric_designer="Core", year=[2022, 2023],
+                           sort_by="company", limit=50)
+    ```
+    """
+
+    def __init__(self, answers=(), companies=(), metrics=(), company_groups=None):
+        self.answers = []
+        self._by_id = {}
+        self._by_metric = {}
+        self._by_company = {}
+        self._by_year = {}
+        self._companies = {}
+        self._company_names = {}
+        self._metrics = {}
+        self._metric_names = {}
+        self.company_groups = {}
+        self._lock = threading.Lock()
+        self.add_companies(companies)
+        self.add_metrics(metrics)
+        for name, members in (company_groups or {}).items():
+            self.add_company_group(name, members)
+        self.add(answers)
+
+    @classmethod
+    def from_mirror(cls, mirror, **filters):
+        """
+        Loads the answers of a :class:`~wikirate4py.Mirror`, with its companies and metrics.
+
+        Parameters
+        ----------
+        mirror : Mirror
+            The mirror to load from.
+        filters
+            Filters of :meth:`~wikirate4py.Mirror.get_answers` restricting the loaded answers.
+        """
+        return cls(answers=mirror.get_answers(limit=None, **filters),
+                   companies=mirror.get_companies(limit=None),
+                   metrics=mirror.get_metrics(limit=None))
+
+    def __len__(self):
+        return len(self.answers)
+
+    def add(self, answers):
+        """Adds answers to the set, replacing the ones with the same id."""
+        with self._lock:
+            for answer in answers:
+                position = self._by_id.get(answer.id)
+                if position is not None:
+                    self._unindex(position)
+                    self.answers[position] = answer
+                else:
+                    position = len(self.answers)
+                    self.answers.append(answer)
+                    self._by_id[answer.id] = position
+                self._index(position, answer)
+
+    def _index(self, position, answer):
+        self._by_metric.setdefault(card_key(answer.metric), set()).add(position)
+        self._by_company.setdefault(card_key(answer.company), set()).add(position)
+        self._by_year.setdefault(_year(answer.year), set()).add(position)
+
+    def _unindex(self, position):
+        answer = self.answers[position]
+        self._by_metric[card_key(answer.metric)].discard(position)
+        self._by_company[card_key(answer.company)].discard(position)
+        self._by_year[_year(answer.year)].discard(position)
+
+    def add_companies(self, companies):
+        for company in companies:
+            self._companies[card_key(company.name)] = company
+            self._company_names[int(company.id)] = card_key(company.name)
+
+    def add_metrics(self, metrics):
+        for metric in metrics:
+            key = card_key(metric.raw.get("name") or f"{metric.designer}+{metric.name}")
+            self._metrics[key] = metric
+            self._metric_names[int(metric.id)] = key
+
+    def add_company_group(self, name, members):
+        """Registers the members of a company group, given as names or as a :class:`~wikirate4py.CompanyGroup`."""
+        members = getattr(members, "members", members)
+        self.company_groups[card_key(name)] = {card_key(member) for member in members}
+
+    def _company_key(self, company):
+        if _is_id(company):
+            return self._company_names.get(int(str(company).lstrip("~")))
+        return card_key(company)
+
+    def _metric_key(self, metric):
+        if _is_id(metric):
+            return self._metric_names.get(int(str(metric).lstrip("~")))
+        return card_key(metric)
+
+    def _positions(self, index, keys):
+        positions = set()
+        for key in keys:
+            positions |= index.get(key, set())
+        return positions
+
+    def query(self, metric_name=None, metric_designer=None, identifier=None, offset=0, limit=20, **filters):
+        """
+        Returns the answers matching the filters, with the semantics of :meth:`~wikirate4py.API.get_answers`.
+
+        Parameters
+        ----------
+        metric_name, metric_designer : str, optional
+            Name and designer of the metric of the answers. A name without a designer matches metric names
+            containing it.
+        identifier : str or int, optional
+            A metric (``designer+name`` or id) or, otherwise, a company (name or id) the answers belong to.
+        offset, limit : int, optional
+            Pagination of the results. A limit of None returns all matches.
+        filters
+            ``year``, ``status``, ``company``, ``company_name``, ``company_keyword``, ``company_group``,
+            ``country``, ``metric``, ``metric_keyword``, ``designer``, ``metric_type``,
+            ``value_type``, ``research_policy``, ``topic``, ``topic_framework``, ``value``, ``value_from``,
+            ``value_to``, ``source``, ``sort_by`` and ``sort_dir``, as accepted by the API.
+
+        Returns
+        -------
+        List[AnswerItem]
+        """
+        unsupported = [name for name in filters if name in UNSUPPORTED_FILTERS]
+        if unsupported:
+            raise Wikirate4PyException(f"Filters cannot be evaluated on local answers: {', '.join(unsupported)}")
+
+        sort_by = filters.pop("sort_by", None)
+        sort_dir = filters.pop("sort_dir", "asc")
+        filters = {name: value for name, value in filters.items() if value is not None}
+
+        # Each entry lists the metric, company or year keys an answer must match one of
+        constraints = []
+        if metric_name is not None and metric_designer is not None:
+            constraints.append((self._by_metric, [card_key(f"{metric_designer}+{metric_name}")]))
+        elif identifier is not None:
+            metric = self._metric_key(identifier) if "+" in str(identifier) or _is_id(identifier) else None
+            if metric is not None and (metric in self._by_metric or metric in self._metrics):
+                constraints.append((self._by_metric, [metric]))
+            else:
+                constraints.append((self._by_company, [self._company_key(identifier)]))
+        if metric_name is not None and metric_designer is None:
+            filters["metric_keyword"] = metric_name
+        if "metric" in filters:
+            constraints.append((self._by_metric, [self._metric_key(item) for item in _as_list(filters.pop("metric"))]))
+        if "company" in filters:
+            constraints.append((self._by_company,
+                                [self._company_key(item) for item in _as_list(filters.pop("company"))]))
+        if "year" in filters:
+            constraints.append((self._by_year, [_year(item) for item in _as_list(filters.pop("year"))]))
+
+        with self._lock:
+            candidates = None
+            for index, keys in constraints:
+                positions = self._positions(index, keys)
+                candidates = positions if candidates is None else candidates & positions
+            if candidates is None:
+                candidates = range(len(self.answers))
+
+            predicates = [self._predicate(name, value) for name, value in filters.items()]
+            results = [self.answers[position] for position in sorted(candidates)]
+        results = [answer for answer in results if all(predicate(answer) for predicate in predicates)]
+
+        if sort_by is not None:
+            if sort_by not in SORT_FIELDS:
+                raise Wikirate4PyException(f"Invalid sort_by: {sort_by}. Expected one of: {', '.join(SORT_FIELDS)}.")
+            results.sort(key=SORT_FIELDS[sort_by], reverse=sort_dir == "desc")
+        return results[offset:] if limit is None else results[offset:offset + limit]
+
+    def count(self, **filters):
+        """Returns the number of answers matching the filters of :meth:`query`."""
+        return len(self.query(offset=0, limit=None, **filters))
+
+    def _predicate(self, name, value):
+        if name == "status":
+            if value in ("all", "exists"):
+                return lambda answer: True
+            if value == "known":
+                return lambda answer: str(answer.value).casefold() != "unknown"
+            if value == "unknown":
+                return lambda answer: str(answer.value).casefold() == "unknown"
+            # Local answer sets only hold researched answers
+            return lambda answer: False
+        if name == "value":
+            values = {str(item).casefold() for item in _as_list(value)}
+            return lambda answer: str(answer.value).casefold() in values
+        if name in ("value_from", "value_to"):
+            bound = _number(value)
+            if name == "value_from":
+                return lambda answer: _number(answer.value) is not None and _number(answer.value) >= bound
+            return lambda answer: _number(answer.value) is not None and _number(answer.value) <= bound
+        if name in ("company_name", "company_keyword"):
+            keyword = str(value).casefold()
+            return lambda answer: keyword in answer.company.casefold()
+        if name == "metric_keyword":
+            keyword = str(value).casefold()
+            return lambda answer: keyword in answer.metric.casefold()
+        if name == "designer":
+            designers = {card_key(item) for item in _as_list(value)}
+            return lambda answer: card_key(answer.metric.split("+")[0]) in designers
+        if name == "source":
+            sources = {card_key(getattr(item, "name", item)) for item in _as_list(value)}
+            return lambda answer: any(card_key(getattr(source, "name", source)) in sources
+                                      for source in answer.sources or [])
+        if name == "company_group":
+            members = set()
+            for group in _as_list(value):
+                if card_key(group) not in self.company_groups:
+                    raise Wikirate4PyException(f"Unknown company group: {group}. Register it with "
+                                               f"add_company_group first.")
+                members |= self.company_groups[card_key(group)]
+            return lambda answer: card_key(answer.company) in members
+        if name == "country":
+            countries = {card_key(item) for item in _as_list(value)}
+            return lambda answer: self._company_attribute(answer, "headquarters") in countries
+        if name in METRIC_FILTERS:
+            wanted = {card_key(item) for item in _as_list(value)}
+            return lambda answer: bool(wanted & self._metric_attribute(answer, METRIC_FILTERS[name]))
+        raise Wikirate4PyException(f"Unknown answer filter: {name}")
+
+    def _company_attribute(self, answer, attribute):
+        company = self._companies.get(card_key(answer.company))
+        value = getattr(company, attribute, None) if company is not None else None
+        return card_key(value) if value else None
+
+    def _metric_attribute(self, answer, attribute):
+        metric = self._metrics.get(card_key(answer.metric))
+        value = getattr(metric, attribute, None) if metric is not None else None
+        return {card_key(item) for item in _as_list(value) if item}
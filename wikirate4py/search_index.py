@@ -0,0 +1,209 @@
+import logging
+import re
+import threading
+import unicodedata
+
+from wikirate4py.cursor import Cursor
+from wikirate4py.exceptions import Wikirate4PyException
+from wikirate4py.models import Company, Metric, Topic
+
+log = logging.getLogger(__name__)
+
+# List endpoint used to populate the index for each searchable entity type
+LIST_METHODS = {
+    Company: "get_companies",
+    Metric: "get_metrics",
+    Topic: "get_topics",
+}
+
+# Score added when the whole query appears in a name, so short queries still rank names containing them first
+SUBSTRING_BONUS = 0.5
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise Wikirate4PyException("The name search index requires the numpy package: "
+                                   "pip install wikirate4py[search]")
+    return numpy
+
+
+def normalize_name(name):
+    """Folds case and accents and turns punctuation into spaces, keeping the letters and digits of any script."""
+    decomposed = unicodedata.normalize("NFKD", str(name).casefold())
+    letters = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r"[\W_]+", " ", letters).strip()
+
+
+def trigrams(name):
+    """Returns the set of character trigrams of a normalized, space-padded name, empty if it has no letters or
+    digits."""
+    normalized = normalize_name(name)
+    if not normalized:
+        return set()
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Collection(object):
+    """Trigram inverted index over the items of one entity type."""
+
+    def __init__(self):
+        self.items = []
+        self.names = []
+        self._postings = {}
+        self._arrays = None
+
+    def add(self, item, name):
+        position = len(self.items)
+        self.items.append(item)
+        self.names.append(normalize_name(name))
+        for gram in trigrams(name):
+            self._postings.setdefault(gram, []).append(position)
+        self._arrays = None
+
+    def finalize(self):
+        """Returns the postings as arrays and the trigram count of each item, building them after additions. Call
+        it holding the lock :meth:`add` is called with, and score with the returned arrays."""
+        if self._arrays is None:
+            np = _numpy()
+            arrays = {gram: np.asarray(positions, dtype=np.int32) for gram, positions in self._postings.items()}
+            positions = np.concatenate(list(arrays.values())) if arrays else np.empty(0, dtype=np.int32)
+            self._arrays = arrays, np.bincount(positions, minlength=len(self.items)).astype(np.float32)
+        return self._arrays
+
+    def scores(self, query, arrays):
+        """Returns the positions of matching items and their Dice similarity with the query."""
+        np = _numpy()
+        postings, sizes = arrays
+        grams = trigrams(query)
+        postings = [postings[gram] for gram in grams if gram in postings]
+        if not postings:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        shared = np.bincount(np.concatenate(postings), minlength=len(sizes))
+        candidates = np.nonzero(shared)[0]
+        scores = 2.0 * shared[candidates] / (len(grams) + sizes[candidates])
+        normalized = normalize_name(query)
+        if normalized:
+            contains = np.fromiter((normalized in self.names[i] for i in candidates), dtype=bool,
+                                   count=len(candidates))
+            scores = np.minimum(1.0, scores + SUBSTRING_BONUS * contains)
+        return candidates, scores
+
+
+class NameSearchIndex(object):
+    """
+    In-process fuzzy name search over companies, metrics and topics.
+
+    Names are indexed by character trigrams and ranked by their similarity with the query, so typos and partial
+    names still match. Attach the index to an :class:`~wikirate4py.API` to answer
+    :meth:`~wikirate4py.API.search_by_name` locally; queries without a local match fall back to the API. Searching
+    requires numpy (``pip install wikirate4py[search]``).
+
+    Parameters
+    ----------
+    min_score : float, optional
+        Minimum similarity, between 0 and 1, of a returned result.
+
+    Example
+    -------
+    ```python
+    index = NameSearchIndex()
+    index.build(api, entity_types=(Company,))
+    api.search_index = index
+    companies = api.search_by_name(Company, "adidas")
+    ```
+    """
+
+    def __init__(self, min_score=0.3):
+        self.min_score = min_score
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def covers(self, entity_type):
+        return entity_type in self._collections
+
+    def __len__(self):
+        return sum(len(collection.items) for collection in self._collections.values())
+
+    def add(self, entity_type, items):
+        """
+        Adds listed items (e.g. :class:`~wikirate4py.models.CompanyItem`) to the index of an entity type.
+
+        Metrics are indexed by their full ``designer+title`` name, other entities by name.
+        """
+        with self._lock:
+            collection = self._collections.setdefault(entity_type, _Collection())
+            for item in items:
+                raw = getattr(item, "raw", None) or {}
+                collection.add(item, raw.get("name") or item.name)
+
+    def build(self, api, entity_types=tuple(LIST_METHODS), per_page=200, **filters):
+        """
+        Populates the index by paging through the list endpoint of each entity type.
+
+        Parameters
+        ----------
+        api : API
+            The client used to list the entities.
+        entity_types : Iterable, optional
+            Any of :class:`~wikirate4py.models.Company`, :class:`~wikirate4py.models.Metric` and
+            :class:`~wikirate4py.models.Topic`.
+        per_page : int, optional
+            Number of items requested per page.
+        filters
+            Filters passed to every list endpoint.
+        """
+        for entity_type in entity_types:
+            cursor = Cursor(getattr(api, LIST_METHODS[entity_type]), per_page=per_page, response_format="model",
+                            **filters)
+            count = 0
+            while cursor.has_next():
+                page = cursor.next()
+                count += len(page)
+                self.add(entity_type, page)
+            log.info("Indexed %d %s names", count, entity_type.__name__)
+
+    def search(self, entity_type, name, offset=0, limit=20):
+        """
+        Returns the indexed items whose names best match ``name``, most similar first.
+
+        Returns
+        -------
+        List
+            The matching items, e.g. :class:`~wikirate4py.models.CompanyItem` objects for companies.
+        """
+        return self.search_many(entity_type, [name], offset=offset, limit=limit)[0]
+
+    def search_many(self, entity_type, names, offset=0, limit=20):
+        """
+        Runs a batch of queries against the index of one entity type.
+
+        Scoring of each query is a single vectorized pass over the trigram postings, and repeated queries are
+        only scored once.
+
+        Returns
+        -------
+        List[List]
+            The results of each query, in the order of ``names``.
+        """
+        np = _numpy()
+
+        collection = self._collections.get(entity_type)
+        if collection is None:
+            return [[] for _ in names]
+        with self._lock:
+            arrays = collection.finalize()
+
+        results = {}
+        for name in names:
+            if name in results:
+                continue
+            candidates, scores = collection.scores(name, arrays)
+            keep = scores >= self.min_score
+            candidates, scores = candidates[keep], scores[keep]
+            # Stable sort so equally similar items keep their listing order
+            order = np.argsort(-scores, kind="stable")[offset:offset + limit]
+            results[name] = [collection.items[i] for i in candidates[order]]
+        return [results[name] for name in names]
@@ -0,0 +1,198 @@
+import datetime
+import gzip
+import io
+import json
+import logging
+import os
+
+from wikirate4py import models
+from wikirate4py.exceptions import Wikirate4PyException
+
+log = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+DEFAULT_SHARD_SIZE = 100000
+
+# Item model of each list method that can be snapshotted
+LIST_MODELS = {
+    "get_answers": "AnswerItem",
+    "get_relationships": "RelationshipItem",
+    "get_companies": "CompanyItem",
+    "get_metrics": "MetricItem",
+    "get_topics": "TopicItem",
+    "get_sources": "SourceItem",
+    "get_datasets": "DatasetItem",
+    "get_projects": "ProjectItem",
+    "get_company_groups": "CompanyGroupItem",
+    "get_research_groups": "ResearchGroupItem",
+    "get_regions": "RegionItem",
+}
+
+SHARD_EXTENSIONS = {"gzip": "jsonl.gz", "zstd": "jsonl.zst", None: "jsonl"}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise Wikirate4PyException("zstd compression requires the zstandard package: "
+                                   "pip install wikirate4py[zstd]")
+    return zstandard
+
+
+def _open_shard(path, mode, compression):
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if compression == "zstd":
+        zstandard = _zstandard()
+        if mode == "w":
+            stream = zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class SnapshotWriter(object):
+    """
+    Writes point-in-time snapshots of list endpoints as compressed JSON Lines shards.
+
+    Items are written exactly as the API returns them, without building models, one page in memory at a time.
+    A ``manifest.json`` describing the endpoint, the filters and the shards is written once the snapshot is
+    complete.
+
+    Parameters
+    ----------
+    api : API
+        The client used to page through the endpoint.
+    compression : str, optional
+        ``gzip`` (default), ``zstd`` (requires the ``zstandard`` package) or None.
+    shard_size : int, optional
+        Maximum number of items per shard file.
+
+    Example
+    -------
+    ```python
+    SnapshotWriter(api).write("snapshots/cra-2024", "get_answers", metric_name="Company Report Available",
+                              metric_designer="Core", year=2024)
+    for answer in SnapshotReader("snapshots/cra-2024"):
+        print(answer.company, answer.value)
+    ```
+    """
+
+    def __init__(self, api, compression="gzip", shard_size=DEFAULT_SHARD_SIZE):
+        if compression not in SHARD_EXTENSIONS:
+            raise Wikirate4PyException(f"Invalid compression: {compression}. Expected gzip, zstd or None.")
+        if compression == "zstd":
+            _zstandard()
+        self.api = api
+        self.compression = compression
+        self.shard_size = shard_size
+
+    def _pages(self, method, per_page, filters):
+        fetch = getattr(self.api, method)
+        offset = 0
+        while True:
+            items = fetch(offset=offset, limit=per_page, response_format="json", **filters).get("items") or []
+            if not items:
+                return
+            yield items
+            offset += per_page
+
+    def write(self, directory, method="get_answers", per_page=200, **filters):
+        """
+        Pages through a list method of the API and writes its items to ``directory``.
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the snapshot. It is created if needed.
+        method : str, optional
+            Name of the API list method, e.g. ``get_answers`` or ``get_relationships``.
+        per_page : int, optional
+            Number of items requested per page.
+        filters
+            Arguments of the list method.
+
+        Returns
+        -------
+        dict
+            The manifest of the snapshot.
+        """
+        if method not in LIST_MODELS:
+            raise Wikirate4PyException(f"Invalid list method: {method}. Expected one of: {', '.join(LIST_MODELS)}.")
+        os.makedirs(directory, exist_ok=True)
+        manifest = {
+            "method": method,
+            "model": LIST_MODELS[method],
+            "filters": filters,
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "compression": self.compression,
+            "count": 0,
+            "shards": [],
+        }
+
+        shard = None
+        shard_count = 0
+        try:
+            for items in self._pages(method, min(per_page, 200), filters):
+                for item in items:
+                    if shard is None or shard_count >= self.shard_size:
+                        if shard is not None:
+                            shard.close()
+                        name = f"part-{len(manifest['shards']):05d}.{SHARD_EXTENSIONS[self.compression]}"
+                        shard = _open_shard(os.path.join(directory, name), "w", self.compression)
+                        manifest["shards"].append({"file": name, "count": 0})
+                        shard_count = 0
+                    shard.write(json.dumps(item, ensure_ascii=False))
+                    shard.write("\n")
+                    shard_count += 1
+                    manifest["shards"][-1]["count"] += 1
+                    manifest["count"] += 1
+        finally:
+            if shard is not None:
+                shard.close()
+
+        with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, default=str)
+        log.info("Wrote %d items of %s to %s", manifest["count"], method, directory)
+        return manifest
+
+
+class SnapshotReader(object):
+    """
+    Reads a snapshot written by :class:`SnapshotWriter`.
+
+    Iterating over the reader streams the items shard by shard and builds their models (e.g.
+    :class:`~wikirate4py.models.AnswerItem`) one at a time; :meth:`raw` streams the item dicts instead.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the snapshot.
+    """
+
+    def __init__(self, directory):
+        path = os.path.join(directory, MANIFEST_FILE)
+        if not os.path.exists(path):
+            raise Wikirate4PyException(f"No snapshot manifest found in {directory}.")
+        self.directory = directory
+        with open(path, encoding="utf-8") as manifest_file:
+            self.manifest = json.load(manifest_file)
+        self.model = getattr(models, self.manifest["model"])
+
+    def __len__(self):
+        return self.manifest["count"]
+
+    def raw(self):
+        """Yields the items of the snapshot as dicts, as returned by the API."""
+        for shard in self.manifest["shards"]:
+            with _open_shard(os.path.join(self.directory, shard["file"]), "r",
+                             self.manifest["compression"]) as lines:
+                for line in lines:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def __iter__(self):
+        for item in self.raw():
+            yield self.model(item)
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from wikirate4py.concurrency import map_concurrently, DEFAULT_WORKERS
+from wikirate4py.exceptions import Wikirate4PyException, NotFoundException
+
+log = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path, algorithm="sha256"):
+    """Returns the hex digest of a file, reading it in blocks so memory stays constant."""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SourceHashIndex(object):
+    """
+    Persistent mapping from file content hashes to the Wikirate sources holding that content.
+
+    Parameters
+    ----------
+    path : str, optional
+        JSON file the index is loaded from and saved to. The index only lives in memory when omitted.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, digest):
+        return digest in self._entries
+
+    def get(self, digest):
+        return self._entries.get(digest)
+
+    def add(self, digest, source, file=None):
+        with self._lock:
+            self._entries[digest] = {"id": source.id, "name": source.name,
+                                     "file": os.path.basename(file) if file else None}
+
+    def remove(self, digest):
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as index_file:
+            self._entries = json.load(index_file)
+
+    def save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as index_file:
+                json.dump(self._entries, index_file)
+            os.replace(tmp_path, self.path)
+
+
+class SourceUploadResult(object):
+    __slots__ = ("item", "digest", "source_id", "source_name", "source", "reused", "error")
+
+    def __init__(self, item, digest=None, source_id=None, source_name=None, source=None, reused=False, error=None):
+        self.item = item
+        self.digest = digest
+        self.source_id = source_id
+        self.source_name = source_name
+        self.source = source
+        self.reused = reused
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def json(self):
+        data = {key: getattr(self, key) for key in self.__slots__ if key != "source"}
+        data["error"] = None if self.error is None else str(self.error)
+        return data
+
+    def __repr__(self):
+        return str(self.json())
+
+
+class SourceUploader(object):
+    """
+    Uploads many source files concurrently, reusing existing sources for files whose content was already uploaded.
+
+    Files are identified by the hash of their content, so the same report uploaded for several companies or years
+    only reaches Wikirate once. The companies and years of the items reusing a source are added to it; its title and
+    report type are left as they are.
+
+    Parameters
+    ----------
+    api : API
+        The client used to create the sources.
+    index : SourceHashIndex or str, optional
+        The hash index, or the path of its JSON file. Defaults to an in-memory index.
+    workers : int or AdaptiveConcurrencyLimiter, optional
+        Maximum number of files hashed or uploaded at the same time.
+    verify : bool, optional
+        Check that indexed sources still exist before reusing them; deleted ones are uploaded again.
+    """
+
+    def __init__(self, api, index=None, workers=DEFAULT_WORKERS, verify=False):
+        self.api = api
+        self.index = index if isinstance(index, SourceHashIndex) else SourceHashIndex(index)
+        self.workers = workers
+        self.verify = verify
+
+    def _is_available(self, digest):
+        entry = self.index.get(digest)
+        if entry is None:
+            return False
+        if self.verify:
+            try:
+                self.api.get_source(entry["id"], response_format="model")
+            except NotFoundException:
+                log.info("Indexed source %s no longer exists, uploading again", entry["name"])
+                self.index.remove(digest)
+                return False
+        return True
+
+    def _attach(self, source_id, companies, years):
+        # Adds items to the company and year lists of the source instead of replacing them as update_source would
+        if companies:
+            self.api.update_list_items(f"~{source_id}+Company", add=companies)
+        if years:
+            # Years are card names, which update_list_items would read as ids
+            self.api.post("/card/update", {"card[type]": "List", "card[name]": f"~{source_id}+Year",
+                                           "add_item[]": [str(year) for year in years],
+                                           "format": "json", "success[format]": "json"})
+
+    def upload(self, items):
+        """
+        Adds a source for every item, skipping files whose content is already on Wikirate.
+
+        Parameters
+        ----------
+        items : Iterable[dict]
+            Keyword arguments of :meth:`~wikirate4py.API.add_source`, each with a ``file`` path.
+
+        Returns
+        -------
+        List[SourceUploadResult]
+            One result per item, in the order of ``items``. Items reusing a source have ``reused`` set, and the
+            ``error`` of adding their company or year to it, if any.
+        """
+        items = list(items)
+        for item in items:
+            if not item.get("file"):
+                raise Wikirate4PyException("Every item needs a 'file' to upload.")
+
+        hashes = map_concurrently(lambda item: file_digest(os.path.realpath(item["file"])), items, self.workers)
+        results = [SourceUploadResult(h.key, digest=h.value, error=h.error) for h in hashes]
+
+        # Upload each unknown content once, using the first item that carries it
+        pending = {}
+        checked = set()
+        for result in results:
+            if not result.ok or result.digest in checked:
+                continue
+            checked.add(result.digest)
+            if not self._is_available(result.digest):
+                pending[result.digest] = result.item
+
+        uploads = map_concurrently(lambda digest: self.api.add_source(response_format="model", **pending[digest]),
+                                   pending, self.workers)
+        uploaded = {}
+        for upload in uploads:
+            uploaded[upload.key] = upload
+            if upload.ok:
+                self.index.add(upload.key, upload.value, file=pending[upload.key]["file"])
+        self.index.save()
+
+        for result in results:
+            if not result.ok:
+                continue
+            upload = uploaded.get(result.digest)
+            if upload is not None and not upload.ok:
+                result.error = upload.error
+                continue
+            entry = self.index.get(result.digest)
+            result.source_id = entry["id"]
+            result.source_name = entry["name"]
+            if upload is not None and pending[result.digest] is result.item:
+                result.source = upload.value
+            else:
+                result.reused = True
+
+        # Companies and years each reused source gains, minus those it was just created with
+        reusing = {}
+        attachments = {}
+        for result in results:
+            if not result.reused:
+                continue
+            reusing.setdefault(result.source_id, []).append(result)
+            companies, years = attachments.setdefault(result.source_id, ([], []))
+            created_with = pending.get(result.digest, {})
+            for key, values in (("company", companies), ("year", years)):
+                value = result.item.get(key)
+                if value is not None and value != created_with.get(key) and value not in values:
+                    values.append(value)
+        attached = map_concurrently(lambda source_id: self._attach(source_id, *attachments[source_id]),
+                                    [source_id for source_id, added in attachments.items() if any(added)],
+                                    self.workers)
+        for attach in attached:
+            if not attach.ok:
+                for result in reusing[attach.key]:
+                    result.error = attach.error
+
+        log.info("Uploaded %d of %d source files, reused %d",
+                 sum(1 for upload in uploads if upload.ok), len(items),
+                 sum(1 for result in results if result.reused))
+        return results
@@ -0,0 +1,181 @@
+import logging
+import threading
+
+from wikirate4py.concurrency import map_concurrently, DEFAULT_WORKERS
+from wikirate4py.cursor import Cursor
+from wikirate4py.exceptions import Wikirate4PyException
+
+log = logging.getLogger(__name__)
+
+# Relationship filter selecting the known end of an edge, and attributes of the other end, per direction
+DIRECTIONS = {
+    "downstream": ("subject_company_id", "object_company_id", "object_company_name"),
+    "upstream": ("object_company_id", "subject_company_id", "subject_company_name"),
+}
+
+
+class SupplyChainEdge(object):
+    """A relationship found while traversing a supply chain, ``depth`` hops away from the start companies."""
+    __slots__ = ("depth", "source_id", "target_id", "target_name", "year", "value", "relationship_id")
+
+    def __init__(self, depth, source_id, target_id, target_name=None, year=None, value=None, relationship_id=None):
+        self.depth = depth
+        self.source_id = source_id
+        self.target_id = target_id
+        self.target_name = target_name
+        self.year = year
+        self.value = value
+        self.relationship_id = relationship_id
+
+    def json(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def __repr__(self):
+        return str(self.json())
+
+
+class SupplyChainTraversal(object):
+    """
+    Breadth-first traversal of supply chains over a relationship metric.
+
+    Each hop lists the relationships of the companies of the current frontier concurrently. Neighbour lists are
+    memoized, so suppliers shared by many companies, or reached again by later traversals, are fetched once. A
+    company whose relationships cannot be listed is recorded in ``errors`` with the exception raised, and the
+    traversal carries on without its edges.
+
+    Parameters
+    ----------
+    api : API
+        The client used to list relationships.
+    metric_name : str, optional
+        Name of the relationship metric. Defaults to ``Supplied By``.
+    metric_designer : str, optional
+        Designer of the relationship metric. Defaults to ``Commons``.
+    year : int or List[int], optional
+        Only follow relationships of these years.
+    direction : str, optional
+        ``downstream`` follows relationships from subject to object company (brand to supplier with
+        ``Commons+Supplied By``), ``upstream`` from object to subject company.
+    workers : int or AdaptiveConcurrencyLimiter, optional
+        Maximum number of companies of a frontier listed at the same time.
+    rate_limit : RateLimiter or float, optional
+        Maximum number of requests started per second.
+
+    Example
+    -------
+    ```python
+    traversal = SupplyChainTraversal(api, year=2023)
+    for edge in traversal.traverse([5590], max_depth=2, budget=500):
+        print(edge.depth, edge.source_id, "->", edge.target_name)
+    ```
+    """
+
+    def __init__(self, api, metric_name="Supplied By", metric_designer="Commons", year=None, direction="downstream",
+                 workers=DEFAULT_WORKERS, per_page=200, rate_limit=None):
+        if direction not in DIRECTIONS:
+            raise Wikirate4PyException(f"Invalid direction: {direction}. Expected downstream or upstream.")
+        self.api = api
+        self.metric_name = metric_name
+        self.metric_designer = metric_designer
+        self.year = year
+        self.direction = direction
+        self.workers = workers
+        self.per_page = per_page
+        self.rate_limit = rate_limit
+        self.truncated = False
+        self.errors = []
+        self._neighbours = {}
+        self._lock = threading.Lock()
+
+    def _fetch_neighbours(self, company_id):
+        known_end, other_end, other_name = DIRECTIONS[self.direction]
+        cursor = Cursor(self.api.get_relationships, per_page=self.per_page, metric_name=self.metric_name,
+                        metric_designer=self.metric_designer, year=self.year, response_format="model",
+                        **{known_end: company_id})
+        neighbours = []
+        while cursor.has_next():
+            for relationship in cursor.next():
+                target_id = getattr(relationship, other_end)
+                if target_id is not None:
+                    neighbours.append((int(target_id), getattr(relationship, other_name), relationship.year,
+                                       relationship.value, relationship.id))
+        return neighbours
+
+    def neighbours(self, company_id):
+        """Returns the ``(company id, company name, year, value, relationship id)`` neighbours of a company."""
+        with self._lock:
+            cached = self._neighbours.get(company_id)
+        if cached is None:
+            cached = self._fetch_neighbours(company_id)
+            with self._lock:
+                self._neighbours[company_id] = cached
+        return cached
+
+    def _company_id(self, company):
+        if isinstance(company, int) or str(company).isdigit():
+            return int(company)
+        return int(self.api.get_company(company, response_format="model").id)
+
+    def traverse(self, companies, max_depth=3, budget=None):
+        """
+        Walks the supply chains of the given companies hop by hop.
+
+        Parameters
+        ----------
+        companies : Iterable[int or str]
+            Ids or names of the start companies.
+        max_depth : int, optional
+            Maximum number of hops.
+        budget : int, optional
+            Maximum number of companies whose relationships are requested from the API. Companies with memoized
+            neighbours do not count. Once it is spent the traversal stops early and ``truncated`` is set.
+
+        Returns
+        -------
+        List[SupplyChainEdge]
+            The relationships found, in breadth-first order, each annotated with its hop number. Companies whose
+            relationships could not be listed are in ``errors``.
+        """
+        self.truncated = False
+        self.errors = []
+        frontier = list(dict.fromkeys(self._company_id(company) for company in companies))
+        visited = set(frontier)
+        remaining = budget
+        edges = []
+        for depth in range(1, max_depth + 1):
+            if not frontier:
+                break
+            with self._lock:
+                uncached = [company_id for company_id in frontier if company_id not in self._neighbours]
+            if remaining is not None and len(uncached) > remaining:
+                allowed = set(uncached[:remaining])
+                frontier = [company_id for company_id in frontier
+                            if company_id in allowed or company_id not in uncached]
+                uncached = uncached[:remaining]
+                self.truncated = True
+            if remaining is not None:
+                remaining -= len(uncached)
+
+            failed = set()
+            for result in map_concurrently(self.neighbours, uncached, workers=self.workers,
+                                           rate_limit=self.rate_limit):
+                if not result.ok:
+                    log.warning("Failed to list the relationships of company %s: %s", result.key, result.error)
+                    self.errors.append((result.key, result.error))
+                    failed.add(result.key)
+
+            next_frontier = []
+            for company_id in frontier:
+                if company_id in failed:
+                    continue
+                for target_id, target_name, year, value, relationship_id in self.neighbours(company_id):
+                    edges.append(SupplyChainEdge(depth, company_id, target_id, target_name, year, value,
+                                                 relationship_id))
+                    if target_id not in visited:
+                        visited.add(target_id)
+                        next_frontier.append(target_id)
+            log.debug("Supply chain hop %d: %d companies, %d edges so far", depth, len(frontier), len(edges))
+            frontier = next_frontier
+            if self.truncated:
+                break
+        return edges
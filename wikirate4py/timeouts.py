@@ -0,0 +1,212 @@
+import contextlib
+import threading
+import time
+
+try:
+    import contextvars
+except ImportError:  # Python 3.6
+    contextvars = None
+
+from wikirate4py.exceptions import DeadlineExceededException, Wikirate4PyException
+from wikirate4py.instrumentation import ENDPOINT_NAMES, endpoint_template
+
+# Seconds to wait for a connection to the server, and for each read of the response
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 30
+DEFAULT_READ_TIMEOUT_SECONDS = 480
+DEFAULT_TIMEOUT = (DEFAULT_CONNECT_TIMEOUT_SECONDS, DEFAULT_READ_TIMEOUT_SECONDS)
+
+# Uploads get a short connect budget so an unreachable server fails fast, while the read budget stays generous for
+# the server to process large files.
+UPLOAD_CONNECT_TIMEOUT_SECONDS = 30
+UPLOAD_READ_TIMEOUT_SECONDS = DEFAULT_READ_TIMEOUT_SECONDS
+DEFAULT_UPLOAD_TIMEOUT = (UPLOAD_CONNECT_TIMEOUT_SECONDS, UPLOAD_READ_TIMEOUT_SECONDS)
+
+# Endpoint families timeouts can be configured for
+FAMILIES = ("card", "list", "upload")
+
+# Timeout and deadline of the running calls, see timeout_scope. A context variable follows the calls onto the worker
+# threads of the batch operations, which run in copies of the caller's context.
+if contextvars is not None:
+    _scope = contextvars.ContextVar("wikirate4py_timeout_scope", default=(None, None))
+else:
+    _state = threading.local()
+
+
+def as_timeout(value):
+    """Normalizes a number of seconds, used for both budgets, or a ``(connect, read)`` pair to a pair."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return value, value
+    if isinstance(value, (tuple, list)) and len(value) == 2 and all(
+            isinstance(part, (int, float)) and not isinstance(part, bool) and part > 0 for part in value):
+        return tuple(value)
+    raise Wikirate4PyException(f"Invalid timeout: {value!r}. Expected a positive number of seconds or a "
+                               f"(connect, read) pair.")
+
+
+def request_family(path, files=None):
+    """Returns the endpoint family of a request: ``upload`` for file uploads, ``list`` or ``card``."""
+    if files:
+        return "upload"
+    template = endpoint_template(path)
+    name = template[1:].split(".", 1)[0]
+    if template.startswith("/{card}+") or name in ENDPOINT_NAMES:
+        return "list"
+    return "card"
+
+
+class TimeoutPolicy(object):
+    """
+    Connect and read timeouts of the requests of a client.
+
+    The timeout of a request is the first one configured for, in order: the call (the ``timeout`` argument of the
+    API methods, or an enclosing :func:`timeout_scope`), its endpoint family, its HTTP method, and the default. Each
+    timeout is a number of seconds, used for both connecting and every read of the response, or a ``(connect, read)``
+    pair.
+
+    Parameters
+    ----------
+    default : float or Tuple[float, float], optional
+        Timeout of requests without a more specific one.
+    methods : dict, optional
+        Timeouts per HTTP method, e.g. ``{"get": (5, 60)}``.
+    families : dict, optional
+        Timeouts per endpoint family: ``card`` (single cards and writes), ``list`` (listings such as answers of a
+        metric) and ``upload`` (multipart file uploads). Uploads default to ``DEFAULT_UPLOAD_TIMEOUT``.
+
+    Example
+    -------
+    ```python
+    policy = TimeoutPolicy(default=(5, 60), families={"list": (5, 180), "upload": (30, 1800)})
+    api = API(token, timeouts=policy)
+    ```
+    """
+
+    def __init__(self, default=DEFAULT_TIMEOUT, methods=None, families=None):
+        self.default = as_timeout(default)
+        self.methods = {method.lower(): as_timeout(timeout) for method, timeout in (methods or {}).items()}
+        families = dict({"upload": DEFAULT_UPLOAD_TIMEOUT}, **(families or {}))
+        for family in families:
+            if family not in FAMILIES:
+                raise Wikirate4PyException(f"Invalid endpoint family: {family}. Expected one of: "
+                                           f"{', '.join(FAMILIES)}.")
+        self.families = {family: as_timeout(timeout) for family, timeout in families.items()}
+
+    def resolve(self, method, path, files=None, timeout=None):
+        """
+        Returns the ``(connect, read)`` timeout of a request, capped by the deadline of the enclosing
+        :func:`timeout_scope`.
+
+        Raises
+        ------
+        DeadlineExceededException
+            If that deadline has passed.
+        """
+        scope_timeout, deadline = current_scope()
+        if timeout is None:
+            timeout = scope_timeout
+        if timeout is not None:
+            timeout = as_timeout(timeout)
+        else:
+            # Only parse the path when a card or list timeout is configured
+            family = request_family(path, files) if files or len(self.families) > 1 else None
+            timeout = self.families.get(family) or self.methods.get(method.lower()) or self.default
+        if deadline is None:
+            return timeout
+        remaining = deadline.check()
+        return min(timeout[0], remaining), min(timeout[1], remaining)
+
+
+class Deadline(object):
+    """
+    Point in time after which no more requests of an operation are sent.
+
+    Requests started before the deadline get their connect and read timeouts capped by the remaining time. The read
+    timeout bounds each read rather than the whole response, so the last request may overrun slightly.
+
+    Parameters
+    ----------
+    seconds : float
+        Time budget of the operation, from now.
+    """
+    __slots__ = ("seconds", "expires_at")
+
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise Wikirate4PyException(f"Invalid deadline: {seconds}. It must be a positive number of seconds.")
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        """Returns the seconds left, negative once the deadline has passed."""
+        return self.expires_at - time.monotonic()
+
+    def check(self):
+        """
+        Returns the seconds left.
+
+        Raises
+        ------
+        DeadlineExceededException
+            If the deadline has passed.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededException(self.seconds)
+        return remaining
+
+
+def current_scope():
+    """Returns the ``(timeout, deadline)`` of the innermost enclosing :func:`timeout_scope`."""
+    if contextvars is not None:
+        return _scope.get()
+    return getattr(_state, "scope", (None, None))
+
+
+def expired_deadline():
+    """Returns the deadline of the current :func:`timeout_scope` if it has passed, else None."""
+    deadline = current_scope()[1]
+    return deadline if deadline is not None and deadline.remaining() <= 0 else None
+
+
+@contextlib.contextmanager
+def timeout_scope(timeout=None, deadline=None):
+    """
+    Applies a timeout, a deadline, or both to the requests sent inside the block, including those of the batch
+    operations it runs.
+
+    Parameters
+    ----------
+    timeout : float or Tuple[float, float], optional
+        Timeout of the requests, overriding the policy of the client.
+    deadline : Deadline or float, optional
+        Deadline of the block, or its time budget in seconds. An enclosing deadline that expires earlier still
+        applies.
+
+    Example
+    -------
+    ```python
+    with timeout_scope(deadline=300):
+        for company in companies:
+            api.get_answers(identifier=company)
+    ```
+    """
+    outer_timeout, outer_deadline = current_scope()
+    if timeout is not None:
+        timeout = as_timeout(timeout)
+    if deadline is not None and not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    if deadline is None or (outer_deadline is not None and outer_deadline.expires_at < deadline.expires_at):
+        deadline = outer_deadline
+    scope = (timeout if timeout is not None else outer_timeout, deadline)
+    if contextvars is not None:
+        token = _scope.set(scope)
+        try:
+            yield deadline
+        finally:
+            _scope.reset(token)
+    else:
+        _state.scope = scope
+        try:
+            yield deadline
+        finally:
+            _state.scope = (outer_timeout, outer_deadline)
@@ -0,0 +1,51 @@
+from wikirate4py.exceptions import Wikirate4PyException
+from wikirate4py.instrumentation import endpoint_template
+
+TRACER_NAME = "wikirate4py"
+
+
+def get_tracer(tracer_provider=None):
+    """
+    Returns the OpenTelemetry tracer of wikirate4py.
+
+    Parameters
+    ----------
+    tracer_provider : TracerProvider, optional
+        Provider to get the tracer from. Defaults to the globally registered one.
+
+    Raises
+    ------
+    Wikirate4PyException
+        If the ``opentelemetry-api`` package is not installed.
+    """
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        raise Wikirate4PyException("Tracing requires the opentelemetry-api package: "
+                                   "pip install wikirate4py[tracing]")
+    from wikirate4py import __version__
+    return trace.get_tracer(TRACER_NAME, __version__, tracer_provider=tracer_provider)
+
+
+def _attribute(value):
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return value if isinstance(value, (str, bool, int, float)) else str(value)
+
+
+def request_attributes(method, path, params):
+    """
+    Returns the attributes of a request span. Query parameters of GET requests are recorded; only the names of
+    POST parameters are, as their values are the content being written.
+    """
+    attributes = {
+        "http.request.method": method.upper(),
+        "url.full": path,
+        "url.template": endpoint_template(path),
+    }
+    if method.lower() == "get":
+        for name, value in (params or {}).items():
+            attributes[f"wikirate.param.{name}"] = _attribute(value)
+    elif params:
+        attributes["wikirate.param_names"] = sorted(str(name) for name in params)
+    return attributes
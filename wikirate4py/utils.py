@@ -1,9 +1,10 @@
-from pandas import DataFrame
-
 from wikirate4py.mixins import WikirateEntity
 
 
 def to_dataframe(data):
+    # pandas takes long to import and is only needed here, so it is loaded on first use
+    from pandas import DataFrame
+
     if not isinstance(data, list):
         if isinstance(data, WikirateEntity):
             array = [data.json()]